@@ -0,0 +1,271 @@
+"""Mantenimiento del agregado materializado `gasto_x_proyecto`.
+
+Cada alta, cambio o baja en una tabla de hechos aplica un delta sobre el
+renglón (proyecto, periodo, categoría) dentro de la misma transacción, así los
+reportes leen sumas ya calculadas. `reconstruir` lo recalcula desde cero.
+
+Los deltas se aplican solo en los caminos que escriben hechos: crud.py,
+lotes.py e importacion.py. No hay un listener de sesión que los calcule, así
+que una escritura por fuera de ellos (session.add en un script, SQL directo)
+deja el agregado desfasado hasta correr scripts/reconstruir_agregados.py.
+
+Los periodos consolidados (app/cierres.py) tienen su foto en
+`gasto_consolidado`: `aplicar` rechaza deltas sobre ellos, `reconstruir` los
+copia de la foto en vez de recorrer los hechos y `listar` lee de ahí.
+"""
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import delete, func, insert, literal, null, or_, select, union_all, update
+from sqlalchemy.orm import Session
+
+from . import models
+
+G = models.GastoProyecto
+GC = models.GastoConsolidado
+
+CATEGORIAS = {
+    models.Sueldo: "sueldos",
+    models.Compra: "compras",
+    models.CajaMenor: "caja_menor",
+    models.Movimiento: "movimientos",
+    models.Administracion: "administracion",
+}
+
+
+class PeriodoConsolidado(Exception):
+    """Escritura sobre filas de hechos de un periodo cerrado (la API responde 409)."""
+
+    def __init__(self, periodo_ids):
+        self.periodo_ids = sorted(periodo_ids)
+        super().__init__(f"Periodo consolidado: {', '.join(map(str, self.periodo_ids))}. Reabrirlo para modificarlo")
+
+
+def _consolidados():
+    return select(models.Periodo.id).where(models.Periodo.es_consolidado.is_(True))
+
+
+def periodos_consolidados(db: Session, periodo_ids=None) -> set:
+    """Ids de los periodos cerrados (entre `periodo_ids`, si se pasa)."""
+    consulta = _consolidados()
+    if periodo_ids is not None:
+        # FOR SHARE en PostgreSQL: un cierre concurrente espera a que termine esta escritura
+        consulta = consulta.where(models.Periodo.id.in_(periodo_ids)).with_for_update(read=True)
+    return set(db.scalars(consulta))
+
+
+def _monto(valor) -> Decimal:
+    return Decimal(str(valor)) if valor is not None else Decimal(0)
+
+
+def capturar(model, datos) -> tuple:
+    """(clave, valor) de una fila, desde un objeto ORM o un dict."""
+    leer = datos.get if isinstance(datos, dict) else lambda campo: getattr(datos, campo, None)
+    clave = (leer("proyecto_id"), leer("periodo_id"), CATEGORIAS[model])
+    return clave, _monto(leer("valor"))
+
+
+def _insert(db: Session):
+    dialecto = db.get_bind().dialect.name
+    if dialecto == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as insert_dialecto
+    elif dialecto == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as insert_dialecto
+    else:
+        raise NotImplementedError(f"Upsert no soportado para {dialecto}")
+    return insert_dialecto(G)
+
+
+def aplicar(db: Session, deltas: dict):
+    """Suma los deltas {clave: (monto, cantidad)} al agregado sin hacer commit.
+
+    Un INSERT ... ON CONFLICT DO UPDATE por clave sobre el índice único
+    ux_gasto_x_proyecto_clave, así dos escrituras concurrentes no pueden
+    crear el mismo renglón dos veces. El renglón que queda sin filas se
+    borra. Si alguna clave (antes o después del cambio) cae en un periodo
+    consolidado no aplica nada y lanza PeriodoConsolidado.
+    """
+    periodo_ids = {periodo_id for _, periodo_id, _ in deltas if periodo_id is not None}
+    if periodo_ids:
+        cerrados = periodos_consolidados(db, periodo_ids)
+        if cerrados:
+            raise PeriodoConsolidado(cerrados)
+    vacios = []
+    for (proyecto_id, periodo_id, categoria), (monto, cantidad) in deltas.items():
+        if not monto and not cantidad:
+            continue
+        stmt = _insert(db).values(
+            proyecto_id=proyecto_id,
+            periodo_id=periodo_id,
+            categoria=categoria,
+            total_gastos=monto,
+            cantidad=cantidad,
+            fecha=date.today(),
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=models.CLAVE_GASTO,
+            set_={
+                "total_gastos": G.total_gastos + stmt.excluded.total_gastos,
+                "cantidad": G.cantidad + stmt.excluded.cantidad,
+                "fecha": stmt.excluded.fecha,
+            },
+        )
+        id_, restantes = db.execute(stmt.returning(G.id, G.cantidad)).one()
+        if restantes <= 0:
+            vacios.append(id_)
+    if vacios:
+        db.execute(delete(G).where(G.id.in_(vacios)))
+
+
+def registrar_altas(db: Session, model, filas):
+    """Filas nuevas (objetos ORM o dicts) del mismo modelo."""
+    deltas = defaultdict(lambda: (Decimal(0), 0))
+    for fila in filas:
+        clave, monto = capturar(model, fila)
+        total, cantidad = deltas[clave]
+        deltas[clave] = (total + monto, cantidad + 1)
+    aplicar(db, deltas)
+
+
+def registrar_eliminadas(db: Session, model, filas):
+    """Filas borradas (objetos ORM o dicts) del mismo modelo."""
+    deltas = defaultdict(lambda: (Decimal(0), 0))
+    for fila in filas:
+        clave, monto = capturar(model, fila)
+        total, cantidad = deltas[clave]
+        deltas[clave] = (total - monto, cantidad - 1)
+    aplicar(db, deltas)
+
+
+def registrar_cambios(db: Session, model, pares):
+    """Pares (antes, después) de filas del mismo modelo, en un solo `aplicar`."""
+    deltas = defaultdict(lambda: (Decimal(0), 0))
+    for antes, despues in pares:
+        (clave_antes, monto_antes), (clave, monto) = capturar(model, antes), capturar(model, despues)
+        total, cantidad = deltas[clave_antes]
+        deltas[clave_antes] = (total - monto_antes, cantidad - 1)
+        total, cantidad = deltas[clave]
+        deltas[clave] = (total + monto, cantidad + 1)
+    aplicar(db, deltas)
+
+
+def registrar_alta(db: Session, obj):
+    registrar_altas(db, type(obj), [obj])
+
+
+def registrar_baja(db: Session, obj):
+    clave, monto = capturar(type(obj), obj)
+    aplicar(db, {clave: (-monto, -1)})
+
+
+def registrar_cambio(db: Session, previo: tuple, obj):
+    """`previo` es el `capturar` del objeto antes de modificarlo."""
+    (clave_antes, monto_antes), (clave, monto) = previo, capturar(type(obj), obj)
+    if clave_antes == clave:
+        aplicar(db, {clave: (monto - monto_antes, 0)})
+    else:
+        aplicar(db, {clave_antes: (-monto_antes, -1), clave: (monto, 1)})
+
+
+def _agrupado(model, categoria: str):
+    claves = [getattr(model, campo) for campo in ("proyecto_id", "periodo_id") if hasattr(model, campo)]
+    return select(
+        getattr(model, "proyecto_id", null()).label("proyecto_id"),
+        getattr(model, "periodo_id", null()).label("periodo_id"),
+        literal(categoria).label("categoria"),
+        func.coalesce(func.sum(model.valor), 0).label("total_gastos"),
+        func.count().label("cantidad"),
+        func.current_date().label("fecha"),
+    ).group_by(*claves).having(func.count() > 0)
+
+
+def _agrupado_abierto(model, categoria: str):
+    """`_agrupado` de los periodos abiertos (y de las filas sin periodo)."""
+    consulta = _agrupado(model, categoria)
+    if hasattr(model, "periodo_id"):
+        consulta = consulta.where(or_(model.periodo_id.is_(None), model.periodo_id.not_in(_consolidados())))
+    return consulta
+
+
+def reconstruir(db: Session, commit: bool = True):
+    """Recalcula todo el agregado con un INSERT ... SELECT ... GROUP BY por tabla.
+
+    Solo recorre los hechos de los periodos abiertos; los consolidados se
+    copian de su foto.
+    """
+    db.execute(delete(G))
+    foto = select(GC.proyecto_id, GC.periodo_id, GC.categoria, GC.total_gastos, GC.cantidad, GC.fecha)
+    consulta = union_all(*(_agrupado_abierto(model, categoria) for model, categoria in CATEGORIAS.items()), foto)
+    db.execute(insert(G).from_select(
+        ["proyecto_id", "periodo_id", "categoria", "total_gastos", "cantidad", "fecha"],
+        consulta,
+    ))
+    if commit:
+        db.commit()
+
+
+def congelar(db: Session, periodo_id: int) -> int:
+    """Reemplaza la foto del periodo con sus totales calculados desde los hechos."""
+    db.execute(delete(GC).where(GC.periodo_id == periodo_id))
+    consulta = union_all(*(
+        _agrupado(model, categoria).where(model.periodo_id == periodo_id)
+        for model, categoria in CATEGORIAS.items() if hasattr(model, "periodo_id")
+    ))
+    return db.execute(insert(GC).from_select(
+        ["proyecto_id", "periodo_id", "categoria", "total_gastos", "cantidad", "fecha"],
+        consulta,
+    )).rowcount
+
+
+def descongelar(db: Session, periodo_id: int) -> int:
+    """Borra la foto del periodo; sus reportes vuelven a salir de gasto_x_proyecto."""
+    return db.execute(delete(GC).where(GC.periodo_id == periodo_id)).rowcount
+
+
+def vista(proyecto_id=None, periodo_id=None, categoria=None):
+    """Agregado de los periodos abiertos más la foto de los consolidados, filtrado.
+
+    Cada rama se filtra por separado para que use su índice; la de la foto
+    es la única que toca un periodo consolidado.
+    """
+    ramas = []
+    for tabla, abierta in ((G, True), (GC, False)):
+        rama = select(tabla.proyecto_id, tabla.periodo_id, tabla.categoria,
+                      tabla.total_gastos, tabla.cantidad, tabla.fecha)
+        if abierta:
+            rama = rama.where(or_(tabla.periodo_id.is_(None), tabla.periodo_id.not_in(_consolidados())))
+        if proyecto_id is not None:
+            rama = rama.where(tabla.proyecto_id == proyecto_id)
+        if periodo_id is not None:
+            rama = rama.where(tabla.periodo_id == periodo_id)
+        if categoria is not None:
+            rama = rama.where(tabla.categoria == categoria)
+        ramas.append(rama)
+    return union_all(*ramas).subquery("gasto")
+
+
+def listar(db: Session, proyecto_id=None, periodo_id=None, categoria=None):
+    v = vista(proyecto_id, periodo_id, categoria)
+    return db.execute(select(v).order_by(v.c.proyecto_id, v.c.periodo_id, v.c.categoria)).all()
+
+
+def consulta_con_nombres(proyecto_id=None, periodo_id=None, categoria=None):
+    """Agregado unido a proyectos y periodos (nombres), para las exportaciones columnares."""
+    P, Pe = models.Proyecto, models.Periodo
+    v = vista(proyecto_id, periodo_id, categoria)
+    return (
+        select(
+            v.c.proyecto_id,
+            P.nombre.label("proyecto"),
+            v.c.periodo_id,
+            Pe.nombre.label("periodo"),
+            v.c.categoria,
+            v.c.total_gastos,
+            v.c.cantidad,
+            v.c.fecha,
+        )
+        .outerjoin(P, P.id == v.c.proyecto_id)
+        .outerjoin(Pe, Pe.id == v.c.periodo_id)
+        .order_by(v.c.proyecto_id, v.c.periodo_id, v.c.categoria)
+    )
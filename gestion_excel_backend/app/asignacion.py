@@ -0,0 +1,102 @@
+"""Reparto del costo de sueldos entre proyectos según la dedicación de cada persona.
+
+El costo de una persona en un periodo es la suma de sus filas de `sueldos`
+(sin importar a qué proyecto se cargaron). Con S = sueldos (personas x
+periodos) y D = dedicaciones (personas x proyectos, cada fila normalizada
+a 1), el costo por proyecto y periodo es C = Dᵀ · S: una multiplicación de
+matrices, sin recorrer personas en Python. El resultado reemplaza por
+completo la tabla `costo_sueldos`.
+"""
+from time import perf_counter
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import Float, cast, delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from . import dedicacion, models
+
+S = models.Sueldo
+R = models.Rrhh
+Pe = models.Persona
+D = models.Dedicacion
+C = models.CostoSueldo
+
+
+def _sueldos(db: Session) -> pd.DataFrame:
+    # La persona se encuentra por el nombre normalizado de la fila de rrhh del sueldo.
+    # Las sumas llegan como float: convertir cientos de miles de Decimal cuesta más que la consulta
+    consulta = (
+        select(Pe.id, S.periodo_id, cast(func.sum(S.valor), Float))
+        .join(R, R.id == S.rrhh_id)
+        .join(Pe, Pe.nombre_normalizado == R.nombre_normalizado)
+        .where(S.periodo_id.is_not(None), S.valor.is_not(None))
+        .group_by(Pe.id, S.periodo_id)
+    )
+    return pd.DataFrame(db.execute(consulta).all(), columns=["persona_id", "periodo_id", "valor"])
+
+
+def _dedicaciones(db: Session) -> pd.DataFrame:
+    consulta = select(D.persona_id, D.proyecto_id, cast(D.dedicacion, Float))
+    return pd.DataFrame(db.execute(consulta).all(), columns=["persona_id", "proyecto_id", "dedicacion"])
+
+
+def calcular(db: Session) -> tuple[pd.DataFrame, dict]:
+    """(costos por proyecto y periodo, resumen) sin escribir nada."""
+    sueldos = _sueldos(db)
+    dedicaciones = _dedicaciones(db)
+
+    # personas x periodos y personas x proyectos, alineadas sobre las mismas personas
+    matriz_s = sueldos.pivot(index="persona_id", columns="periodo_id", values="valor").fillna(0.0)
+    matriz_d = dedicaciones.pivot(index="persona_id", columns="proyecto_id", values="dedicacion").fillna(0.0)
+    matriz_d = matriz_d[matriz_d.sum(axis=1) > 0]
+    personas = matriz_s.index.intersection(matriz_d.index)
+    s = matriz_s.loc[personas].to_numpy()
+    d = matriz_d.loc[personas].to_numpy()
+    # Cada persona reparte el 100 % de su costo aunque su dedicación no sume exactamente 1
+    d = d / d.sum(axis=1, keepdims=True)
+
+    costo = d.T @ s                                # proyectos x periodos
+    cantidad = (d > 0).T.astype(int) @ (s != 0).astype(int)
+
+    proyectos, periodos = np.nonzero(costo)
+    costos = pd.DataFrame({
+        "proyecto_id": matriz_d.columns.to_numpy()[proyectos],
+        "periodo_id": matriz_s.columns.to_numpy()[periodos],
+        "valor": costo[proyectos, periodos].round(2),
+        "personas": cantidad[proyectos, periodos],
+    })
+
+    sin_dedicacion = matriz_s.index.difference(personas)
+    resumen = {
+        "filas": len(costos),
+        "personas": len(personas),
+        "periodos": int(matriz_s.shape[1]),
+        "total_asignado": float(costo.sum().round(2)),
+        "personas_sin_dedicacion": len(sin_dedicacion),
+        "valor_sin_asignar": float(matriz_s.loc[sin_dedicacion].to_numpy().sum().round(2)),
+    }
+    return costos, resumen
+
+
+def ejecutar(db: Session, commit: bool = True) -> dict:
+    """Reconstruye las dedicaciones, calcula el reparto y reemplaza `costo_sueldos` con un INSERT en bloque."""
+    inicio = perf_counter()
+    dedicacion.reconstruir(db)
+    costos, resumen = calcular(db)
+    db.execute(delete(C))
+    if not costos.empty:
+        db.execute(insert(C), costos.astype(object).to_dict("records"))
+    if commit:
+        db.commit()
+    resumen["segundos"] = round(perf_counter() - inicio, 3)
+    return resumen
+
+
+def listar(db: Session, proyecto_id=None, periodo_id=None):
+    query = db.query(C)
+    if proyecto_id is not None:
+        query = query.filter(C.proyecto_id == proyecto_id)
+    if periodo_id is not None:
+        query = query.filter(C.periodo_id == periodo_id)
+    return query.order_by(C.proyecto_id, C.periodo_id).all()
@@ -0,0 +1,35 @@
+"""Feed de cambios por recurso: `GET /api/<recurso>/changes?since=<token>`.
+
+El token es la versión de la tabla en `versiones_tabla`. Cada commit sella
+las filas que escribió con la versión nueva y deja en `bajas` los ids
+borrados (ver app/versiones.py), así que ponerse al día cuesta un rango sobre
+el índice de `cambio` y no releer la tabla.
+"""
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from . import models, versiones
+
+B = models.Baja
+
+
+async def listar(db: AsyncSession, model, since: Optional[int]) -> dict:
+    """Filas escritas y ids borrados después de `since` (todo si es None)."""
+    tabla = model.__tablename__
+    # Tope fijo: lo que se confirme mientras tanto queda para el próximo token
+    (token,) = await db.run_sync(versiones.leer, [tabla])
+
+    filas = select(model).where(model.cambio <= token)
+    bajas = select(B.registro_id).where(B.tabla == tabla, B.cambio <= token)
+    if since is not None:
+        filas = filas.where(model.cambio > since)
+        bajas = bajas.where(B.cambio > since)
+    escritas = (await db.scalars(filas.order_by(model.cambio, model.id))).all()
+    eliminados = []
+    if since is not None:
+        # Un id borrado y vuelto a usar (SQLite reutiliza ids) cuenta como escrito
+        vigentes = {fila.id for fila in escritas}
+        eliminados = [i for i in (await db.scalars(bajas.order_by(B.cambio, B.registro_id))) if i not in vigentes]
+    return {"token": token, "cambios": escritas, "eliminados": eliminados}
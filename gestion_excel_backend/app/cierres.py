@@ -0,0 +1,62 @@
+"""Cierre y reapertura de periodos (`Periodo.es_consolidado`).
+
+Cerrar un periodo calcula sus totales por proyecto y categoría desde las
+tablas de hechos, los guarda en `gasto_consolidado` y marca el periodo. Desde
+ese momento los reportes leen la foto (el costo no depende del tamaño de los
+hechos) y toda alta, cambio o baja que toque el periodo se rechaza (ver
+agregados.aplicar); los importadores omiten sus filas. Reabrir borra solo la
+foto de ese periodo.
+"""
+from typing import Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from . import agregados, models
+
+
+def _resumen(db: Session, periodo: models.Periodo) -> dict:
+    GC = agregados.GC
+    filas, total = db.execute(
+        select(func.count(), func.coalesce(func.sum(GC.total_gastos), 0)).where(GC.periodo_id == periodo.id)
+    ).one()
+    return {
+        "periodo_id": periodo.id,
+        "nombre": periodo.nombre,
+        "es_consolidado": bool(periodo.es_consolidado),
+        "filas": filas,
+        "total_gastos": total,
+    }
+
+
+def cerrar(db: Session, periodo_id: int, commit: bool = True) -> Optional[dict]:
+    """Congela los agregados del periodo y lo marca consolidado; None si no existe.
+
+    Cerrar un periodo ya cerrado no recalcula la foto.
+    """
+    # FOR UPDATE: espera a las escrituras en curso sobre el periodo (toman FOR SHARE)
+    periodo = db.get(models.Periodo, periodo_id, with_for_update=True)
+    if periodo is None:
+        return None
+    if not periodo.es_consolidado:
+        agregados.congelar(db, periodo_id)
+        periodo.es_consolidado = True
+        db.flush()
+    resumen = _resumen(db, periodo)
+    if commit:
+        db.commit()
+    return resumen
+
+
+def reabrir(db: Session, periodo_id: int, commit: bool = True) -> Optional[dict]:
+    """Borra la foto del periodo y vuelve a admitir escrituras; None si no existe."""
+    periodo = db.get(models.Periodo, periodo_id, with_for_update=True)
+    if periodo is None:
+        return None
+    agregados.descongelar(db, periodo_id)
+    periodo.es_consolidado = False
+    db.flush()
+    resumen = _resumen(db, periodo)
+    if commit:
+        db.commit()
+    return resumen
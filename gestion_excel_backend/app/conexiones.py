@@ -0,0 +1,113 @@
+"""Configuración e instrumentación del pool de conexiones.
+
+Los parámetros se leen del entorno (ver `.env`). Cada pool mide cuánto tarda
+en entregar una conexión y cuántas veces se agotó, para `/health/db`.
+"""
+import os
+from threading import Lock
+from time import perf_counter
+
+from dotenv import load_dotenv
+from sqlalchemy import exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+load_dotenv()
+
+
+def _entero(nombre: str, defecto: int) -> int:
+    valor = os.getenv(nombre)
+    return int(valor) if valor else defecto
+
+
+def _booleano(nombre: str, defecto: bool) -> bool:
+    valor = os.getenv(nombre)
+    return valor.strip().lower() in ("1", "true", "si", "sí", "yes") if valor else defecto
+
+
+POOL_SIZE = _entero("DB_POOL_SIZE", 5)
+MAX_OVERFLOW = _entero("DB_MAX_OVERFLOW", 10)
+POOL_TIMEOUT = _entero("DB_POOL_TIMEOUT", 30)  # segundos esperando una conexión libre
+POOL_RECYCLE = _entero("DB_POOL_RECYCLE", 1800)  # segundos; -1 desactiva
+POOL_PRE_PING = _booleano("DB_POOL_PRE_PING", True)
+STATEMENT_TIMEOUT_MS = _entero("DB_STATEMENT_TIMEOUT_MS", 0)  # 0 = sin límite
+
+
+class _PoolMedido:
+    """Mide el tiempo de `connect()` (espera en la cola + conexión nueva si hace falta)."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._lock_metricas = Lock()
+        self.entregas = 0
+        self.espera_total = 0.0
+        self.espera_maxima = 0.0
+        self.agotamientos = 0
+
+    def connect(self):
+        inicio = perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            with self._lock_metricas:
+                self.agotamientos += 1
+            raise
+        finally:
+            espera = perf_counter() - inicio
+            with self._lock_metricas:
+                self.entregas += 1
+                self.espera_total += espera
+                self.espera_maxima = max(self.espera_maxima, espera)
+
+
+class PoolSync(_PoolMedido, QueuePool):
+    pass
+
+
+class PoolAsync(_PoolMedido, AsyncAdaptedQueuePool):
+    pass
+
+
+def opciones_engine(url: str, asincrono: bool = False) -> dict:
+    """kwargs de create_engine/create_async_engine para `url`."""
+    url = make_url(url)
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        # SQLite en memoria usa su propio pool de una sola conexión
+        return {}
+    opciones = {
+        "poolclass": PoolAsync if asincrono else PoolSync,
+        "pool_size": POOL_SIZE,
+        "max_overflow": MAX_OVERFLOW,
+        "pool_timeout": POOL_TIMEOUT,
+        "pool_recycle": POOL_RECYCLE,
+        "pool_pre_ping": POOL_PRE_PING,
+    }
+    if STATEMENT_TIMEOUT_MS and url.get_backend_name() == "postgresql":
+        if asincrono:  # asyncpg
+            opciones["connect_args"] = {"server_settings": {"statement_timeout": str(STATEMENT_TIMEOUT_MS)}}
+        else:  # psycopg2
+            opciones["connect_args"] = {"options": f"-c statement_timeout={STATEMENT_TIMEOUT_MS}"}
+    return opciones
+
+
+def metricas(engine) -> dict:
+    """Estado actual del pool de `engine` (sync o async)."""
+    pool = getattr(engine, "sync_engine", engine).pool
+    datos = {"status": pool.status()}
+    if isinstance(pool, QueuePool):
+        datos.update(
+            tamano=pool.size(),
+            en_uso=pool.checkedout(),
+            libres=pool.checkedin(),
+            overflow=max(pool.overflow(), 0),
+            max_overflow=pool._max_overflow,
+        )
+    if isinstance(pool, _PoolMedido):
+        with pool._lock_metricas:
+            datos.update(
+                entregas=pool.entregas,
+                espera_promedio_ms=round(pool.espera_total * 1000 / pool.entregas, 3) if pool.entregas else 0.0,
+                espera_maxima_ms=round(pool.espera_maxima * 1000, 3),
+                agotamientos=pool.agotamientos,
+            )
+    return datos
@@ -1,202 +1,206 @@
-from sqlalchemy.orm import Session
-from . import models, schemas
-
-def crear_proyecto(db: Session, proyecto: schemas.ProyectoCreate):
-    db_obj = models.Proyecto(**proyecto.dict())
-    db.add(db_obj)
-    db.commit()
-    db.refresh(db_obj)
-    return db_obj
-
-def listar_proyectos(db: Session):
-    return db.query(models.Proyecto).all()
-
-def actualizar_proyecto(db: Session, proyecto_id: int, datos: schemas.ProyectoCreate):
-    proyecto = db.query(models.Proyecto).filter(models.Proyecto.id == proyecto_id).first()
-    if not proyecto:
-        return None
-    for key, value in datos.dict().items():
-        setattr(proyecto, key, value)
-    db.commit()
-    db.refresh(proyecto)
-    return proyecto
-
-def eliminar_proyecto(db: Session, proyecto_id: int):
-    proyecto = db.query(models.Proyecto).filter(models.Proyecto.id == proyecto_id).first()
-    if not proyecto:
-        return False
-    db.delete(proyecto)
-    db.commit()
-    return True
-
-
-
-def crear_rrhh(db: Session, rrhh: schemas.RrhhCreate):
-    nuevo_rrhh = models.Rrhh(**rrhh.dict())
-    db.add(nuevo_rrhh)
-    db.commit()
-    db.refresh(nuevo_rrhh)
-    return nuevo_rrhh
-
-def listar_rrhh(db: Session):
-    return db.query(models.Rrhh).all()
-
-def obtener_rrhh(db: Session, rrhh_id: int):
-    return db.query(models.Rrhh).filter(models.Rrhh.id == rrhh_id).first()
-
-def actualizar_rrhh(db: Session, rrhh_id: int, datos: schemas.RrhhCreate):
-    rrhh = db.query(models.Rrhh).filter(models.Rrhh.id == rrhh_id).first()
-    for key, value in datos.dict().items():
-        setattr(rrhh, key, value)
-    db.commit()
-    db.refresh(rrhh)
-    return rrhh
-
-def eliminar_rrhh(db: Session, rrhh_id: int):
-    rrhh = db.query(models.Rrhh).filter(models.Rrhh.id == rrhh_id).first()
-    db.delete(rrhh)
-    db.commit()
-    return rrhh
-
-
-def crear_sueldo(db: Session, sueldo: schemas.SueldoCreate):
-    nuevo_sueldo = models.Sueldo(**sueldo.dict())
-    db.add(nuevo_sueldo)
-    db.commit()
-    db.refresh(nuevo_sueldo)
-    return nuevo_sueldo
-
-def listar_sueldos(db: Session):
-    return db.query(models.Sueldo).all()
-
-def obtener_sueldo(db: Session, sueldo_id: int):
-    return db.query(models.Sueldo).filter(models.Sueldo.id == sueldo_id).first()
-
-def actualizar_sueldo(db: Session, sueldo_id: int, datos: schemas.SueldoCreate):
-    sueldo = db.query(models.Sueldo).filter(models.Sueldo.id == sueldo_id).first()
-    for key, value in datos.dict().items():
-        setattr(sueldo, key, value)
-    db.commit()
-    db.refresh(sueldo)
-    return sueldo
-
-def eliminar_sueldo(db: Session, sueldo_id: int):
-    sueldo = db.query(models.Sueldo).filter(models.Sueldo.id == sueldo_id).first()
-    db.delete(sueldo)
-    db.commit()
-    return sueldo
-
-
-def crear_movimiento(db: Session, movimiento: schemas.MovimientoCreate):
-    nuevo = models.Movimiento(**movimiento.dict())
-    db.add(nuevo)
-    db.commit()
-    db.refresh(nuevo)
-    return nuevo
-
-def listar_movimientos(db: Session):
-    return db.query(models.Movimiento).all()
-
-def obtener_movimiento(db: Session, movimiento_id: int):
-    return db.query(models.Movimiento).filter(models.Movimiento.id == movimiento_id).first()
-
-def actualizar_movimiento(db: Session, movimiento_id: int, datos: schemas.MovimientoCreate):
-    mov = db.query(models.Movimiento).filter(models.Movimiento.id == movimiento_id).first()
-    for key, value in datos.dict().items():
-        setattr(mov, key, value)
-    db.commit()
-    db.refresh(mov)
-    return mov
-
-def eliminar_movimiento(db: Session, movimiento_id: int):
-    mov = db.query(models.Movimiento).filter(models.Movimiento.id == movimiento_id).first()
-    db.delete(mov)
-    db.commit()
-    return mov
-
-
-def crear_caja_menor(db: Session, data: schemas.CajaMenorCreate):
-    registro = models.CajaMenor(**data.dict())
-    db.add(registro)
-    db.commit()
-    db.refresh(registro)
-    return registro
-
-def listar_caja_menor(db: Session):
-    return db.query(models.CajaMenor).all()
-
-def obtener_caja_menor(db: Session, id: int):
-    return db.query(models.CajaMenor).filter(models.CajaMenor.id == id).first()
-
-def actualizar_caja_menor(db: Session, id: int, data: schemas.CajaMenorCreate):
-    registro = db.query(models.CajaMenor).filter(models.CajaMenor.id == id).first()
-    for key, value in data.dict().items():
-        setattr(registro, key, value)
-    db.commit()
-    db.refresh(registro)
-    return registro
-
-def eliminar_caja_menor(db: Session, id: int):
-    registro = db.query(models.CajaMenor).filter(models.CajaMenor.id == id).first()
-    db.delete(registro)
-    db.commit()
-    return registro
-
-def listar_compras(db: Session):
-    return db.query(models.Compra).all()
-
-def crear_compra(db: Session, compra: schemas.CompraCreate):
-    db_compra = models.Compra(**compra.dict())
-    db.add(db_compra)
-    db.commit()
-    db.refresh(db_compra)
-    return db_compra
-
-def obtener_compra(db: Session, compra_id: int):
-    return db.query(models.Compra).filter(models.Compra.id == compra_id).first()
-
-def actualizar_compra(db: Session, compra_id: int, compra: schemas.CompraCreate):
-    db_compra = obtener_compra(db, compra_id)
-    if db_compra:
-        for key, value in compra.dict().items():
-            setattr(db_compra, key, value)
-        db.commit()
-        db.refresh(db_compra)
-    return db_compra
-
-def eliminar_compra(db: Session, compra_id: int):
-    db_compra = obtener_compra(db, compra_id)
-    if db_compra:
-        db.delete(db_compra)
-        db.commit()
-    return db_compra
-
-
-def listar_administracion(db: Session):
-    return db.query(models.Administracion).all()
-
-def obtener_administracion(db: Session, id: int):
-    return db.query(models.Administracion).filter(models.Administracion.id == id).first()
-
-def crear_administracion(db: Session, data: schemas.AdministracionCreate):
-    obj = models.Administracion(**data.dict())
-    db.add(obj)
-    db.commit()
-    db.refresh(obj)
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+from . import agregados, models, schemas, versiones
+from .paginacion import Filtros, aplicar_filtros
+
+# Las operaciones son async sobre AsyncSession. Los ganchos de agregados.py son
+# sync y corren con `run_sync`, dentro de la misma transacción.
+# Cada alta, cambio o baja es un solo statement con RETURNING: no hay SELECT
+# previo para buscar la fila ni `refresh` posterior. Si el id no existe
+# devuelven None y el endpoint responde 404.
+
+async def _listar(db: AsyncSession, model, filtros: Optional[Filtros]):
+    return (await db.scalars(aplicar_filtros(select(model), model, filtros))).all()
+
+async def _crear(db: AsyncSession, model, datos: dict):
+    obj = await db.scalar(insert(model).values(**datos).returning(model))
+    if model in agregados.CATEGORIAS:
+        await db.run_sync(agregados.registrar_alta, obj)
+    await db.commit()
     return obj
 
-def actualizar_administracion(db: Session, id: int, data: schemas.AdministracionUpdate):
-    obj = obtener_administracion(db, id)
-    if obj:
-        for key, value in data.dict().items():
-            setattr(obj, key, value)
-        db.commit()
-        db.refresh(obj)
+async def _actualizar(db: AsyncSession, model, id: int, datos: dict):
+    stmt = update(model).values(**datos)
+    if model not in agregados.CATEGORIAS:
+        obj = await db.scalar(stmt.where(model.id == id).returning(model))
+    else:
+        # El agregado necesita clave y valor previos de la fila
+        campos = [c for c in ("proyecto_id", "periodo_id", "valor") if hasattr(model, c)]
+        if db.bind.dialect.name == "postgresql":
+            # CTE con FOR UPDATE: bloquea la fila y devuelve los valores previos en el mismo statement
+            previo = (
+                select(model.id, *(getattr(model, c).label(f"previo_{c}") for c in campos))
+                .where(model.id == id)
+                .with_for_update()
+                .cte("previo")
+            )
+            fila = (await db.execute(
+                stmt.where(model.id == previo.c.id)
+                .returning(model, *(previo.c[f"previo_{c}"] for c in campos))
+            )).first()
+            obj, antes = (fila[0], dict(zip(campos, fila[1:]))) if fila else (None, None)
+        else:
+            # SQLite no admite otras tablas en RETURNING: se leen antes (un solo escritor)
+            antes = (await db.execute(select(*(getattr(model, c) for c in campos)).where(model.id == id))).first()
+            obj = await db.scalar(stmt.where(model.id == id).returning(model)) if antes else None
+            antes = antes._asdict() if antes else None
+        if obj is not None:
+            await db.run_sync(agregados.registrar_cambio, agregados.capturar(model, antes), obj)
+    if obj is not None:
+        await db.commit()
     return obj
 
-def eliminar_administracion(db: Session, id: int):
-    obj = obtener_administracion(db, id)
-    if obj:
-        db.delete(obj)
-        db.commit()
+async def _eliminar(db: AsyncSession, model, id: int):
+    obj = await db.scalar(delete(model).where(model.id == id).returning(model))
+    if obj is None:
+        return None
+    if model in agregados.CATEGORIAS:
+        await db.run_sync(agregados.registrar_baja, obj)
+    # Un DELETE por statement no pasa por session.deleted: la baja se anota aquí
+    await db.run_sync(versiones.registrar_bajas, model.__tablename__, [obj.id])
+    await db.commit()
     return obj
+
+async def _insertar_en_bloque(db: AsyncSession, model, registros: list, commit: bool = True) -> list[int]:
+    """Inserta todas las filas en una sola transacción y devuelve los ids generados.
+
+    Usa INSERT ... VALUES multi-fila con RETURNING (insertmanyvalues de
+    SQLAlchemy), así el costo es un puñado de statements y no uno por fila.
+    """
+    if not registros:
+        return []
+    filas = [r.dict() for r in registros]
+    stmt = insert(model).returning(model.id, sort_by_parameter_order=True)
+    ids = (await db.scalars(stmt, filas)).all()
+    if model in agregados.CATEGORIAS:
+        await db.run_sync(agregados.registrar_altas, model, filas)
+    if commit:
+        await db.commit()
+    return list(ids)
+
+async def crear_proyecto(db: AsyncSession, proyecto: schemas.ProyectoCreate):
+    return await _crear(db, models.Proyecto, proyecto.dict())
+
+async def listar_proyectos(db: AsyncSession, filtros: Optional[Filtros] = None):
+    return await _listar(db, models.Proyecto, filtros)
+
+async def obtener_proyecto(db: AsyncSession, proyecto_id: int):
+    return await db.get(models.Proyecto, proyecto_id)
+
+async def actualizar_proyecto(db: AsyncSession, proyecto_id: int, datos: schemas.ProyectoCreate):
+    return await _actualizar(db, models.Proyecto, proyecto_id, datos.dict())
+
+async def eliminar_proyecto(db: AsyncSession, proyecto_id: int):
+    return await _eliminar(db, models.Proyecto, proyecto_id) is not None
+
+
+
+async def crear_rrhh(db: AsyncSession, rrhh: schemas.RrhhCreate):
+    return await _crear(db, models.Rrhh, rrhh.dict())
+
+async def listar_rrhh(db: AsyncSession, filtros: Optional[Filtros] = None):
+    return await _listar(db, models.Rrhh, filtros)
+
+async def obtener_rrhh(db: AsyncSession, rrhh_id: int):
+    return await db.get(models.Rrhh, rrhh_id)
+
+async def actualizar_rrhh(db: AsyncSession, rrhh_id: int, datos: schemas.RrhhCreate):
+    return await _actualizar(db, models.Rrhh, rrhh_id, datos.dict())
+
+async def eliminar_rrhh(db: AsyncSession, rrhh_id: int):
+    return await _eliminar(db, models.Rrhh, rrhh_id)
+
+
+async def crear_sueldo(db: AsyncSession, sueldo: schemas.SueldoCreate):
+    return await _crear(db, models.Sueldo, sueldo.dict())
+
+async def crear_sueldos_en_bloque(db: AsyncSession, sueldos: list[schemas.SueldoCreate]):
+    return await _insertar_en_bloque(db, models.Sueldo, sueldos)
+
+async def listar_sueldos(db: AsyncSession, filtros: Optional[Filtros] = None):
+    return await _listar(db, models.Sueldo, filtros)
+
+async def obtener_sueldo(db: AsyncSession, sueldo_id: int):
+    return await db.get(models.Sueldo, sueldo_id)
+
+async def actualizar_sueldo(db: AsyncSession, sueldo_id: int, datos: schemas.SueldoCreate):
+    return await _actualizar(db, models.Sueldo, sueldo_id, datos.dict())
+
+async def eliminar_sueldo(db: AsyncSession, sueldo_id: int):
+    return await _eliminar(db, models.Sueldo, sueldo_id)
+
+
+async def crear_movimiento(db: AsyncSession, movimiento: schemas.MovimientoCreate):
+    return await _crear(db, models.Movimiento, movimiento.dict())
+
+async def crear_movimientos_en_bloque(db: AsyncSession, movimientos: list[schemas.MovimientoCreate]):
+    return await _insertar_en_bloque(db, models.Movimiento, movimientos)
+
+async def listar_movimientos(db: AsyncSession, filtros: Optional[Filtros] = None):
+    return await _listar(db, models.Movimiento, filtros)
+
+async def obtener_movimiento(db: AsyncSession, movimiento_id: int):
+    return await db.get(models.Movimiento, movimiento_id)
+
+async def actualizar_movimiento(db: AsyncSession, movimiento_id: int, datos: schemas.MovimientoCreate):
+    return await _actualizar(db, models.Movimiento, movimiento_id, datos.dict())
+
+async def eliminar_movimiento(db: AsyncSession, movimiento_id: int):
+    return await _eliminar(db, models.Movimiento, movimiento_id)
+
+
+async def crear_caja_menor(db: AsyncSession, data: schemas.CajaMenorCreate):
+    return await _crear(db, models.CajaMenor, data.dict())
+
+async def crear_caja_menor_en_bloque(db: AsyncSession, registros: list[schemas.CajaMenorCreate]):
+    return await _insertar_en_bloque(db, models.CajaMenor, registros)
+
+async def listar_caja_menor(db: AsyncSession, filtros: Optional[Filtros] = None):
+    return await _listar(db, models.CajaMenor, filtros)
+
+async def obtener_caja_menor(db: AsyncSession, id: int):
+    return await db.get(models.CajaMenor, id)
+
+async def actualizar_caja_menor(db: AsyncSession, id: int, data: schemas.CajaMenorCreate):
+    return await _actualizar(db, models.CajaMenor, id, data.dict())
+
+async def eliminar_caja_menor(db: AsyncSession, id: int):
+    return await _eliminar(db, models.CajaMenor, id)
+
+async def listar_compras(db: AsyncSession, filtros: Optional[Filtros] = None):
+    return await _listar(db, models.Compra, filtros)
+
+async def crear_compra(db: AsyncSession, compra: schemas.CompraCreate):
+    return await _crear(db, models.Compra, compra.dict())
+
+async def crear_compras_en_bloque(db: AsyncSession, compras: list[schemas.CompraCreate]):
+    return await _insertar_en_bloque(db, models.Compra, compras)
+
+async def obtener_compra(db: AsyncSession, compra_id: int):
+    return await db.get(models.Compra, compra_id)
+
+async def actualizar_compra(db: AsyncSession, compra_id: int, compra: schemas.CompraCreate):
+    return await _actualizar(db, models.Compra, compra_id, compra.dict())
+
+async def eliminar_compra(db: AsyncSession, compra_id: int):
+    return await _eliminar(db, models.Compra, compra_id)
+
+
+async def listar_administracion(db: AsyncSession, filtros: Optional[Filtros] = None):
+    return await _listar(db, models.Administracion, filtros)
+
+async def obtener_administracion(db: AsyncSession, id: int):
+    return await db.get(models.Administracion, id)
+
+async def crear_administracion(db: AsyncSession, data: schemas.AdministracionCreate):
+    return await _crear(db, models.Administracion, data.dict())
+
+async def crear_administracion_en_bloque(db: AsyncSession, registros: list[schemas.AdministracionCreate]):
+    return await _insertar_en_bloque(db, models.Administracion, registros)
+
+async def actualizar_administracion(db: AsyncSession, id: int, data: schemas.AdministracionUpdate):
+    return await _actualizar(db, models.Administracion, id, data.dict())
+
+async def eliminar_administracion(db: AsyncSession, id: int):
+    return await _eliminar(db, models.Administracion, id)
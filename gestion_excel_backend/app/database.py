@@ -1,21 +1,49 @@
-from sqlalchemy import create_engine
+from sqlalchemy import MetaData, create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 import os
 from dotenv import load_dotenv
 
+from .conexiones import opciones_engine
+
 load_dotenv()
 DATABASE_URL = os.getenv("DATABASE_URL")
 
-engine = create_engine(DATABASE_URL)
+# Driver async equivalente al de DATABASE_URL (la API corre sobre AsyncSession)
+DRIVERS_ASYNC = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def url_async(url: str) -> str:
+    url = make_url(url)
+    return url.set(drivername=DRIVERS_ASYNC.get(url.drivername, url.drivername)).render_as_string(hide_password=False)
+
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or url_async(DATABASE_URL)
+
+# Motor sync: scripts de importación, migraciones, exportación en streaming
+engine = create_engine(DATABASE_URL, **opciones_engine(DATABASE_URL))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-Base = declarative_base()
 
-# Reusable DB dependency
+# Motor async: endpoints de la API
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **opciones_engine(ASYNC_DATABASE_URL, asincrono=True))
+# expire_on_commit=False: tras el commit los objetos se serializan sin volver a la BD
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+# Nombres estables de índices y restricciones para las migraciones (migrations/)
+convencion = {
+    "ix": "ix_%(column_0_label)s",
+    "uq": "uq_%(table_name)s_%(column_0_name)s",
+}
+Base = declarative_base(metadata=MetaData(naming_convention=convencion))
+
+# Única dependencia de sesión para todos los routers
 
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
@@ -0,0 +1,157 @@
+"""Dedicación de personas a proyectos en forma normalizada.
+
+`rrhh` sigue siendo la tabla que escriben el importador y la API: una fila
+por persona y columna de proyecto de la hoja "Dedicación RRHH", con el
+proyecto como texto. `reconstruir` deriva de ella `personas` (una por nombre
+normalizado, con ids estables) y `dedicaciones` (persona_id, proyecto_id
+reales), así la matriz persona x proyecto sale de un solo GROUP BY y un pivot.
+
+Reconstruir recorre todo rrhh, por eso no es parte de cada escritura: lo
+corren los importadores de rrhh y proyectos, el reparto de sueldos antes de
+calcular y POST /api/rrhh/dedicacion/reconstruir. GET /api/rrhh/dedicacion
+pasa por `al_dia`, que reconstruye solo si la versión de rrhh o proyectos
+cambió desde la última vez que lo hizo este proceso.
+"""
+from time import perf_counter
+from collections import defaultdict
+from decimal import Decimal
+from threading import Lock
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import bindparam, delete, func, insert, select, text, update
+from sqlalchemy.orm import Session
+
+from . import models, nombres, versiones
+
+R = models.Rrhh
+P = models.Proyecto
+Pe = models.Persona
+D = models.Dedicacion
+
+# La dedicación se guarda como fracción; cada persona debe sumar 1 (100 %) con esta tolerancia
+TOLERANCIA = 0.005
+
+TABLAS_ORIGEN = (R.__tablename__, P.__tablename__)
+
+_ultima = {"clave": None}
+_lock = Lock()
+
+
+def reconstruir(db):
+    """Recalcula personas y dedicaciones desde rrhh sin hacer commit.
+
+    Acepta una Session o una Connection (la migración la usa directamente).
+    Los proyectos se cruzan por nombre normalizado, como en los importadores.
+    Devuelve cuántas personas y dedicaciones quedaron.
+    """
+    motor = db.get_bind() if isinstance(db, Session) else db
+    if motor.dialect.name == "postgresql":
+        # Dos reconstrucciones a la vez chocarían en ux de personas: la segunda espera
+        db.execute(text(f"LOCK TABLE {Pe.__tablename__} IN SHARE ROW EXCLUSIVE MODE"))
+    filas = db.execute(select(R.nombre, R.equipo, R.proyecto, R.dedicacion_total).order_by(R.id)).all()
+
+    personas = {}
+    for nombre, equipo, _, _ in filas:
+        clave = nombres.normalizar(nombre)
+        if clave is not None and clave not in personas:
+            personas[clave] = {"nombre": nombre, "nombre_normalizado": clave, "equipo": equipo}
+
+    existentes = {clave: (id_, nombre, equipo) for id_, clave, nombre, equipo
+                  in db.execute(select(Pe.id, Pe.nombre_normalizado, Pe.nombre, Pe.equipo))}
+    nuevas = [persona for clave, persona in personas.items() if clave not in existentes]
+    cambiadas = [
+        {"_id": existentes[clave][0], "nombre": persona["nombre"], "equipo": persona["equipo"]}
+        for clave, persona in personas.items()
+        if clave in existentes and existentes[clave][1:] != (persona["nombre"], persona["equipo"])
+    ]
+    sobran = [id_ for clave, (id_, _, _) in existentes.items() if clave not in personas]
+
+    db.execute(delete(D))
+    if sobran:
+        db.execute(delete(Pe).where(Pe.id.in_(sobran)))
+    if nuevas:
+        db.execute(insert(Pe), nuevas)
+    if cambiadas:
+        db.execute(
+            update(Pe.__table__).where(Pe.id == bindparam("_id")).values(
+                nombre=bindparam("nombre"), equipo=bindparam("equipo")),
+            cambiadas,
+        )
+
+    ids = dict(db.execute(select(Pe.nombre_normalizado, Pe.id)).all())
+    proyectos = nombres.resolver_exactos(db, P.nombre, {proyecto for _, _, proyecto, _ in filas if proyecto})
+    dedicaciones = defaultdict(Decimal)
+    for nombre, _, proyecto, valor in filas:
+        clave = nombres.normalizar(nombre)
+        if clave is None or valor is None or proyecto not in proyectos:
+            continue
+        dedicaciones[(ids[clave], proyectos[proyecto])] += Decimal(str(valor))
+    if dedicaciones:
+        db.execute(insert(D), [
+            {"persona_id": persona_id, "proyecto_id": proyecto_id, "dedicacion": valor}
+            for (persona_id, proyecto_id), valor in dedicaciones.items()
+        ])
+    return {"personas": len(personas), "dedicaciones": len(dedicaciones)}
+
+
+def ejecutar(db: Session, commit: bool = True) -> dict:
+    """`reconstruir` con commit opcional y duración, para la API y los scripts."""
+    inicio = perf_counter()
+    resumen = reconstruir(db)
+    if commit:
+        db.commit()
+    resumen["segundos"] = round(perf_counter() - inicio, 3)
+    return resumen
+
+
+def al_dia(db: Session) -> bool:
+    """Reconstruye y hace commit si rrhh o proyectos cambiaron desde la última vez; True si reconstruyó."""
+    clave = versiones.leer(db, TABLAS_ORIGEN)
+    with _lock:
+        if _ultima["clave"] == clave:
+            return False
+    reconstruir(db)
+    db.commit()
+    with _lock:
+        _ultima["clave"] = clave
+    return True
+
+
+def matriz(db: Session, equipo=None) -> dict:
+    """Matriz persona x proyecto con el total de cada persona y si suma 100 %."""
+    consulta = (
+        select(D.persona_id, D.proyecto_id, P.nombre, func.sum(D.dedicacion))
+        .join(P, P.id == D.proyecto_id)
+        .group_by(D.persona_id, D.proyecto_id, P.nombre)
+    )
+    if equipo is not None:
+        consulta = consulta.join(Pe, Pe.id == D.persona_id).where(Pe.equipo == equipo)
+    largo = pd.DataFrame(db.execute(consulta).all(), columns=["persona_id", "proyecto_id", "proyecto", "dedicacion"])
+    if largo.empty:
+        return {"proyectos": [], "personas": []}
+
+    largo["dedicacion"] = largo["dedicacion"].astype(float)
+    tabla = largo.pivot(index="persona_id", columns="proyecto_id", values="dedicacion").fillna(0.0).sort_index(axis=1)
+    totales = tabla.to_numpy().sum(axis=1)
+    validas = np.isclose(totales, 1.0, rtol=0, atol=TOLERANCIA)
+
+    proyectos = largo.drop_duplicates("proyecto_id").set_index("proyecto_id")["proyecto"]
+    personas = {id_: (nombre, eq) for id_, nombre, eq
+                in db.execute(select(Pe.id, Pe.nombre, Pe.equipo).where(Pe.id.in_(tabla.index.tolist())))}
+    filas = [
+        {
+            "persona_id": int(persona_id),
+            "nombre": personas[persona_id][0],
+            "equipo": personas[persona_id][1],
+            "dedicaciones": valores.tolist(),
+            "total": float(total),
+            "valida": bool(valida),
+        }
+        for persona_id, valores, total, valida in zip(tabla.index, tabla.to_numpy(), totales, validas)
+    ]
+    filas.sort(key=lambda f: (f["nombre"], f["persona_id"]))
+    return {
+        "proyectos": [{"id": int(id_), "nombre": proyectos[id_]} for id_ in tabla.columns],
+        "personas": filas,
+    }
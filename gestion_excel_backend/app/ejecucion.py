@@ -0,0 +1,78 @@
+"""Presupuesto vs. gasto ejecutado por proyecto y concepto.
+
+El ejecutado sale de `gasto_x_proyecto` (ver app/agregados.py), que ya es la
+unión de las tablas de hechos agrupada por proyecto, periodo y categoría, así
+que el reporte completo es un solo GROUP BY sobre pocas filas. El resultado
+se guarda en memoria y se reutiliza mientras no cambie la versión de las
+tablas de origen.
+"""
+from decimal import Decimal
+from threading import Lock
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from . import models, versiones
+
+P = models.Proyecto
+G = models.GastoProyecto
+
+TABLAS_ORIGEN = (P.__tablename__, G.__tablename__)
+CONCEPTO_TOTAL = "total"
+
+_cache = {"clave": None, "filas": []}
+_lock = Lock()
+
+
+def _fila(proyecto_id, nombre, concepto, presupuesto, ejecutado):
+    ejecutado = ejecutado or Decimal(0)
+    diferencia = porcentaje = None
+    if presupuesto is not None:
+        diferencia = presupuesto - ejecutado
+        porcentaje = ejecutado * 100 / presupuesto if presupuesto else None
+    return {
+        "proyecto_id": proyecto_id,
+        "proyecto": nombre,
+        "concepto": concepto,
+        "presupuesto": presupuesto,
+        "ejecutado": ejecutado,
+        "diferencia": diferencia,
+        "ejecucion_porcentaje": porcentaje,
+    }
+
+
+def _calcular(db: Session) -> list[dict]:
+    consulta = (
+        select(P.id, P.nombre, P.presupuesto, G.categoria, func.sum(G.total_gastos))
+        .select_from(P)
+        .outerjoin(G, G.proyecto_id == P.id)
+        .group_by(P.id, P.nombre, P.presupuesto, G.categoria)
+        .order_by(P.id, G.categoria)
+    )
+    filas = []
+    totales = {}
+    for proyecto_id, nombre, presupuesto, concepto, ejecutado in db.execute(consulta):
+        presupuesto = Decimal(presupuesto) if presupuesto is not None else None
+        ejecutado = Decimal(ejecutado) if ejecutado is not None else Decimal(0)
+        if concepto is not None:
+            # El presupuesto solo existe a nivel de proyecto, no por concepto
+            filas.append(_fila(proyecto_id, nombre, concepto, None, ejecutado))
+        _, _, acumulado = totales.get(proyecto_id, (nombre, presupuesto, Decimal(0)))
+        totales[proyecto_id] = (nombre, presupuesto, acumulado + ejecutado)
+
+    for proyecto_id, (nombre, presupuesto, ejecutado) in totales.items():
+        filas.append(_fila(proyecto_id, nombre, CONCEPTO_TOTAL, presupuesto, ejecutado))
+    filas.sort(key=lambda f: (f["proyecto_id"], f["concepto"] == CONCEPTO_TOTAL, f["concepto"]))
+    return filas
+
+
+def calcular(db: Session) -> list[dict]:
+    """Filas de ejecución de todos los proyectos, desde caché si nada cambió."""
+    clave = versiones.leer(db, TABLAS_ORIGEN)
+    with _lock:
+        if _cache["clave"] == clave:
+            return _cache["filas"]
+    filas = _calcular(db)
+    with _lock:
+        _cache["clave"], _cache["filas"] = clave, filas
+    return filas
@@ -1,30 +1,58 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from app import crud, schemas
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from app import cambios, crud, models, schemas
 from app.database import get_db
+from app.etags import condicional
+from app.exportacion import formato_streaming, respuesta_streaming
+from app.paginacion import Filtros, get_filtros
+from app.serializacion import respuesta_lista
 
 router = APIRouter()
 
-@router.get("/", response_model=list[schemas.AdministracionOut])
-def listar(db: Session = Depends(get_db)):
-    return crud.listar_administracion(db)
+@router.get("/", response_model=list[schemas.AdministracionOut], dependencies=[Depends(condicional(models.Administracion))])
+async def listar(
+    request: Request,
+    response: Response,
+    formato: Optional[str] = Query(None, alias="format"),
+    filtros: Filtros = Depends(get_filtros),
+    db: AsyncSession = Depends(get_db),
+):
+    # ?format=csv|ndjson|parquet|arrow -> lectura en streaming
+    modo = formato_streaming(request, formato)
+    if modo:
+        return respuesta_streaming(request, models.Administracion, schemas.AdministracionOut, filtros, modo)
+    return await respuesta_lista(db, response, models.Administracion, schemas.AdministracionOut, filtros)
 
-@router.get("/{id}", response_model=schemas.AdministracionOut)
-def obtener(id: int, db: Session = Depends(get_db)):
-    adm = crud.obtener_administracion(db, id)
+@router.get("/changes", response_model=schemas.Cambios[schemas.AdministracionOut], dependencies=[Depends(condicional(models.Administracion))])
+async def listar_cambios(since: Optional[int] = None, db: AsyncSession = Depends(get_db)):
+    return await cambios.listar(db, models.Administracion, since)
+
+@router.get("/{id}", response_model=schemas.AdministracionOut, dependencies=[Depends(condicional(models.Administracion))])
+async def obtener(id: int, db: AsyncSession = Depends(get_db)):
+    adm = await crud.obtener_administracion(db, id)
     if not adm:
         raise HTTPException(status_code=404, detail="No encontrado")
     return adm
 
 @router.post("/", response_model=schemas.AdministracionOut)
-def crear(data: schemas.AdministracionCreate, db: Session = Depends(get_db)):
-    return crud.crear_administracion(db, data)
+async def crear(data: schemas.AdministracionCreate, db: AsyncSession = Depends(get_db)):
+    return await crud.crear_administracion(db, data)
+
+@router.post("/bulk", response_model=schemas.ResultadoBloque)
+async def crear_en_bloque(data: list[schemas.AdministracionCreate], db: AsyncSession = Depends(get_db)):
+    ids = await crud.crear_administracion_en_bloque(db, data)
+    return {"insertados": len(ids), "ids": ids}
 
 @router.put("/{id}", response_model=schemas.AdministracionOut)
-def actualizar(id: int, data: schemas.AdministracionUpdate, db: Session = Depends(get_db)):
-    return crud.actualizar_administracion(db, id, data)
+async def actualizar(id: int, data: schemas.AdministracionUpdate, db: AsyncSession = Depends(get_db)):
+    adm = await crud.actualizar_administracion(db, id, data)
+    if not adm:
+        raise HTTPException(status_code=404, detail="No encontrado")
+    return adm
 
 @router.delete("/{id}")
-def eliminar(id: int, db: Session = Depends(get_db)):
-    crud.eliminar_administracion(db, id)
+async def eliminar(id: int, db: AsyncSession = Depends(get_db)):
+    if not await crud.eliminar_administracion(db, id):
+        raise HTTPException(status_code=404, detail="No encontrado")
     return {"ok": True}
@@ -1,29 +1,59 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from app import schemas, crud
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from app import cambios, crud, models, schemas
 from app.database import get_db
+from app.etags import condicional
+from app.exportacion import formato_streaming, respuesta_streaming
+from app.paginacion import Filtros, get_filtros
+from app.serializacion import respuesta_lista
 
 router = APIRouter()
 
 @router.post("/", response_model=schemas.CajaMenor)
-def crear(data: schemas.CajaMenorCreate, db: Session = Depends(get_db)):
-    return crud.crear_caja_menor(db, data)
+async def crear(data: schemas.CajaMenorCreate, db: AsyncSession = Depends(get_db)):
+    return await crud.crear_caja_menor(db, data)
 
-@router.get("/", response_model=list[schemas.CajaMenor])
-def listar(db: Session = Depends(get_db)):
-    return crud.listar_caja_menor(db)
+@router.post("/bulk", response_model=schemas.ResultadoBloque)
+async def crear_en_bloque(data: list[schemas.CajaMenorCreate], db: AsyncSession = Depends(get_db)):
+    ids = await crud.crear_caja_menor_en_bloque(db, data)
+    return {"insertados": len(ids), "ids": ids}
 
-@router.get("/{id}", response_model=schemas.CajaMenor)
-def obtener(id: int, db: Session = Depends(get_db)):
-    obj = crud.obtener_caja_menor(db, id)
+@router.get("/", response_model=list[schemas.CajaMenor], dependencies=[Depends(condicional(models.CajaMenor))])
+async def listar(
+    request: Request,
+    response: Response,
+    formato: Optional[str] = Query(None, alias="format"),
+    filtros: Filtros = Depends(get_filtros),
+    db: AsyncSession = Depends(get_db),
+):
+    # ?format=csv|ndjson|parquet|arrow -> lectura en streaming
+    modo = formato_streaming(request, formato)
+    if modo:
+        return respuesta_streaming(request, models.CajaMenor, schemas.CajaMenor, filtros, modo)
+    return await respuesta_lista(db, response, models.CajaMenor, schemas.CajaMenor, filtros)
+
+@router.get("/changes", response_model=schemas.Cambios[schemas.CajaMenor], dependencies=[Depends(condicional(models.CajaMenor))])
+async def listar_cambios(since: Optional[int] = None, db: AsyncSession = Depends(get_db)):
+    return await cambios.listar(db, models.CajaMenor, since)
+
+@router.get("/{id}", response_model=schemas.CajaMenor, dependencies=[Depends(condicional(models.CajaMenor))])
+async def obtener(id: int, db: AsyncSession = Depends(get_db)):
+    obj = await crud.obtener_caja_menor(db, id)
     if not obj:
         raise HTTPException(status_code=404, detail="No encontrado")
     return obj
 
 @router.put("/{id}", response_model=schemas.CajaMenor)
-def actualizar(id: int, data: schemas.CajaMenorCreate, db: Session = Depends(get_db)):
-    return crud.actualizar_caja_menor(db, id, data)
+async def actualizar(id: int, data: schemas.CajaMenorCreate, db: AsyncSession = Depends(get_db)):
+    obj = await crud.actualizar_caja_menor(db, id, data)
+    if not obj:
+        raise HTTPException(status_code=404, detail="No encontrado")
+    return obj
 
 @router.delete("/{id}", response_model=schemas.CajaMenor)
-def eliminar(id: int, db: Session = Depends(get_db)):
-    return crud.eliminar_caja_menor(db, id)
+async def eliminar(id: int, db: AsyncSession = Depends(get_db)):
+    obj = await crud.eliminar_caja_menor(db, id)
+    if not obj:
+        raise HTTPException(status_code=404, detail="No encontrado")
+    return obj
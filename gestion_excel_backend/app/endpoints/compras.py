@@ -1,29 +1,59 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_db
-from app import crud, schemas
+from app.exportacion import formato_streaming, respuesta_streaming
+from app.etags import condicional
+from app.paginacion import Filtros, get_filtros
+from app.serializacion import respuesta_lista
+from app import cambios, crud, models, schemas
 
 router = APIRouter()
 
-@router.get("/", response_model=list[schemas.Compra])
-def listar(db: Session = Depends(get_db)):
-    return crud.listar_compras(db)
+@router.get("/", response_model=list[schemas.Compra], dependencies=[Depends(condicional(models.Compra))])
+async def listar(
+    request: Request,
+    response: Response,
+    formato: Optional[str] = Query(None, alias="format"),
+    filtros: Filtros = Depends(get_filtros),
+    db: AsyncSession = Depends(get_db),
+):
+    # ?format=csv|ndjson|parquet|arrow o Accept NDJSON/Arrow -> lectura en streaming
+    modo = formato_streaming(request, formato)
+    if modo:
+        return respuesta_streaming(request, models.Compra, schemas.Compra, filtros, modo)
+    return await respuesta_lista(db, response, models.Compra, schemas.Compra, filtros)
 
 @router.post("/", response_model=schemas.Compra)
-def crear(compra: schemas.CompraCreate, db: Session = Depends(get_db)):
-    return crud.crear_compra(db, compra)
+async def crear(compra: schemas.CompraCreate, db: AsyncSession = Depends(get_db)):
+    return await crud.crear_compra(db, compra)
 
-@router.get("/{compra_id}", response_model=schemas.Compra)
-def obtener(compra_id: int, db: Session = Depends(get_db)):
-    db_compra = crud.obtener_compra(db, compra_id)
+@router.post("/bulk", response_model=schemas.ResultadoBloque)
+async def crear_en_bloque(compras: list[schemas.CompraCreate], db: AsyncSession = Depends(get_db)):
+    ids = await crud.crear_compras_en_bloque(db, compras)
+    return {"insertados": len(ids), "ids": ids}
+
+@router.get("/changes", response_model=schemas.Cambios[schemas.Compra], dependencies=[Depends(condicional(models.Compra))])
+async def listar_cambios(since: Optional[int] = None, db: AsyncSession = Depends(get_db)):
+    return await cambios.listar(db, models.Compra, since)
+
+@router.get("/{compra_id}", response_model=schemas.Compra, dependencies=[Depends(condicional(models.Compra))])
+async def obtener(compra_id: int, db: AsyncSession = Depends(get_db)):
+    db_compra = await crud.obtener_compra(db, compra_id)
     if db_compra is None:
         raise HTTPException(status_code=404, detail="Compra no encontrada")
     return db_compra
 
 @router.put("/{compra_id}", response_model=schemas.Compra)
-def actualizar(compra_id: int, compra: schemas.CompraCreate, db: Session = Depends(get_db)):
-    return crud.actualizar_compra(db, compra_id, compra)
+async def actualizar(compra_id: int, compra: schemas.CompraCreate, db: AsyncSession = Depends(get_db)):
+    db_compra = await crud.actualizar_compra(db, compra_id, compra)
+    if db_compra is None:
+        raise HTTPException(status_code=404, detail="Compra no encontrada")
+    return db_compra
 
 @router.delete("/{compra_id}", response_model=schemas.Compra)
-def eliminar(compra_id: int, db: Session = Depends(get_db)):
-    return crud.eliminar_compra(db, compra_id)
+async def eliminar(compra_id: int, db: AsyncSession = Depends(get_db)):
+    db_compra = await crud.eliminar_compra(db, compra_id)
+    if db_compra is None:
+        raise HTTPException(status_code=404, detail="Compra no encontrada")
+    return db_compra
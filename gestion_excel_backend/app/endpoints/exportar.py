@@ -0,0 +1,21 @@
+from datetime import date
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, Query
+from app.exportacion import respuesta_xlsx
+from app.paginacion import Filtros
+
+router = APIRouter()
+
+Recurso = Literal["proyectos", "rrhh", "sueldos", "movimientos", "caja_menor", "compras", "administracion"]
+
+# Libro con una hoja por recurso (todas si no se pasa ?recurso=), generado y enviado en streaming
+@router.get("/export.xlsx")
+def exportar_xlsx(
+    recurso: Optional[list[Recurso]] = Query(None),
+    proyecto_id: Optional[int] = None,
+    periodo_id: Optional[int] = None,
+    fecha_desde: Optional[date] = None,
+    fecha_hasta: Optional[date] = None,
+):
+    filtros = Filtros(proyecto_id=proyecto_id, periodo_id=periodo_id, fecha_desde=fecha_desde, fecha_hasta=fecha_hasta)
+    return respuesta_xlsx(recurso, filtros)
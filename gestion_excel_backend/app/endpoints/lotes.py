@@ -0,0 +1,11 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from app import lotes, schemas
+from app.database import get_db
+
+router = APIRouter()
+
+# Altas, cambios y bajas de varios recursos en una transacción (todo o nada)
+@router.post("", response_model=schemas.ResultadoLote)
+async def aplicar_lote(operaciones: list[schemas.Operacion], db: AsyncSession = Depends(get_db)):
+    return {"resultados": await lotes.aplicar(db, operaciones)}
@@ -1,35 +1,59 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from app import crud, schemas
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from app import cambios, crud, models, schemas
 from app.database import get_db
+from app.exportacion import formato_streaming, respuesta_streaming
+from app.etags import condicional
+from app.paginacion import Filtros, get_filtros
+from app.serializacion import respuesta_lista
 
 router = APIRouter()
 
-@router.get("/", response_model=list[schemas.Movimiento])
-def listar_movimientos(db: Session = Depends(get_db)):
-    return crud.listar_movimientos(db)
+@router.get("/", response_model=list[schemas.Movimiento], dependencies=[Depends(condicional(models.Movimiento))])
+async def listar_movimientos(
+    request: Request,
+    response: Response,
+    formato: Optional[str] = Query(None, alias="format"),
+    filtros: Filtros = Depends(get_filtros),
+    db: AsyncSession = Depends(get_db),
+):
+    # ?format=csv|ndjson|parquet|arrow o Accept NDJSON/Arrow -> lectura en streaming
+    modo = formato_streaming(request, formato)
+    if modo:
+        return respuesta_streaming(request, models.Movimiento, schemas.Movimiento, filtros, modo)
+    return await respuesta_lista(db, response, models.Movimiento, schemas.Movimiento, filtros)
 
 @router.post("/", response_model=schemas.Movimiento)
-def crear_movimiento(movimiento: schemas.MovimientoCreate, db: Session = Depends(get_db)):
-    return crud.crear_movimiento(db, movimiento)
+async def crear_movimiento(movimiento: schemas.MovimientoCreate, db: AsyncSession = Depends(get_db)):
+    return await crud.crear_movimiento(db, movimiento)
 
-@router.get("/{movimiento_id}", response_model=schemas.Movimiento)
-def obtener_movimiento(movimiento_id: int, db: Session = Depends(get_db)):
-    mov = crud.obtener_movimiento(db, movimiento_id)
+@router.post("/bulk", response_model=schemas.ResultadoBloque)
+async def crear_movimientos_en_bloque(movimientos: list[schemas.MovimientoCreate], db: AsyncSession = Depends(get_db)):
+    ids = await crud.crear_movimientos_en_bloque(db, movimientos)
+    return {"insertados": len(ids), "ids": ids}
+
+@router.get("/changes", response_model=schemas.Cambios[schemas.Movimiento], dependencies=[Depends(condicional(models.Movimiento))])
+async def listar_cambios(since: Optional[int] = None, db: AsyncSession = Depends(get_db)):
+    return await cambios.listar(db, models.Movimiento, since)
+
+@router.get("/{movimiento_id}", response_model=schemas.Movimiento, dependencies=[Depends(condicional(models.Movimiento))])
+async def obtener_movimiento(movimiento_id: int, db: AsyncSession = Depends(get_db)):
+    mov = await crud.obtener_movimiento(db, movimiento_id)
     if not mov:
         raise HTTPException(status_code=404, detail="Movimiento no encontrado")
     return mov
 
 @router.put("/{movimiento_id}", response_model=schemas.Movimiento)
-def actualizar_movimiento(movimiento_id: int, datos: schemas.MovimientoCreate, db: Session = Depends(get_db)):
-    mov = crud.actualizar_movimiento(db, movimiento_id, datos)
+async def actualizar_movimiento(movimiento_id: int, datos: schemas.MovimientoCreate, db: AsyncSession = Depends(get_db)):
+    mov = await crud.actualizar_movimiento(db, movimiento_id, datos)
     if not mov:
         raise HTTPException(status_code=404, detail="Movimiento no encontrado")
     return mov
 
 @router.delete("/{movimiento_id}")
-def eliminar_movimiento(movimiento_id: int, db: Session = Depends(get_db)):
-    mov = crud.eliminar_movimiento(db, movimiento_id)
+async def eliminar_movimiento(movimiento_id: int, db: AsyncSession = Depends(get_db)):
+    mov = await crud.eliminar_movimiento(db, movimiento_id)
     if not mov:
         raise HTTPException(status_code=404, detail="Movimiento no encontrado")
     return {"mensaje": "Movimiento eliminado"}
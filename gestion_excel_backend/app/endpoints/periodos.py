@@ -0,0 +1,26 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from app import cierres, schemas
+from app.database import get_db
+
+router = APIRouter()
+
+# cierres trabaja con Session sync: corre con run_sync sobre la misma conexión
+
+# Congela los agregados del periodo (gasto_consolidado) y bloquea las escrituras sobre sus hechos
+@router.post("/{periodo_id}/cerrar", response_model=schemas.ResultadoCierre)
+async def cerrar_periodo(periodo_id: int, db: AsyncSession = Depends(get_db)):
+    resumen = await db.run_sync(cierres.cerrar, periodo_id, False)
+    if resumen is None:
+        raise HTTPException(status_code=404, detail="Periodo no encontrado")
+    await db.commit()
+    return resumen
+
+# Borra la foto del periodo y vuelve a admitir escrituras
+@router.post("/{periodo_id}/reabrir", response_model=schemas.ResultadoCierre)
+async def reabrir_periodo(periodo_id: int, db: AsyncSession = Depends(get_db)):
+    resumen = await db.run_sync(cierres.reabrir, periodo_id, False)
+    if resumen is None:
+        raise HTTPException(status_code=404, detail="Periodo no encontrado")
+    await db.commit()
+    return resumen
@@ -1,48 +1,60 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from .. import crud, schemas
-from ..database import SessionLocal
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from .. import cambios, crud, models, nombres, schemas
+from ..database import get_db
+from ..etags import condicional
+from ..paginacion import Filtros, get_filtros
+from ..serializacion import respuesta_lista
 
 router = APIRouter()
 
-# Dependencia para obtener la sesión de base de datos
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 # Crear proyecto
 @router.post("/", response_model=schemas.Proyecto)
-def crear_proyecto(proyecto: schemas.ProyectoCreate, db: Session = Depends(get_db)):
-    return crud.crear_proyecto(db, proyecto)
+async def crear_proyecto(proyecto: schemas.ProyectoCreate, db: AsyncSession = Depends(get_db)):
+    return await crud.crear_proyecto(db, proyecto)
 
 # Listar proyectos
-@router.get("/", response_model=list[schemas.Proyecto])
-def listar_proyectos(db: Session = Depends(get_db)):
-    return crud.listar_proyectos(db)
+@router.get("/", response_model=list[schemas.Proyecto], dependencies=[Depends(condicional(models.Proyecto))])
+async def listar_proyectos(response: Response, filtros: Filtros = Depends(get_filtros), db: AsyncSession = Depends(get_db)):
+    return await respuesta_lista(db, response, models.Proyecto, schemas.Proyecto, filtros)
+
+# Búsqueda aproximada por nombre
+@router.get("/buscar", response_model=list[schemas.Coincidencia], dependencies=[Depends(condicional(models.Proyecto))])
+async def buscar_proyectos(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(nombres.LIMITE_BUSQUEDA, ge=1, le=100),
+    db: AsyncSession = Depends(get_db),
+):
+    # Índice de trigramas en memoria, se reconstruye cuando cambia la versión de la tabla
+    indice = await db.run_sync(nombres.indice, models.Proyecto)
+    return indice.buscar(q, limit)
+
+# Feed de cambios
+@router.get("/changes", response_model=schemas.Cambios[schemas.Proyecto], dependencies=[Depends(condicional(models.Proyecto))])
+async def listar_cambios(since: Optional[int] = None, db: AsyncSession = Depends(get_db)):
+    return await cambios.listar(db, models.Proyecto, since)
 
 # Obtener proyecto por ID
-@router.get("/{proyecto_id}", response_model=schemas.Proyecto)
-def obtener_proyecto(proyecto_id: int, db: Session = Depends(get_db)):
-    proyecto = crud.obtener_proyecto(db, proyecto_id)
+@router.get("/{proyecto_id}", response_model=schemas.Proyecto, dependencies=[Depends(condicional(models.Proyecto))])
+async def obtener_proyecto(proyecto_id: int, db: AsyncSession = Depends(get_db)):
+    proyecto = await crud.obtener_proyecto(db, proyecto_id)
     if not proyecto:
         raise HTTPException(status_code=404, detail="Proyecto no encontrado")
     return proyecto
 
 # Actualizar proyecto
 @router.put("/{proyecto_id}", response_model=schemas.Proyecto)
-def actualizar_proyecto(proyecto_id: int, datos: schemas.ProyectoCreate, db: Session = Depends(get_db)):
-    proyecto = crud.actualizar_proyecto(db, proyecto_id, datos)
+async def actualizar_proyecto(proyecto_id: int, datos: schemas.ProyectoCreate, db: AsyncSession = Depends(get_db)):
+    proyecto = await crud.actualizar_proyecto(db, proyecto_id, datos)
     if not proyecto:
         raise HTTPException(status_code=404, detail="Proyecto no encontrado")
     return proyecto
 
 # Eliminar proyecto
 @router.delete("/{proyecto_id}")
-def eliminar_proyecto(proyecto_id: int, db: Session = Depends(get_db)):
-    eliminado = crud.eliminar_proyecto(db, proyecto_id)
+async def eliminar_proyecto(proyecto_id: int, db: AsyncSession = Depends(get_db)):
+    eliminado = await crud.eliminar_proyecto(db, proyecto_id)
     if not eliminado:
         raise HTTPException(status_code=404, detail="Proyecto no encontrado")
     return {"mensaje": "Proyecto eliminado"}
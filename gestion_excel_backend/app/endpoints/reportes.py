@@ -0,0 +1,65 @@
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from app import agregados, asignacion, models, prorrateo, schemas
+from app import ejecucion as ejecucion_presupuesto
+from app.database import get_db
+from app.etags import cabeceras_cache, condicional
+from app.exportacion import FORMATOS_COLUMNARES, formato_streaming, respuesta_columnar
+
+router = APIRouter()
+
+# agregados y ejecucion trabajan con Session sync: corren con run_sync sobre la misma conexión
+
+# Totales precalculados por proyecto, periodo y categoría (gasto_x_proyecto; los
+# periodos consolidados salen de su foto en gasto_consolidado)
+@router.get("/gasto-por-proyecto", response_model=list[schemas.GastoProyecto], dependencies=[Depends(condicional(models.GastoProyecto, models.GastoConsolidado, models.Periodo))])
+async def gasto_por_proyecto(
+    request: Request,
+    proyecto_id: Optional[int] = None,
+    periodo_id: Optional[int] = None,
+    categoria: Optional[str] = None,
+    formato: Optional[str] = Query(None, alias="format"),
+    db: AsyncSession = Depends(get_db),
+):
+    # ?format=parquet|arrow -> vista unida con nombres de proyecto y periodo, en columnas tipadas
+    modo = formato_streaming(request, formato)
+    if modo in FORMATOS_COLUMNARES:
+        consulta = agregados.consulta_con_nombres(proyecto_id, periodo_id, categoria)
+        return respuesta_columnar(consulta, "gasto_x_proyecto", modo, cabeceras_cache(request))
+    return await db.run_sync(agregados.listar, proyecto_id, periodo_id, categoria)
+
+# Presupuesto aprobado vs. ejecutado por proyecto y concepto (concepto "total" = proyecto completo)
+@router.get("/ejecucion", response_model=list[schemas.Ejecucion], dependencies=[Depends(condicional(models.Proyecto, models.GastoProyecto))])
+async def ejecucion(proyecto_id: Optional[int] = None, db: AsyncSession = Depends(get_db)):
+    filas = await db.run_sync(ejecucion_presupuesto.calcular)
+    if proyecto_id is not None:
+        filas = [f for f in filas if f["proyecto_id"] == proyecto_id]
+    return filas
+
+# Costo de sueldos por proyecto y periodo, repartido según la dedicación de cada persona
+@router.get("/costo-sueldos", response_model=list[schemas.CostoSueldo], dependencies=[Depends(condicional(models.CostoSueldo))])
+async def costo_sueldos(proyecto_id: Optional[int] = None, periodo_id: Optional[int] = None, db: AsyncSession = Depends(get_db)):
+    return await db.run_sync(asignacion.listar, proyecto_id, periodo_id)
+
+# Recalcula el reparto completo (también: scripts/asignar_sueldos.py)
+@router.post("/costo-sueldos/recalcular", response_model=schemas.ResultadoAsignacion)
+async def recalcular_costo_sueldos(db: AsyncSession = Depends(get_db)):
+    resumen = await db.run_sync(asignacion.ejecutar, False)
+    await db.commit()
+    return resumen
+
+# Costos de administración prorrateados por proyecto y periodo
+@router.get("/costo-administracion", response_model=list[schemas.CostoAdministracion], dependencies=[Depends(condicional(models.CostoAdministracion))])
+async def costo_administracion(proyecto_id: Optional[int] = None, periodo_id: Optional[int] = None, db: AsyncSession = Depends(get_db)):
+    return await db.run_sync(prorrateo.listar, proyecto_id, periodo_id)
+
+# Recalcula el prorrateo completo con el criterio elegido (también: scripts/prorratear_administracion.py)
+@router.post("/costo-administracion/recalcular", response_model=schemas.ResultadoProrrateo)
+async def recalcular_costo_administracion(
+    criterio: Literal["presupuesto", "sueldos", "personas"] = "presupuesto",
+    db: AsyncSession = Depends(get_db),
+):
+    resumen = await db.run_sync(prorrateo.ejecutar, criterio, False)
+    await db.commit()
+    return resumen
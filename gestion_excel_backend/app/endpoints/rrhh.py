@@ -1,40 +1,67 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from .. import crud, schemas
-from ..database import SessionLocal
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from .. import cambios, crud, dedicacion, models, nombres, schemas
+from ..database import get_db
+from ..etags import condicional
+from ..paginacion import Filtros, get_filtros
+from ..serializacion import respuesta_lista
 
 router = APIRouter()
 
-# Dependencia para obtener la sesión de DB
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-@router.get("/", response_model=list[schemas.Rrhh])
-def listar_rrhh(db: Session = Depends(get_db)):
-    return crud.listar_rrhh(db)
+@router.get("/", response_model=list[schemas.Rrhh], dependencies=[Depends(condicional(models.Rrhh))])
+async def listar_rrhh(response: Response, filtros: Filtros = Depends(get_filtros), db: AsyncSession = Depends(get_db)):
+    return await respuesta_lista(db, response, models.Rrhh, schemas.Rrhh, filtros)
 
 @router.post("/", response_model=schemas.Rrhh)
-def crear_rrhh(rrhh: schemas.RrhhCreate, db: Session = Depends(get_db)):
-    return crud.crear_rrhh(db, rrhh)
+async def crear_rrhh(rrhh: schemas.RrhhCreate, db: AsyncSession = Depends(get_db)):
+    return await crud.crear_rrhh(db, rrhh)
+
+@router.get("/buscar", response_model=list[schemas.Coincidencia], dependencies=[Depends(condicional(models.Rrhh))])
+async def buscar_rrhh(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(nombres.LIMITE_BUSQUEDA, ge=1, le=100),
+    db: AsyncSession = Depends(get_db),
+):
+    # Índice de trigramas en memoria, se reconstruye cuando cambia la versión de la tabla
+    indice = await db.run_sync(nombres.indice, models.Rrhh)
+    return indice.buscar(q, limit)
+
+# Matriz persona x proyecto (dedicaciones normalizadas), con validación de que cada persona sume 100 %
+# Si rrhh o proyectos cambiaron desde la última reconstrucción, se reconstruye antes de leer
+@router.get("/dedicacion", response_model=schemas.MatrizDedicacion, dependencies=[Depends(condicional(models.Dedicacion, models.Persona, models.Proyecto, models.Rrhh))])
+async def matriz_dedicacion(equipo: Optional[str] = None, db: AsyncSession = Depends(get_db)):
+    await db.run_sync(dedicacion.al_dia)
+    return await db.run_sync(dedicacion.matriz, equipo)
+
+# Recalcula personas y dedicaciones desde rrhh sin esperar a la próxima lectura de la matriz
+@router.post("/dedicacion/reconstruir", response_model=schemas.ResultadoDedicacion)
+async def reconstruir_dedicacion(db: AsyncSession = Depends(get_db)):
+    resumen = await db.run_sync(dedicacion.ejecutar, False)
+    await db.commit()
+    return resumen
 
-@router.get("/{rrhh_id}", response_model=schemas.Rrhh)
-def obtener_rrhh(rrhh_id: int, db: Session = Depends(get_db)):
-    rrhh = crud.obtener_rrhh(db, rrhh_id)
+@router.get("/changes", response_model=schemas.Cambios[schemas.Rrhh], dependencies=[Depends(condicional(models.Rrhh))])
+async def listar_cambios(since: Optional[int] = None, db: AsyncSession = Depends(get_db)):
+    return await cambios.listar(db, models.Rrhh, since)
+
+@router.get("/{rrhh_id}", response_model=schemas.Rrhh, dependencies=[Depends(condicional(models.Rrhh))])
+async def obtener_rrhh(rrhh_id: int, db: AsyncSession = Depends(get_db)):
+    rrhh = await crud.obtener_rrhh(db, rrhh_id)
     if not rrhh:
         raise HTTPException(status_code=404, detail="RRHH no encontrado")
     return rrhh
 
 @router.put("/{rrhh_id}", response_model=schemas.Rrhh)
-def actualizar_rrhh(rrhh_id: int, datos: schemas.RrhhCreate, db: Session = Depends(get_db)):
-    return crud.actualizar_rrhh(db, rrhh_id, datos)
+async def actualizar_rrhh(rrhh_id: int, datos: schemas.RrhhCreate, db: AsyncSession = Depends(get_db)):
+    rrhh = await crud.actualizar_rrhh(db, rrhh_id, datos)
+    if not rrhh:
+        raise HTTPException(status_code=404, detail="RRHH no encontrado")
+    return rrhh
 
 @router.delete("/{rrhh_id}", response_model=schemas.Rrhh)
-def eliminar_rrhh(rrhh_id: int, db: Session = Depends(get_db)):
-    rrhh = crud.eliminar_rrhh(db, rrhh_id)
+async def eliminar_rrhh(rrhh_id: int, db: AsyncSession = Depends(get_db)):
+    rrhh = await crud.eliminar_rrhh(db, rrhh_id)
     if not rrhh:
         raise HTTPException(status_code=404, detail="RRHH no encontrado")
     return rrhh
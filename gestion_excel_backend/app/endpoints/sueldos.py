@@ -1,33 +1,59 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from .. import crud, schemas
-from ..database import SessionLocal
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from .. import cambios, crud, models, schemas
+from ..database import get_db
+from ..exportacion import formato_streaming, respuesta_streaming
+from ..etags import condicional
+from ..paginacion import Filtros, get_filtros
+from ..serializacion import respuesta_lista
 
 router = APIRouter()
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 @router.post("/", response_model=schemas.Sueldo)
-def crear_sueldo(sueldo: schemas.SueldoCreate, db: Session = Depends(get_db)):
-    return crud.crear_sueldo(db, sueldo)
+async def crear_sueldo(sueldo: schemas.SueldoCreate, db: AsyncSession = Depends(get_db)):
+    return await crud.crear_sueldo(db, sueldo)
+
+@router.post("/bulk", response_model=schemas.ResultadoBloque)
+async def crear_sueldos_en_bloque(sueldos: list[schemas.SueldoCreate], db: AsyncSession = Depends(get_db)):
+    ids = await crud.crear_sueldos_en_bloque(db, sueldos)
+    return {"insertados": len(ids), "ids": ids}
+
+@router.get("/", response_model=list[schemas.Sueldo], dependencies=[Depends(condicional(models.Sueldo))])
+async def listar_sueldos(
+    request: Request,
+    response: Response,
+    formato: Optional[str] = Query(None, alias="format"),
+    filtros: Filtros = Depends(get_filtros),
+    db: AsyncSession = Depends(get_db),
+):
+    # ?format=csv|ndjson|parquet|arrow o Accept NDJSON/Arrow -> lectura en streaming
+    modo = formato_streaming(request, formato)
+    if modo:
+        return respuesta_streaming(request, models.Sueldo, schemas.Sueldo, filtros, modo)
+    return await respuesta_lista(db, response, models.Sueldo, schemas.Sueldo, filtros)
 
-@router.get("/", response_model=list[schemas.Sueldo])
-def listar_sueldos(db: Session = Depends(get_db)):
-    return crud.listar_sueldos(db)
+@router.get("/changes", response_model=schemas.Cambios[schemas.Sueldo], dependencies=[Depends(condicional(models.Sueldo))])
+async def listar_cambios(since: Optional[int] = None, db: AsyncSession = Depends(get_db)):
+    return await cambios.listar(db, models.Sueldo, since)
 
-@router.get("/{sueldo_id}", response_model=schemas.Sueldo)
-def obtener_sueldo(sueldo_id: int, db: Session = Depends(get_db)):
-    return crud.obtener_sueldo(db, sueldo_id)
+@router.get("/{sueldo_id}", response_model=schemas.Sueldo, dependencies=[Depends(condicional(models.Sueldo))])
+async def obtener_sueldo(sueldo_id: int, db: AsyncSession = Depends(get_db)):
+    sueldo = await crud.obtener_sueldo(db, sueldo_id)
+    if not sueldo:
+        raise HTTPException(status_code=404, detail="Sueldo no encontrado")
+    return sueldo
 
 @router.put("/{sueldo_id}", response_model=schemas.Sueldo)
-def actualizar_sueldo(sueldo_id: int, sueldo: schemas.SueldoCreate, db: Session = Depends(get_db)):
-    return crud.actualizar_sueldo(db, sueldo_id, sueldo)
+async def actualizar_sueldo(sueldo_id: int, sueldo: schemas.SueldoCreate, db: AsyncSession = Depends(get_db)):
+    actualizado = await crud.actualizar_sueldo(db, sueldo_id, sueldo)
+    if not actualizado:
+        raise HTTPException(status_code=404, detail="Sueldo no encontrado")
+    return actualizado
 
 @router.delete("/{sueldo_id}", response_model=schemas.Sueldo)
-def eliminar_sueldo(sueldo_id: int, db: Session = Depends(get_db)):
-    return crud.eliminar_sueldo(db, sueldo_id)
+async def eliminar_sueldo(sueldo_id: int, db: AsyncSession = Depends(get_db)):
+    sueldo = await crud.eliminar_sueldo(db, sueldo_id)
+    if not sueldo:
+        raise HTTPException(status_code=404, detail="Sueldo no encontrado")
+    return sueldo
@@ -0,0 +1,53 @@
+"""ETags fuertes para los GET, derivados de `versiones_tabla`.
+
+La ETag combina la versión de las tablas de origen con la URL pedida (ruta,
+query y Accept), así que se calcula sin leer ni serializar filas. Si coincide
+con `If-None-Match` la dependencia corta con 304 antes de llegar al endpoint.
+"""
+from hashlib import blake2b
+
+from fastapi import Depends, HTTPException, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from . import versiones
+from .database import get_db
+
+# El navegador guarda la respuesta pero revalida siempre con If-None-Match
+CACHE_CONTROL = "no-cache"
+
+
+def _coincide(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match usa comparación débil: W/"x" equivale a "x"
+    return any(candidata.strip().removeprefix("W/") == etag for candidata in if_none_match.split(","))
+
+
+def calcular(request: Request, version: tuple) -> str:
+    representacion = f"{request.url.path}?{request.url.query}|{request.headers.get('accept', '')}"
+    digest = blake2b(representacion.encode(), digest_size=8).hexdigest()
+    return '"' + "-".join(map(str, version)) + f'-{digest}"'
+
+
+def condicional(*modelos):
+    """Dependencia para GETs cuyo resultado solo depende de las tablas de `modelos`."""
+    tablas = [model.__tablename__ for model in modelos]
+
+    async def dependencia(request: Request, response: Response, db: AsyncSession = Depends(get_db)):
+        etag = calcular(request, await db.run_sync(versiones.leer, tablas))
+        cabeceras = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+        if _coincide(request.headers.get("if-none-match", ""), etag):
+            raise HTTPException(status_code=304, headers=cabeceras)
+        response.headers.update(cabeceras)
+        request.state.cabeceras_cache = cabeceras
+
+    return dependencia
+
+
+def cabeceras_cache(request: Request) -> dict:
+    """ETag y Cache-Control que calculó `condicional` para este pedido.
+
+    Las respuestas que el endpoint arma por su cuenta (StreamingResponse) no
+    heredan las cabeceras del `Response` inyectado: las copian de acá.
+    """
+    return dict(getattr(request.state, "cabeceras_cache", {}))
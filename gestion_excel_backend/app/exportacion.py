@@ -0,0 +1,432 @@
+import csv
+import io
+import json
+import queue
+import zipfile
+from dataclasses import replace
+from datetime import date
+from decimal import Decimal
+from threading import Event, Thread
+from typing import Optional
+from xml.sax.saxutils import escape
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+from openpyxl.utils import get_column_letter
+from openpyxl.utils.datetime import to_excel
+from sqlalchemy import BigInteger, Boolean, Date, DateTime, Float, Integer, Numeric, select
+
+from . import models, schemas
+from .database import SessionLocal
+from .etags import cabeceras_cache
+from .paginacion import Filtros, aplicar_filtros
+
+TAMANO_LOTE = 1000
+MEDIA_NDJSON = "application/x-ndjson"
+MEDIA_ARROW = "application/vnd.apache.arrow.stream"
+MEDIA_PARQUET = "application/vnd.apache.parquet"
+FORMATOS_STREAMING = ("ndjson", "csv", "parquet", "arrow")
+
+# Formatos columnares: cada lote leído es un row group / record batch, conviene que sea grande
+TAMANO_LOTE_COLUMNAR = 50_000
+# Numeric sin precisión en el esquema: se exporta con escala fija (sobra para montos)
+TIPO_DECIMAL = pa.decimal128(38, 6)
+FORMATOS_COLUMNARES = {
+    "parquet": (MEDIA_PARQUET, "parquet"),
+    "arrow": (MEDIA_ARROW, "arrows"),
+}
+MEDIA_XLSX = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+# Una hoja por recurso, en este orden, con las columnas del schema de salida
+HOJAS_EXPORTACION = {
+    "proyectos": (models.Proyecto, schemas.Proyecto),
+    "rrhh": (models.Rrhh, schemas.Rrhh),
+    "sueldos": (models.Sueldo, schemas.Sueldo),
+    "movimientos": (models.Movimiento, schemas.Movimiento),
+    "caja_menor": (models.CajaMenor, schemas.CajaMenor),
+    "compras": (models.Compra, schemas.Compra),
+    "administracion": (models.Administracion, schemas.AdministracionOut),
+}
+TAMANO_BUFFER_XLSX = 64 * 1024
+
+
+def formato_streaming(request: Request, formato: Optional[str]) -> Optional[str]:
+    """Devuelve el formato de streaming pedido (?format= o Accept) o None."""
+    if formato in FORMATOS_STREAMING:
+        return formato
+    aceptado = request.headers.get("accept", "")
+    if MEDIA_NDJSON in aceptado:
+        return "ndjson"
+    if MEDIA_ARROW in aceptado:
+        return "arrow"
+    return None
+
+
+def consulta_exportacion(model, campos, filtros: Optional[Filtros]):
+    columnas = [getattr(model, campo) for campo in campos]
+    return aplicar_filtros(select(*columnas), model, filtros)
+
+
+def leer_consulta(consulta, tamano_lote: int = TAMANO_LOTE):
+    """Ejecuta la consulta con un cursor del lado del servidor y entrega lotes de filas.
+
+    Abre su propia sesión: la de `get_db` ya está cerrada cuando el cuerpo
+    de un StreamingResponse empieza a enviarse.
+    """
+    db = SessionLocal()
+    try:
+        resultado = db.execute(consulta.execution_options(yield_per=tamano_lote))
+        for lote in resultado.partitions():
+            yield lote
+    finally:
+        db.close()
+
+
+def leer_en_lotes(model, campos, filtros: Optional[Filtros], tamano_lote: int = TAMANO_LOTE):
+    """Recorre la tabla filtrada en lotes de `tamano_lote` filas (ver `leer_consulta`)."""
+    return leer_consulta(consulta_exportacion(model, campos, filtros), tamano_lote)
+
+
+def _json_default(valor):
+    if isinstance(valor, Decimal):
+        return float(valor)
+    if isinstance(valor, date):
+        return valor.isoformat()
+    raise TypeError(f"Tipo no serializable: {type(valor)}")
+
+
+def _ndjson(lotes, campos):
+    for lote in lotes:
+        yield "".join(
+            json.dumps(dict(zip(campos, fila)), default=_json_default) + "\n" for fila in lote
+        )
+
+
+def _csv(lotes, campos):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(campos)
+    for lote in lotes:
+        writer.writerows(lote)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+    # Tabla vacía: al menos se envía el encabezado
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def respuesta_streaming(request: Request, model, schema, filtros: Filtros, formato: str):
+    """Arma un StreamingResponse NDJSON/CSV/Parquet/Arrow con los campos del schema de salida.
+
+    En modo streaming se exporta todo el historial filtrado salvo que el
+    cliente pase `limit` de forma explícita.
+    """
+    if "limit" not in request.query_params:
+        filtros = replace(filtros, limit=None)
+    campos = list(schema.model_fields)
+    # La ETag se calculó antes de leer filas (dependencia etags.condicional)
+    cabeceras = cabeceras_cache(request)
+    if formato in FORMATOS_COLUMNARES:
+        return respuesta_columnar(consulta_exportacion(model, campos, filtros), model.__tablename__, formato, cabeceras)
+    lotes = leer_en_lotes(model, campos, filtros)
+
+    if formato == "csv":
+        nombre = f"{model.__tablename__}.csv"
+        return StreamingResponse(
+            _csv(lotes, campos),
+            media_type="text/csv",
+            headers={**cabeceras, "Content-Disposition": f'attachment; filename="{nombre}"'},
+        )
+    return StreamingResponse(_ndjson(lotes, campos), media_type=MEDIA_NDJSON, headers=cabeceras)
+
+
+def _tipo_arrow(tipo):
+    # BigInteger antes que Integer: es subclase
+    if isinstance(tipo, BigInteger):
+        return pa.int64()
+    if isinstance(tipo, Integer):
+        return pa.int32()
+    if isinstance(tipo, Boolean):
+        return pa.bool_()
+    if isinstance(tipo, Float):
+        return pa.float64()
+    if isinstance(tipo, Numeric):
+        return TIPO_DECIMAL
+    if isinstance(tipo, DateTime):
+        return pa.timestamp("us")
+    if isinstance(tipo, Date):
+        return pa.date32()
+    return pa.string()
+
+
+def esquema_arrow(consulta) -> pa.Schema:
+    """Esquema tipado a partir de las columnas seleccionadas (ids enteros, fechas, decimales)."""
+    return pa.schema([pa.field(columna.name, _tipo_arrow(columna.type)) for columna in consulta.selected_columns])
+
+
+def _columna(valores, tipo):
+    try:
+        return pa.array(valores, type=tipo)
+    except pa.ArrowInvalid:
+        # Decimales con más escala que TIPO_DECIMAL: se redondean en vez de fallar
+        return pa.array([None if v is None else round(v, tipo.scale) for v in valores], type=tipo)
+
+
+def _lote_arrow(lote, esquema: pa.Schema) -> pa.RecordBatch:
+    columnas = zip(*lote)
+    return pa.RecordBatch.from_arrays(
+        [_columna(list(valores), campo.type) for valores, campo in zip(columnas, esquema)],
+        schema=esquema,
+    )
+
+
+class _Acumulador:
+    """Salida en memoria que pyarrow llena y el generador vacía tras cada lote.
+
+    `tell` sigue contando los bytes ya entregados: Parquet guarda offsets
+    absolutos en el footer.
+    """
+
+    def __init__(self):
+        self._bloques = []
+        self._posicion = 0
+        self.closed = False
+
+    def writable(self):
+        return True
+
+    def write(self, datos):
+        bloque = bytes(datos)
+        self._bloques.append(bloque)
+        self._posicion += len(bloque)
+        return len(bloque)
+
+    def tell(self):
+        return self._posicion
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def vaciar(self) -> bytes:
+        datos = b"".join(self._bloques)
+        self._bloques.clear()
+        return datos
+
+
+def _columnar(consulta, formato: str):
+    esquema = esquema_arrow(consulta)
+    salida = _Acumulador()
+    archivo = pa.PythonFile(salida, mode="w")
+    if formato == "parquet":
+        escritor = pq.ParquetWriter(archivo, esquema)
+    else:
+        escritor = pa.ipc.new_stream(archivo, esquema)
+    try:
+        # Un row group (Parquet) o record batch (Arrow) por lote leído de la BD
+        for lote in leer_consulta(consulta, TAMANO_LOTE_COLUMNAR):
+            escritor.write_batch(_lote_arrow(lote, esquema))
+            yield salida.vaciar()
+    finally:
+        escritor.close()
+    yield salida.vaciar()
+
+
+def respuesta_columnar(consulta, nombre: str, formato: str, cabeceras: dict = None):
+    """StreamingResponse Parquet o Arrow IPC (stream) con la consulta ya filtrada."""
+    media, extension = FORMATOS_COLUMNARES[formato]
+    return StreamingResponse(
+        _columnar(consulta, formato),
+        media_type=media,
+        headers={**(cabeceras or {}), "Content-Disposition": f'attachment; filename="{nombre}.{extension}"'},
+    )
+
+
+class _Tuberia(io.RawIOBase):
+    """Archivo de solo escritura que pasa cada bloque a la respuesta por una cola.
+
+    No admite seek ni tell: zipfile lo detecta y escribe el .xlsx en modo
+    streaming (descriptores de datos tras cada entrada).
+    """
+
+    def __init__(self, cola: queue.Queue, cancelado: Event):
+        self._cola = cola
+        self._cancelado = cancelado
+
+    def writable(self):
+        return True
+
+    def write(self, datos):
+        bloque = bytes(datos)
+        while not self._cancelado.is_set():
+            try:
+                self._cola.put(bloque, timeout=1)
+                return len(bloque)
+            except queue.Full:
+                continue
+        raise OSError("Descarga cancelada por el cliente")
+
+
+def hojas_exportables(recursos, filtros: Filtros) -> list[str]:
+    """Recursos pedidos que admiten los filtros: sin la columna filtrada la hoja se omite."""
+    elegidos = []
+    for recurso in recursos or HOJAS_EXPORTACION:
+        model, _ = HOJAS_EXPORTACION[recurso]
+        if filtros.proyecto_id is not None and not hasattr(model, "proyecto_id"):
+            continue
+        if filtros.periodo_id is not None and not hasattr(model, "periodo_id"):
+            continue
+        elegidos.append(recurso)
+    return elegidos
+
+
+# Partes fijas del paquete SpreadsheetML: libro, relaciones y un estilo de fecha (cellXfs 1)
+_NS_HOJA = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+_NS_REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_NS_PAQUETE = "http://schemas.openxmlformats.org/package/2006/relationships"
+_ESTILOS_XLSX = (
+    f'<styleSheet xmlns="{_NS_HOJA}">'
+    '<fonts count="1"><font><sz val="11"/><name val="Calibri"/></font></fonts>'
+    '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill></fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="2"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="14" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/></cellXfs>'
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+    "</styleSheet>"
+)
+
+
+def _partes_xlsx(hojas: list[str]) -> dict:
+    """Todo el paquete menos las hojas; se escribe antes de la primera fila."""
+    hojas_ct = "".join(
+        f'<Override PartName="/xl/worksheets/sheet{i}.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        for i in range(1, len(hojas) + 1)
+    )
+    hojas_libro = "".join(
+        f'<sheet name="{escape(nombre, {chr(34): "&quot;"})}" sheetId="{i}" r:id="rId{i}"/>'
+        for i, nombre in enumerate(hojas, 1)
+    )
+    hojas_rels = "".join(
+        f'<Relationship Id="rId{i}" Type="{_NS_REL}/worksheet" Target="worksheets/sheet{i}.xml"/>'
+        for i in range(1, len(hojas) + 1)
+    )
+    return {
+        "[Content_Types].xml": (
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/xl/workbook.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+            '<Override PartName="/xl/styles.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+            f"{hojas_ct}</Types>"
+        ),
+        "_rels/.rels": (
+            f'<Relationships xmlns="{_NS_PAQUETE}">'
+            f'<Relationship Id="rId1" Type="{_NS_REL}/officeDocument" Target="xl/workbook.xml"/>'
+            "</Relationships>"
+        ),
+        "xl/workbook.xml": (
+            f'<workbook xmlns="{_NS_HOJA}" xmlns:r="{_NS_REL}"><sheets>{hojas_libro}</sheets></workbook>'
+        ),
+        "xl/_rels/workbook.xml.rels": (
+            f'<Relationships xmlns="{_NS_PAQUETE}">{hojas_rels}'
+            f'<Relationship Id="rId{len(hojas) + 1}" Type="{_NS_REL}/styles" Target="styles.xml"/>'
+            "</Relationships>"
+        ),
+        "xl/styles.xml": _ESTILOS_XLSX,
+    }
+
+
+def _celda_xlsx(referencia: str, valor) -> str:
+    if valor is None:
+        return ""
+    if isinstance(valor, bool):
+        return f'<c r="{referencia}" t="b"><v>{int(valor)}</v></c>'
+    if isinstance(valor, (int, float, Decimal)):
+        return f'<c r="{referencia}"><v>{valor}</v></c>'
+    if isinstance(valor, date):
+        return f'<c r="{referencia}" s="1"><v>{to_excel(valor)}</v></c>'
+    texto = escape(ILLEGAL_CHARACTERS_RE.sub("", str(valor)))
+    return f'<c r="{referencia}" t="inlineStr"><is><t xml:space="preserve">{texto}</t></is></c>'
+
+
+def _filas_xlsx(filas, columnas: list[str], desde: int) -> str:
+    return "".join(
+        f'<row r="{n}">'
+        + "".join(_celda_xlsx(f"{columna}{n}", valor) for columna, valor in zip(columnas, fila))
+        + "</row>"
+        for n, fila in enumerate(filas, desde)
+    )
+
+
+def _escribir_xlsx(salida, recursos, filtros: Filtros):
+    """Escribe el .xlsx fila por fila directo al zip, sin pasar por archivos temporales.
+
+    openpyxl (aun en write_only) arma el zip recién en `save`, después de
+    leer todas las filas: el primer byte salía al final. Acá cada lote leído
+    se comprime y se entrega en el momento.
+    """
+    with zipfile.ZipFile(salida, "w", zipfile.ZIP_DEFLATED) as paquete:
+        for nombre, contenido in _partes_xlsx(recursos).items():
+            paquete.writestr(nombre, contenido)
+        for i, recurso in enumerate(recursos, 1):
+            model, schema = HOJAS_EXPORTACION[recurso]
+            campos = list(schema.model_fields)
+            columnas = [get_column_letter(j) for j in range(1, len(campos) + 1)]
+            with paquete.open(f"xl/worksheets/sheet{i}.xml", "w") as hoja:
+                hoja.write(f'<worksheet xmlns="{_NS_HOJA}"><sheetData>'.encode())
+                hoja.write(_filas_xlsx([campos], columnas, 1).encode())
+                fila = 2
+                for lote in leer_en_lotes(model, campos, filtros):
+                    hoja.write(_filas_xlsx(lote, columnas, fila).encode())
+                    fila += len(lote)
+                hoja.write(b"</sheetData></worksheet>")
+
+
+def _xlsx(recursos, filtros: Filtros):
+    # El zip se escribe en un hilo aparte; este generador entrega lo que va saliendo
+    cola = queue.Queue(maxsize=16)
+    cancelado = Event()
+    fin = object()
+
+    def escribir():
+        try:
+            salida = io.BufferedWriter(_Tuberia(cola, cancelado), TAMANO_BUFFER_XLSX)
+            _escribir_xlsx(salida, recursos, filtros)
+            salida.flush()
+            cola.put(fin)
+        except Exception as e:  # se relanza en el generador
+            if not cancelado.is_set():
+                cola.put(e)
+
+    hilo = Thread(target=escribir, daemon=True)
+    hilo.start()
+    try:
+        while True:
+            bloque = cola.get()
+            if bloque is fin:
+                break
+            if isinstance(bloque, Exception):
+                raise bloque
+            yield bloque
+    finally:
+        cancelado.set()
+
+
+def respuesta_xlsx(recursos, filtros: Filtros):
+    filtros = replace(filtros, limit=None, after_id=None)
+    return StreamingResponse(
+        _xlsx(hojas_exportables(recursos, filtros), filtros),
+        media_type=MEDIA_XLSX,
+        headers={"Content-Disposition": 'attachment; filename="export.xlsx"'},
+    )
@@ -0,0 +1,654 @@
+"""Motor de importación compartido por los scripts de `scripts/importar_*.py`.
+
+Toda la limpieza se hace con operaciones de columna de pandas/NumPy: filtrado
+de nulos, coerción de tipos y el melt de la hoja de dedicación RRHH. El
+resultado es un DataFrame con las columnas del modelo que se inserta en bloque.
+"""
+import io
+import logging
+import numbers
+from datetime import date
+
+import openpyxl
+import pandas as pd
+from sqlalchemy import Integer, delete, insert, or_, select
+from sqlalchemy.orm import Session
+
+from . import agregados, models, nombres, versiones
+
+# Los scripts de importación configuran la salida (scripts/importar_*.py)
+log = logging.getLogger(__name__)
+
+EXCEL_PATH = "data/01_Historico_Gastos_2024_v2.xlsx"
+
+HOJA_PROYECTOS = "0.1 Datos de Proyectos"
+HOJA_RRHH = "Dedicación RRHH"
+HOJA_MOVIMIENTOS = "1. GastosXProyecto"
+HOJA_SUELDOS = "2. Sueldos"
+HOJA_CAJA_MENOR = "4. Gastos CajaMenor"
+HOJA_COMPRAS = "5. Compras"
+HOJA_ADMINISTRACION = "6. Administración"
+
+TAMANO_CHUNK = 5000
+
+MESES_ES = ["Enero", "Febrero", "Marzo", "Abril", "Mayo", "Junio",
+            "Julio", "Agosto", "Septiembre", "Octubre", "Noviembre", "Diciembre"]
+
+COLUMNAS_COMPRAS = [
+    "fecha", "semana", "presupuesto", "centro_costo", "proyecto", "iva",
+    "proveedor", "valor", "forma_pago", "estado", "descripcion", "observaciones",
+]
+
+
+# ---------- Coerción de columnas ----------
+
+def normalizar_columnas(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.copy()
+    df.columns = df.columns.astype(str).str.strip().str.lower().str.replace(" ", "_")
+    return df
+
+
+def texto(serie: pd.Series) -> pd.Series:
+    """Texto sin espacios en los extremos; vacíos y nulos quedan como NA."""
+    s = serie.astype("string").str.strip()
+    return s.mask(s == "")
+
+
+def numero(serie: pd.Series) -> pd.Series:
+    return pd.to_numeric(serie, errors="coerce")
+
+
+def fecha(serie: pd.Series) -> pd.Series:
+    return pd.to_datetime(serie, errors="coerce")
+
+
+def mes_es(fechas: pd.Series) -> pd.Series:
+    """Nombre del mes en español para una serie datetime (NA si la fecha es inválida)."""
+    return fechas.dt.month.map(dict(enumerate(MESES_ES, start=1)))
+
+
+def como_fecha(fechas: pd.Series) -> pd.Series:
+    return fechas.dt.date.where(fechas.notna())
+
+
+# ---------- Preparación por hoja ----------
+
+def preparar_proyectos(df: pd.DataFrame) -> pd.DataFrame:
+    """Hoja leída con header=1."""
+    df = normalizar_columnas(df).dropna(subset=["proyecto"])
+    columnas = df.reindex(columns=["centro_de_costo", "subproyecto", "estado", "presupuesto_actual"])
+    centro = columnas["centro_de_costo"]
+    return pd.DataFrame({
+        "nombre": df["proyecto"],
+        # centro_costo puede venir como número en el Excel
+        "centro_costo": centro.astype(str).where(centro.notna()),
+        "subproyecto": columnas["subproyecto"],
+        "estado": columnas["estado"],
+        "presupuesto": numero(columnas["presupuesto_actual"]),
+    })
+
+
+def preparar_rrhh(df: pd.DataFrame) -> pd.DataFrame:
+    """Hoja leída con header=1. Pasa la matriz persona x proyecto a formato largo."""
+    df = normalizar_columnas(df)
+    columnas_proyecto = df.columns.difference(
+        ["nombre", "equipo", "dedicación_actual_total"], sort=False
+    )
+    largo = df.melt(
+        id_vars=["nombre", "equipo"],
+        value_vars=list(columnas_proyecto),
+        var_name="proyecto",
+        value_name="dedicacion_total",
+    )
+    largo["dedicacion_total"] = numero(largo["dedicacion_total"])
+    largo = largo[largo["dedicacion_total"] > 0]
+    return largo[["nombre", "equipo", "proyecto", "dedicacion_total"]].reset_index(drop=True)
+
+
+def preparar_movimientos(df: pd.DataFrame) -> pd.DataFrame:
+    """Hoja leída con header=2."""
+    df = normalizar_columnas(df).rename(columns={
+        "subproyecto": "nombre_proyecto",
+        "total": "valor",
+        "fecha_inicio": "fecha",
+    })
+    df = df.assign(valor=numero(df["valor"])).dropna(subset=["nombre_proyecto", "valor"])
+    fechas = fecha(df["fecha"]).fillna(pd.Timestamp(date.today()))
+    return pd.DataFrame({
+        "nombre_proyecto": df["nombre_proyecto"],
+        "mes": df.reindex(columns=["mes"])["mes"],
+        "valor": df["valor"],
+        "fecha": como_fecha(fechas),
+    }).reset_index(drop=True)
+
+
+def preparar_sueldos(df: pd.DataFrame) -> pd.DataFrame:
+    """Hoja leída con header=2."""
+    df = normalizar_columnas(df).rename(columns={
+        "rrhh": "nombre",
+        "costo": "valor",
+        "subproyecto": "proyecto",
+    })
+    df = pd.DataFrame({
+        "nombre": texto(df["nombre"]),
+        "mes": texto(df["mes"]),
+        "valor": numero(df["valor"]),
+        "proyecto": texto(df["proyecto"]),
+    }).dropna()
+    df["horas"] = None
+    df["fecha"] = date.today()
+    return df.reset_index(drop=True)
+
+
+def preparar_caja_menor(df: pd.DataFrame) -> pd.DataFrame:
+    """Hoja leída con header=2."""
+    df = df.rename(columns={
+        "Fecha": "fecha",
+        "Valor": "valor",
+        "SubProyecto": "subproyecto",
+    })
+    fechas = fecha(df["fecha"])
+    df = pd.DataFrame({
+        "nombre_proyecto": texto(df["subproyecto"]),
+        "valor": numero(df["valor"]),
+        "fecha": como_fecha(fechas),
+        "mes": mes_es(fechas),
+    }).dropna(subset=["nombre_proyecto", "valor", "mes"])
+    return df.reset_index(drop=True)
+
+
+def preparar_compras(df: pd.DataFrame) -> pd.DataFrame:
+    """Hoja leída con header=None y columnas posicionales."""
+    df = df.set_axis(COLUMNAS_COMPRAS, axis=1)
+    fechas = fecha(df["fecha"])
+    df = pd.DataFrame({
+        "nombre_proyecto": texto(df["proyecto"]),
+        "valor": numero(df["valor"]),
+        "proveedor": df["proveedor"],
+        "descripcion": df["descripcion"],
+        "forma_pago": df["forma_pago"],
+        "estado": df["estado"],
+        "fecha": como_fecha(fechas),
+        "mes": mes_es(fechas),
+    }).dropna(subset=["nombre_proyecto", "valor", "mes"])
+    return df.reset_index(drop=True)
+
+
+def preparar_administracion(df: pd.DataFrame) -> pd.DataFrame:
+    """Hoja encuadrada en la fila "Nombre del Costo" (ver `encuadrar`)."""
+    df = df.iloc[:, [0, 3, 4]].set_axis(["tipo_costo", "periodicidad", "valor"], axis=1)
+    df = df.assign(valor=numero(df["valor"])).dropna(subset=["valor"])
+    df["descripcion"] = None
+    df["fecha"] = None
+    return df.reset_index(drop=True)
+
+
+# recurso -> (hoja, encabezado, preparador)
+# El encabezado es la fila (como `header` de pandas), None para columnas
+# posicionales, o el texto de la primera celda de la fila de encabezado.
+HOJAS = {
+    "proyectos": (HOJA_PROYECTOS, 1, preparar_proyectos),
+    "rrhh": (HOJA_RRHH, 1, preparar_rrhh),
+    "movimientos": (HOJA_MOVIMIENTOS, 2, preparar_movimientos),
+    "sueldos": (HOJA_SUELDOS, 2, preparar_sueldos),
+    "caja_menor": (HOJA_CAJA_MENOR, 2, preparar_caja_menor),
+    "compras": (HOJA_COMPRAS, None, preparar_compras),
+    "administracion": (HOJA_ADMINISTRACION, "Nombre del Costo", preparar_administracion),
+}
+
+MODELOS = {
+    "proyectos": models.Proyecto,
+    "rrhh": models.Rrhh,
+    "movimientos": models.Movimiento,
+    "sueldos": models.Sueldo,
+    "caja_menor": models.CajaMenor,
+    "compras": models.Compra,
+    "administracion": models.Administracion,
+}
+
+
+def encuadrar(df: pd.DataFrame, marcador: str) -> pd.DataFrame:
+    """Usa como encabezado la primera fila cuya primera celda es `marcador`."""
+    fila = df.index[df.iloc[:, 0] == marcador][0]
+    return df.iloc[fila + 1:].set_axis(df.iloc[fila], axis=1)
+
+
+def leer_hoja(fuente, recurso: str) -> pd.DataFrame:
+    """Lee la hoja completa con pandas y la devuelve con su encabezado aplicado."""
+    hoja, encabezado, _ = HOJAS[recurso]
+    if isinstance(encabezado, str):
+        return encuadrar(pd.read_excel(fuente, sheet_name=hoja, header=None), encabezado)
+    return pd.read_excel(fuente, sheet_name=hoja, header=encabezado)
+
+
+def parsear_hoja(contenido: bytes, recurso: str) -> pd.DataFrame:
+    """Parsea y prepara una hoja desde el libro ya leído en memoria.
+
+    Es una función de módulo para poder ejecutarse en un ProcessPoolExecutor.
+    """
+    _, _, preparar = HOJAS[recurso]
+    return preparar(leer_hoja(io.BytesIO(contenido), recurso))
+
+
+# ---------- Lectura en streaming ----------
+
+def _columnas(encabezado, ancho: int) -> list:
+    """Nombres de columna como los deja pandas: vacíos -> "Unnamed: i"."""
+    if encabezado is None:
+        return list(range(ancho))
+    nombres = list(encabezado)[:ancho]
+    nombres += [None] * (ancho - len(nombres))
+    return [f"Unnamed: {i}" if n is None else n for i, n in enumerate(nombres)]
+
+
+def leer_hoja_en_chunks(archivo, recurso: str, tamano: int = TAMANO_CHUNK):
+    """Recorre la hoja con openpyxl en modo read_only y entrega DataFrames de `tamano` filas.
+
+    Nunca hay más de un chunk en memoria, así que el consumo no depende del
+    largo de la hoja. El encabezado se detecta igual que en `leer_hoja`.
+    """
+    hoja, encabezado, _ = HOJAS[recurso]
+    libro = openpyxl.load_workbook(archivo, read_only=True, data_only=True)
+    try:
+        filas = libro[hoja].iter_rows(values_only=True)
+        cabecera = None
+        if isinstance(encabezado, str):
+            for fila in filas:
+                if fila and fila[0] == encabezado:
+                    cabecera = fila
+                    break
+            else:
+                return
+        elif encabezado is not None:
+            for _ in range(encabezado):
+                next(filas, None)
+            cabecera = next(filas, None)
+
+        lote = []
+        for fila in filas:
+            lote.append(fila)
+            if len(lote) == tamano:
+                yield _a_dataframe(lote, cabecera)
+                lote = []
+        if lote:
+            yield _a_dataframe(lote, cabecera)
+    finally:
+        libro.close()
+
+
+def _a_dataframe(lote: list, cabecera) -> pd.DataFrame:
+    df = pd.DataFrame.from_records(lote)
+    return df.set_axis(_columnas(cabecera, df.shape[1]), axis=1)
+
+
+# ---------- Carga ----------
+
+def a_registros(df: pd.DataFrame, columnas) -> list[dict]:
+    """Filas como dicts con tipos de Python y None en lugar de NaN/NaT."""
+    df = df[list(columnas)].astype(object)
+    return df.where(df.notna(), None).to_dict("records")
+
+
+def registros_modelo(model, df: pd.DataFrame) -> list[dict]:
+    """Registros con las columnas del modelo presentes en el DataFrame."""
+    if "nombre" in df.columns and hasattr(model, "nombre_normalizado"):
+        # Se escribe ya en el INSERT: los hechos de la misma transacción cruzan por esta columna
+        df = df.assign(nombre_normalizado=df["nombre"].map(nombres.normalizar))
+    columnas = [c for c in model.__table__.columns if c.name in df.columns]
+    df = df.assign(**{
+        # las FKs quedan en float tras un .map con faltantes
+        c.name: df[c.name].astype("Int64")
+        for c in columnas if isinstance(c.type, Integer) and df[c.name].dtype.kind == "f"
+    })
+    return a_registros(df, [c.name for c in columnas])
+
+
+def descartar_consolidados(db: Session, model, df: pd.DataFrame) -> tuple[pd.DataFrame, int]:
+    """Quita las filas de periodos consolidados: sus hechos no se modifican hasta reabrirlos."""
+    if not hasattr(model, "periodo_id") or "periodo_id" not in df.columns:
+        return df, 0
+    cerrados = agregados.periodos_consolidados(db)
+    if not cerrados:
+        return df, 0
+    cerradas = df["periodo_id"].isin(cerrados)
+    return df[~cerradas], int(cerradas.sum())
+
+
+def reportar_consolidados(recurso: str, omitidas: int):
+    if omitidas:
+        log.info("🔒 %s: %d filas de periodos consolidados omitidas", recurso, omitidas)
+
+
+def cargar(db: Session, model, df: pd.DataFrame, commit: bool = True) -> int:
+    """Inserta el DataFrame en bloque (executemany) con las columnas del modelo presentes.
+
+    Las filas de periodos consolidados se omiten (ver `descartar_consolidados`).
+    """
+    df, omitidas = descartar_consolidados(db, model, df)
+    reportar_consolidados(model.__tablename__, omitidas)
+    registros = registros_modelo(model, df)
+    if registros:
+        db.execute(insert(model), registros)
+        if model in agregados.CATEGORIAS:
+            agregados.registrar_altas(db, model, registros)
+    if commit:
+        db.commit()
+    return len(registros)
+
+
+# ---------- Resolución de dimensiones ----------
+
+def resolver_fks(db: Session, df: pd.DataFrame, reglas: dict, indices: dict = None) -> tuple[pd.DataFrame, dict]:
+    """Resuelve todas las FKs del DataFrame con un cruce por dimensión.
+
+    `reglas` es {columna_destino: (columna_del_df, columna_del_modelo)}, por
+    ejemplo {"proyecto_id": ("nombre_proyecto", models.Proyecto.nombre)}.
+    Los nombres se cruzan solo por igualdad de su clave normalizada (sin
+    acentos, mayúsculas ni espacios repetidos, ver app/nombres.py).
+    Devuelve las filas con todas sus FKs resueltas y, por columna de origen,
+    {nombre no encontrado: sugerencia}, donde la sugerencia es el
+    (nombre, similitud) más parecido de la dimensión o None: no se aplica,
+    queda para que alguien la revise. El costo es una consulta por dimensión
+    y no por fila. Si se pasa `indices` (un dict vacío compartido entre
+    llamadas), cada nombre se busca una sola vez aunque la hoja llegue en
+    varios chunks.
+    """
+    df = df.copy()
+    indices = {} if indices is None else indices
+    no_resueltos = {}
+    for destino, (origen, columna) in reglas.items():
+        # {texto: id o None}; los que faltan se buscan con un IN por la clave normalizada
+        cruce = indices.setdefault(str(columna), {})
+        nuevos = [texto for texto in df[origen].dropna().unique() if texto not in cruce]
+        if nuevos:
+            cruce.update(dict.fromkeys(nuevos))
+            cruce.update(nombres.resolver_exactos(db, columna, nuevos))
+        # Int64: con algún nombre sin resolver el .map deja la columna en float
+        df[destino] = df[origen].map(cruce).astype("Int64")
+        faltan = df[destino].isna()
+        if faltan.any():
+            faltantes = df.loc[faltan, origen].dropna().unique()
+            no_resueltos[origen] = _sugerencias(db, columna, faltantes, indices)
+    return df.dropna(subset=list(reglas)), no_resueltos
+
+
+def _sugerencias(db: Session, columna, textos, indices: dict) -> dict:
+    # El índice de trigramas se arma solo si algún nombre no se encontró
+    clave = f"{columna}:sugerencias"
+    if clave not in indices:
+        indices[clave] = nombres.cargar(db, columna)
+    sugerencias = indices[clave].sugerir(textos)
+    return {str(texto): sugerencias.get(texto) for texto in textos}
+
+
+def reportar_no_resueltos(no_resueltos: dict):
+    for origen, faltantes in no_resueltos.items():
+        log.warning("⚠️ %d valores de '%s' sin coincidencia: %s", len(faltantes), origen, ", ".join(sorted(faltantes)))
+        for texto, sugerencia in sorted(faltantes.items()):
+            if sugerencia is not None:
+                nombre, similitud = sugerencia
+                log.warning("🔎 '%s': ¿'%s' es '%s'? (similitud %s); revisar el Excel", origen, texto, nombre, similitud)
+
+
+# FKs de cada hoja de hechos: {columna_destino: (columna_del_df, columna_del_modelo)}
+REGLAS_FK = {
+    "movimientos": {
+        "proyecto_id": ("nombre_proyecto", models.Proyecto.nombre),
+    },
+    "sueldos": {
+        "rrhh_id": ("nombre", models.Rrhh.nombre),
+        "proyecto_id": ("proyecto", models.Proyecto.nombre),
+        "periodo_id": ("mes", models.Periodo.nombre),
+    },
+    "caja_menor": {
+        "proyecto_id": ("nombre_proyecto", models.Proyecto.nombre),
+        "periodo_id": ("mes", models.Periodo.nombre),
+    },
+    "compras": {
+        "proyecto_id": ("nombre_proyecto", models.Proyecto.nombre),
+        "periodo_id": ("mes", models.Periodo.nombre),
+    },
+}
+
+
+def importar_en_chunks(db: Session, recurso: str, archivo, tamano: int = TAMANO_CHUNK,
+                       indices: dict = None) -> dict:
+    """Importa una hoja en memoria acotada: lee, prepara, resuelve y sincroniza chunk a chunk.
+
+    Cada chunk pasa por `sincronizar` (upsert por clave_importacion), así que
+    volver a correrlo no duplica filas. No hace commit; el llamador decide el
+    alcance de la transacción.
+    """
+    _, _, preparar = HOJAS[recurso]
+    model = MODELOS[recurso]
+    indices = {} if indices is None else indices
+    no_resueltos = {}
+    # Las huellas guardadas se leen una vez por hoja, no por chunk
+    guardadas = huellas_guardadas(db, model)
+    vistas = {}
+    resumen = {}
+    for chunk in leer_hoja_en_chunks(archivo, recurso, tamano):
+        df = preparar(chunk)
+        if recurso in REGLAS_FK:
+            df, faltantes = resolver_fks(db, df, REGLAS_FK[recurso], indices)
+            for origen, sugerencias in faltantes.items():
+                no_resueltos.setdefault(origen, {}).update(sugerencias)
+        df = con_huellas(df, recurso, vistas)
+        conteos = sincronizar(db, recurso, df, commit=False, guardadas=guardadas)
+        for clave, n in conteos.items():
+            resumen[clave] = resumen.get(clave, 0) + n
+    reportar_no_resueltos(no_resueltos)
+    return resumen
+
+
+# ---------- Reimportación incremental ----------
+
+# Identidad de una fila del Excel entre importaciones, y los valores que se
+# comparan para saber si cambió. Las fechas que se completan con la fecha del
+# día (movimientos sin fecha, sueldos) quedan fuera para no marcar cambios falsos.
+CLAVES_NATURALES = {
+    "proyectos": ["nombre"],
+    "rrhh": ["nombre", "proyecto"],
+    "movimientos": ["proyecto_id", "mes"],
+    "sueldos": ["rrhh_id", "proyecto_id", "periodo_id"],
+    "caja_menor": ["proyecto_id", "periodo_id"],
+    "compras": ["proyecto_id", "periodo_id", "proveedor"],
+    "administracion": ["tipo_costo", "periodicidad"],
+}
+
+VALORES_HUELLA = {
+    "proyectos": ["centro_costo", "subproyecto", "estado", "presupuesto"],
+    "rrhh": ["equipo", "dedicacion_total"],
+    "movimientos": ["valor"],
+    "sueldos": ["valor"],
+    "caja_menor": ["valor", "fecha"],
+    "compras": ["valor", "fecha", "descripcion", "forma_pago", "estado"],
+    "administracion": ["valor"],
+}
+
+
+def _numero_canonico(valor) -> str:
+    valor = float(valor)
+    return str(int(valor)) if valor.is_integer() else str(valor)
+
+
+def _canonica(serie: pd.Series) -> pd.Series:
+    """Texto de cada valor que no depende del dtype de la columna.
+
+    1, 1.0 e Int64(1) dan "1": una FK queda en float cuando algún nombre de
+    la hoja no se resolvió y la clave tiene que ser la misma que en una carga
+    limpia. Los nulos de cualquier tipo quedan como None.
+    """
+    presentes = serie.notna()
+    if pd.api.types.is_numeric_dtype(serie) and not pd.api.types.is_bool_dtype(serie):
+        flotantes = serie.astype("float64")
+        enteros = presentes & (flotantes % 1 == 0)
+        texto = flotantes.astype(str).astype(object)
+        texto[enteros] = flotantes[enteros].astype("int64").astype(str)
+        return texto.where(presentes, None)
+    return serie.astype(object).where(presentes, None).map(
+        lambda v: _numero_canonico(v) if isinstance(v, numbers.Number) and not isinstance(v, bool) else str(v),
+        na_action="ignore",
+    )
+
+
+def _hash_filas(df: pd.DataFrame) -> pd.Series:
+    """Hash estable de 64 bits por fila, sobre el texto canónico de cada valor (ver `_canonica`)."""
+    texto_filas = pd.DataFrame({columna: _canonica(df[columna]) for columna in df.columns}).astype(str)
+    hashes = pd.util.hash_pandas_object(texto_filas, index=False).to_numpy()
+    return pd.Series(hashes.view("int64"), index=df.index)
+
+
+def con_huellas(df: pd.DataFrame, recurso: str, vistas: dict = None) -> pd.DataFrame:
+    """Agrega `clave_importacion` y `huella` a cada fila preparada.
+
+    Las filas con la misma clave natural se distinguen por su orden de
+    aparición dentro de la hoja. Al procesar la hoja por chunks, `vistas`
+    lleva la cuenta de apariciones de los chunks anteriores para que las
+    claves sean las mismas que leyendo la hoja entera.
+    """
+    claves = CLAVES_NATURALES[recurso]
+    ocurrencia = df.groupby(claves, dropna=False).cumcount()
+    if vistas is not None:
+        natural = _hash_filas(df[claves])
+        ocurrencia += natural.map(vistas).fillna(0).astype("int64")
+        for clave, n in natural.value_counts().items():
+            vistas[clave] = vistas.get(clave, 0) + n
+    df = df.assign(_ocurrencia=ocurrencia)
+    identidad = claves + ["_ocurrencia"]
+    return df.assign(
+        clave_importacion=_hash_filas(df[identidad]),
+        huella=_hash_filas(df[identidad + VALORES_HUELLA[recurso]]),
+    ).drop(columns="_ocurrencia")
+
+
+def _upsert(db: Session, model):
+    """INSERT ... ON CONFLICT (clave_importacion) DO UPDATE para el dialecto en uso."""
+    dialecto = db.get_bind().dialect.name
+    if dialecto == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as insert_dialecto
+    elif dialecto == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as insert_dialecto
+    else:
+        raise NotImplementedError(f"Upsert no soportado para {dialecto}")
+    stmt = insert_dialecto(model)
+    actualizables = [c.name for c in model.__table__.columns if c.name not in ("id", "clave_importacion")]
+    return stmt.on_conflict_do_update(
+        index_elements=[model.clave_importacion],
+        set_={c: stmt.excluded[c] for c in actualizables},
+    )
+
+
+def _columnas_agregado(model) -> list:
+    """Columnas de la fila que definen su aporte a gasto_x_proyecto (vacío si no es un hecho)."""
+    if model not in agregados.CATEGORIAS:
+        return []
+    return [getattr(model, c) for c in ("proyecto_id", "periodo_id", "valor") if hasattr(model, c)]
+
+
+def _filas_previas(db: Session, model, claves: list) -> dict:
+    """{clave_importacion: fila guardada} con las columnas del agregado, antes del upsert."""
+    previas = {}
+    for i in range(0, len(claves), 1000):
+        consulta = select(model.clave_importacion, *_columnas_agregado(model)).where(
+            model.clave_importacion.in_(claves[i:i + 1000])
+        )
+        previas.update((fila.clave_importacion, fila) for fila in db.execute(consulta))
+    return previas
+
+
+def eliminar_ausentes(db: Session, recurso: str, vigentes: pd.Series, guardadas: pd.DataFrame = None) -> int:
+    """Borra las filas importadas cuya clave ya no aparece en el Excel.
+
+    Las de periodos consolidados se conservan aunque falten en el Excel.
+    """
+    model = MODELOS[recurso]
+    if guardadas is None:
+        guardadas = pd.DataFrame(
+            db.query(model.clave_importacion).filter(model.clave_importacion.isnot(None)).all(),
+            columns=["clave_importacion"],
+        )
+    sobrantes = guardadas.loc[
+        ~guardadas["clave_importacion"].isin(vigentes), "clave_importacion"
+    ].astype(int).tolist()
+    cerrados = agregados.periodos_consolidados(db) if hasattr(model, "periodo_id") else set()
+    eliminadas = 0
+    for i in range(0, len(sobrantes), 1000):
+        stmt = delete(model).where(model.clave_importacion.in_(sobrantes[i:i + 1000]))
+        if cerrados:
+            stmt = stmt.where(or_(model.periodo_id.is_(None), model.periodo_id.not_in(cerrados)))
+        filas = db.execute(
+            stmt.returning(model.id, *_columnas_agregado(model)).execution_options(synchronize_session=False)
+        ).all()
+        # Quedan como bajas en el feed de cambios y se descuentan del agregado
+        versiones.registrar_bajas(db, model.__tablename__, [fila.id for fila in filas])
+        if filas and model in agregados.CATEGORIAS:
+            agregados.registrar_eliminadas(db, model, filas)
+        eliminadas += len(filas)
+    return eliminadas
+
+
+def huellas_guardadas(db: Session, model) -> pd.DataFrame:
+    """Clave de importación y huella de las filas ya importadas del modelo."""
+    return pd.DataFrame(
+        db.query(model.clave_importacion, model.huella)
+        .filter(model.clave_importacion.isnot(None))
+        .all(),
+        columns=["clave_importacion", "huella_guardada"],
+    ).astype("Int64")
+
+
+def sincronizar(db: Session, recurso: str, df: pd.DataFrame, eliminar: bool = False,
+                commit: bool = True, guardadas: pd.DataFrame = None) -> dict:
+    """Reimporta la hoja tocando solo lo que cambió desde la última importación.
+
+    Compara las huellas nuevas con las guardadas (una consulta), escribe las
+    filas nuevas o modificadas con un upsert en bloque y, si `eliminar`, borra
+    las filas importadas que ya no están en el Excel. Las filas creadas desde
+    la API no tienen clave de importación y nunca se tocan, y las de periodos
+    consolidados tampoco (se cuentan en "omitidos"). En las tablas de hechos
+    cada alta, cambio y baja se aplica como delta a gasto_x_proyecto en la
+    misma transacción: una importación sin cambios no lo toca.
+
+    `guardadas` (ver `huellas_guardadas`) evita releerlas cuando la hoja se
+    sincroniza por chunks.
+    """
+    model = MODELOS[recurso]
+    if "huella" not in df.columns:
+        df = con_huellas(df, recurso)
+    vigentes = df["clave_importacion"]
+    # Las huellas se calculan antes: el orden de aparición no depende de lo omitido
+    df, omitidas = descartar_consolidados(db, model, df)
+
+    if guardadas is None:
+        guardadas = huellas_guardadas(db, model)
+    cruce = df.merge(guardadas, on="clave_importacion", how="left")
+    nuevas = cruce["huella_guardada"].isna()
+    cambiadas = ~nuevas & (cruce["huella_guardada"] != cruce["huella"]).fillna(False).astype(bool)
+    pendientes = cruce[nuevas | cambiadas].drop(columns="huella_guardada")
+
+    registros = registros_modelo(model, pendientes)
+    es_nueva = nuevas[nuevas | cambiadas].tolist()
+    es_hecho = model in agregados.CATEGORIAS
+    if es_hecho:
+        # Valores anteriores de las filas cambiadas, para mover su aporte en el agregado
+        previas = _filas_previas(db, model, [r["clave_importacion"] for r, n in zip(registros, es_nueva) if not n])
+    if registros:
+        db.execute(_upsert(db, model), registros)
+        if es_hecho:
+            agregados.registrar_altas(db, model, [r for r, n in zip(registros, es_nueva) if n])
+            agregados.registrar_cambios(db, model, [
+                (previas[r["clave_importacion"]], r) for r, n in zip(registros, es_nueva) if not n
+            ])
+
+    eliminadas = eliminar_ausentes(db, recurso, vigentes, guardadas) if eliminar else 0
+
+    if commit:
+        db.commit()
+    return {
+        "insertados": int(nuevas.sum()),
+        "actualizados": int(cambiadas.sum()),
+        "sin_cambios": int(len(cruce) - nuevas.sum() - cambiadas.sum()),
+        "eliminados": eliminadas,
+        "omitidos": omitidas,
+    }
@@ -0,0 +1,130 @@
+"""Lote de altas, cambios y bajas sobre varios recursos en una sola transacción.
+
+Las operaciones se agrupan por tabla y cada grupo es un puñado de statements:
+un INSERT multi-fila con RETURNING, un SELECT de las filas a editar más un
+UPDATE executemany por clave primaria, y un DELETE ... WHERE id IN ... con
+RETURNING. Orden: altas (dimensiones antes que hechos), cambios y bajas
+(hechos antes que dimensiones). Si algún id no existe no se aplica nada.
+"""
+from collections import defaultdict
+
+from fastapi import HTTPException
+from pydantic import ValidationError
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from . import agregados, crud, models, schemas, versiones
+
+# recurso: (modelo, schema de alta, schema de edición)
+RECURSOS = {
+    "proyectos": (models.Proyecto, schemas.ProyectoCreate, schemas.ProyectoCreate),
+    "rrhh": (models.Rrhh, schemas.RrhhCreate, schemas.RrhhCreate),
+    "sueldos": (models.Sueldo, schemas.SueldoCreate, schemas.SueldoCreate),
+    "movimientos": (models.Movimiento, schemas.MovimientoCreate, schemas.MovimientoCreate),
+    "caja_menor": (models.CajaMenor, schemas.CajaMenorCreate, schemas.CajaMenorCreate),
+    "compras": (models.Compra, schemas.CompraCreate, schemas.CompraCreate),
+    "administracion": (models.Administracion, schemas.AdministracionCreate, schemas.AdministracionUpdate),
+}
+ORDEN = list(RECURSOS)
+
+CAMPOS_AGREGADO = ("proyecto_id", "periodo_id", "valor")
+
+
+def validar(operaciones: list[schemas.Operacion]) -> list:
+    """Valida `datos` con el schema del recurso; devuelve el schema ya validado por operación."""
+    validadas, errores = [], []
+    for indice, op in enumerate(operaciones):
+        _, alta, edicion = RECURSOS[op.recurso]
+        if op.accion != "crear" and op.id is None:
+            errores.append({"indice": indice, "errores": [{"msg": f"'{op.accion}' requiere id"}]})
+            validadas.append(None)
+            continue
+        if op.accion == "eliminar":
+            validadas.append(None)
+            continue
+        try:
+            validadas.append((alta if op.accion == "crear" else edicion).model_validate(op.datos or {}))
+        except ValidationError as e:
+            errores.append({"indice": indice, "errores": e.errors(include_url=False, include_context=False)})
+            validadas.append(None)
+    if errores:
+        raise HTTPException(status_code=422, detail=errores)
+    return validadas
+
+
+async def _crear(db: AsyncSession, model, pendientes: list) -> list[int]:
+    return await crud._insertar_en_bloque(db, model, [datos for _, datos in pendientes], commit=False)
+
+
+async def _actualizar(db: AsyncSession, model, pendientes: list) -> set:
+    """Aplica los cambios del grupo y devuelve los ids que no existen."""
+    ids = {op.id for op, _ in pendientes}
+    es_hecho = model in agregados.CATEGORIAS
+    campos = [c for c in CAMPOS_AGREGADO if es_hecho and hasattr(model, c)]
+    consulta = select(model.id, *(getattr(model, c) for c in campos)).where(model.id.in_(ids))
+    actuales = {fila.id: fila._asdict() for fila in await db.execute(consulta.with_for_update())}
+    faltantes = ids - actuales.keys()
+    if faltantes:
+        return faltantes
+
+    filas, pares = [], []
+    for op, datos in pendientes:
+        valores = datos.dict()
+        # `cambio` en NULL para que el commit selle la fila (feed de cambios)
+        filas.append({"id": op.id, **valores, "cambio": None})
+        if es_hecho:
+            # Un mismo id puede editarse dos veces en el lote: se encadena el estado
+            despues = {**actuales[op.id], **{c: valores[c] for c in campos if c in valores}}
+            pares.append((actuales[op.id], despues))
+            actuales[op.id] = despues
+    await db.execute(update(model), filas)
+    if es_hecho:
+        await db.run_sync(agregados.registrar_cambios, model, pares)
+    return set()
+
+
+async def _eliminar(db: AsyncSession, model, pendientes: list) -> set:
+    ids = {op.id for op, _ in pendientes}
+    campos = [c for c in CAMPOS_AGREGADO if hasattr(model, c)]
+    borradas = (await db.execute(
+        delete(model).where(model.id.in_(ids)).returning(model.id, *(getattr(model, c) for c in campos))
+    )).all()
+    if model in agregados.CATEGORIAS:
+        await db.run_sync(agregados.registrar_eliminadas, model, [fila._asdict() for fila in borradas])
+    await db.run_sync(versiones.registrar_bajas, model.__tablename__, [fila.id for fila in borradas])
+    return ids - {fila.id for fila in borradas}
+
+
+async def aplicar(db: AsyncSession, operaciones: list[schemas.Operacion]) -> list[dict]:
+    validadas = validar(operaciones)
+    grupos = defaultdict(list)  # (acción, recurso) -> [(índice, operación, datos)]
+    for indice, (op, datos) in enumerate(zip(operaciones, validadas)):
+        grupos[(op.accion, op.recurso)].append((indice, op, datos))
+
+    resultados = [
+        {"indice": i, "recurso": op.recurso, "accion": op.accion, "id": op.id, "estado": "ok"}
+        for i, op in enumerate(operaciones)
+    ]
+    faltantes = []
+    pasos = [("crear", r) for r in ORDEN] + [("actualizar", r) for r in ORDEN] + [("eliminar", r) for r in reversed(ORDEN)]
+    for accion, recurso in pasos:
+        grupo = grupos.get((accion, recurso))
+        if not grupo:
+            continue
+        model = RECURSOS[recurso][0]
+        pendientes = [(op, datos) for _, op, datos in grupo]
+        if accion == "crear":
+            for (indice, _, _), nuevo_id in zip(grupo, await _crear(db, model, pendientes)):
+                resultados[indice]["id"] = nuevo_id
+            continue
+        no_existen = await (_actualizar if accion == "actualizar" else _eliminar)(db, model, pendientes)
+        for indice, op, _ in grupo:
+            if op.id in no_existen:
+                resultados[indice]["estado"] = "no_encontrado"
+                faltantes.append(indice)
+
+    if faltantes:
+        await db.rollback()
+        raise HTTPException(status_code=404, detail={"mensaje": "Lote no aplicado: hay ids inexistentes", "resultados": resultados})
+    await db.commit()
+    return resultados
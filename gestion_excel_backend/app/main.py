@@ -1,11 +1,19 @@
-from fastapi import FastAPI
+from time import perf_counter
+
+from fastapi import Depends, FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware  # <-- NUEVO
+from fastapi.responses import JSONResponse
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from .database import engine
-from . import models
+from .conexiones import metricas
+from .database import SessionLocal, async_engine, engine, get_db
+from .paginacion import CABECERA_SIGUIENTE
+from . import agregados, models, versiones
 from .endpoints import proyectos
 from .endpoints import rrhh
-from .endpoints import sueldos, movimientos, caja_menor, compras, administracion
+from .endpoints import sueldos, movimientos, caja_menor, compras, administracion, reportes, lotes, exportar, periodos
 
 # Swagger con tema obsidian
 app = FastAPI(swagger_ui_parameters={"syntaxHighlight": {"theme": "obsidian"}})
@@ -19,9 +27,15 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[CABECERA_SIGUIENTE, "ETag"],
 )
 
-models.Base.metadata.create_all(bind=engine)
+# El esquema lo administran las migraciones: `alembic upgrade head`
+# (una BD creada antes de migrations/ se marca primero con `alembic stamp 0001`)
+
+# Un renglón por tabla en versiones_tabla (cachés y ETags)
+with SessionLocal() as db:
+    versiones.inicializar(db)
 
 # Rutas incluidas
 app.include_router(proyectos.router, prefix="/api/proyectos")
@@ -31,7 +45,42 @@ app.include_router(movimientos.router, prefix="/api/movimientos")
 app.include_router(caja_menor.router, prefix="/api/caja_menor") 
 app.include_router(compras.router, prefix="/api/compras")
 app.include_router(administracion.router, prefix="/api/administracion")
+app.include_router(reportes.router, prefix="/api/reportes")
+app.include_router(lotes.router, prefix="/api/batch")
+app.include_router(exportar.router, prefix="/api")
+app.include_router(periodos.router, prefix="/api/periodos")
+
+
+# Nombre de proyecto repetido, clave de importación duplicada, FK inexistente...
+@app.exception_handler(IntegrityError)
+def conflicto_integridad(request: Request, exc: IntegrityError):
+    return JSONResponse(status_code=409, content={"detail": str(exc.orig)})
+
+
+# Alta, cambio o baja sobre hechos de un periodo cerrado: hay que reabrirlo antes
+@app.exception_handler(agregados.PeriodoConsolidado)
+def periodo_consolidado(request: Request, exc: agregados.PeriodoConsolidado):
+    return JSONResponse(status_code=409, content={"detail": str(exc), "periodo_ids": exc.periodo_ids})
+
 
 @app.get("/")
 def root():
     return {"message": "Backend corriendo local 🚀"}
+
+
+# Ping a la BD y estado de los pools: en_uso cerca de tamano + max_overflow,
+# esperas altas o agotamientos > 0 indican que el pool se queda corto
+@app.get("/health/db")
+async def salud_db(db: AsyncSession = Depends(get_db)):
+    inicio = perf_counter()
+    try:
+        await db.execute(text("SELECT 1"))
+        estado, codigo = "ok", 200
+    except SQLAlchemyError as e:
+        estado, codigo = f"error: {e.__class__.__name__}", 503
+    return JSONResponse(status_code=codigo, content={
+        "estado": estado,
+        "latencia_ms": round((perf_counter() - inicio) * 1000, 3),
+        "pool_api": metricas(async_engine),
+        "pool_sync": metricas(engine),
+    })
@@ -1,30 +1,63 @@
 from sqlalchemy import Column, Integer, Text, Numeric
 from .database import Base
-from sqlalchemy import Column, Integer, String, Numeric, ForeignKey, Text, Date, Boolean
+from sqlalchemy import Column, Integer, String, Numeric, ForeignKey, Text, Date, Boolean, BigInteger, Index, func, literal_column, null
 from sqlalchemy.orm import relationship
 
 class Proyecto(Base):
     __tablename__ = "proyectos"
+    # Los importadores resuelven proyectos por nombre
+    __table_args__ = (Index("ux_proyectos_nombre", "nombre", unique=True),)
 
     id = Column(Integer, primary_key=True, index=True)
     nombre = Column(Text, nullable=False)
+    # Sin acentos, mayúsculas ni espacios repetidos (app/nombres.py); se calcula al hacer commit
+    nombre_normalizado = Column(Text, index=True)
     centro_costo = Column(Text)
     subproyecto = Column(Text)
     estado = Column(Text)
     presupuesto = Column(Numeric)
+    clave_importacion = Column(BigInteger, unique=True)  # hash de la clave natural de la fila del Excel
+    huella = Column(BigInteger)                          # hash de clave + valores importados
+    # Versión de la tabla en el commit que tocó la fila por última vez (feed de cambios)
+    cambio = Column(BigInteger, index=True, onupdate=null())
 
 class Rrhh(Base):
     __tablename__ = "rrhh"
 
     id = Column(Integer, primary_key=True, index=True)
     nombre = Column(String, nullable=False)
+    nombre_normalizado = Column(Text, index=True)
     equipo = Column(String)
     proyecto = Column(String, nullable=False)
     dedicacion_total = Column(Numeric)
+    clave_importacion = Column(BigInteger, unique=True)
+    huella = Column(BigInteger)
+    cambio = Column(BigInteger, index=True, onupdate=null())
+
+
+# Una fila por persona (rrhh tiene una por persona y proyecto); se derivan de rrhh, ver app/dedicacion.py
+class Persona(Base):
+    __tablename__ = "personas"
+
+    id = Column(Integer, primary_key=True, index=True)
+    nombre = Column(String, nullable=False)
+    nombre_normalizado = Column(Text, nullable=False, unique=True)
+    equipo = Column(String)
+
+
+class Dedicacion(Base):
+    __tablename__ = "dedicaciones"
+    __table_args__ = (Index("ux_dedicaciones_persona_proyecto", "persona_id", "proyecto_id", unique=True),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    persona_id = Column(Integer, ForeignKey("personas.id"), nullable=False)
+    proyecto_id = Column(Integer, ForeignKey("proyectos.id"), nullable=False, index=True)
+    dedicacion = Column(Numeric, nullable=False)  # fracción: 1 = 100 %
 
 
 class Sueldo(Base):
     __tablename__ = "sueldos"
+    __table_args__ = (Index("ix_sueldos_proyecto_periodo_fecha", "proyecto_id", "periodo_id", "fecha"),)
 
     id = Column(Integer, primary_key=True, index=True)
     periodo_id = Column(Integer, ForeignKey("periodos.id"))
@@ -33,6 +66,9 @@ class Sueldo(Base):
     horas = Column(Integer)
     valor = Column(Numeric)
     fecha = Column(Date)
+    clave_importacion = Column(BigInteger, unique=True)
+    huella = Column(BigInteger)
+    cambio = Column(BigInteger, index=True, onupdate=null())
 
 class Periodo(Base):
     __tablename__ = "periodos"
@@ -45,6 +81,7 @@ class Periodo(Base):
 
 class Movimiento(Base):
     __tablename__ = "movimientos"
+    __table_args__ = (Index("ix_movimientos_proyecto_periodo_fecha", "proyecto_id", "periodo_id", "fecha"),)
 
     id = Column(Integer, primary_key=True, index=True)
     periodo_id = Column(Integer, ForeignKey("periodos.id"))
@@ -53,9 +90,13 @@ class Movimiento(Base):
     tipo = Column(String, nullable=False)
     fecha = Column(Date)
     observaciones = Column(Text)
+    clave_importacion = Column(BigInteger, unique=True)
+    huella = Column(BigInteger)
+    cambio = Column(BigInteger, index=True, onupdate=null())
 
 class CajaMenor(Base):
     __tablename__ = "caja_menor"
+    __table_args__ = (Index("ix_caja_menor_proyecto_periodo_fecha", "proyecto_id", "periodo_id", "fecha"),)
 
     id = Column(Integer, primary_key=True, index=True)
     proyecto_id = Column(Integer, ForeignKey("proyectos.id"))
@@ -65,9 +106,13 @@ class CajaMenor(Base):
     responsable = Column(String, nullable=True)
     concepto = Column(String, nullable=True)
     observaciones = Column(Text, nullable=True)
+    clave_importacion = Column(BigInteger, unique=True)
+    huella = Column(BigInteger)
+    cambio = Column(BigInteger, index=True, onupdate=null())
 
 class Compra(Base):
     __tablename__ = "compras"
+    __table_args__ = (Index("ix_compras_proyecto_periodo_fecha", "proyecto_id", "periodo_id", "fecha"),)
 
     id = Column(Integer, primary_key=True, index=True)
     periodo_id = Column(Integer, ForeignKey("periodos.id"))
@@ -78,6 +123,9 @@ class Compra(Base):
     forma_pago = Column(String)         # <--- agrega este
     estado = Column(String)             # <--- y este si falta
     fecha = Column(Date)
+    clave_importacion = Column(BigInteger, unique=True)
+    huella = Column(BigInteger)
+    cambio = Column(BigInteger, index=True, onupdate=null())
 
     proyecto = relationship("Proyecto")
     periodo = relationship("Periodo")
@@ -91,4 +139,105 @@ class Administracion(Base):
     periodicidad = Column(String)
     valor = Column(Numeric)
     fecha = Column(Date)
+    clave_importacion = Column(BigInteger, unique=True)
+    huella = Column(BigInteger)
+    cambio = Column(BigInteger, index=True, onupdate=null())
+
+
+class GastoProyecto(Base):
+    __tablename__ = "gasto_x_proyecto"
+    __table_args__ = (Index("ix_gasto_x_proyecto_proyecto_periodo_categoria", "proyecto_id", "periodo_id", "categoria"),)
+
+    # Agregado materializado: un renglón por proyecto, periodo y categoría (tabla de hechos)
+    id = Column(Integer, primary_key=True, index=True)
+    proyecto_id = Column(Integer, ForeignKey("proyectos.id"))
+    periodo_id = Column(Integer, ForeignKey("periodos.id"))
+    categoria = Column(Text, nullable=False)
+    total_gastos = Column(Numeric, nullable=False, default=0)
+    cantidad = Column(Integer, nullable=False, default=0)
+    fecha = Column(Date)  # última actualización
+
+# Un renglón por clave: proyecto y periodo pueden ser NULL (administración), por eso
+# se indexan con COALESCE (es el destino del ON CONFLICT de agregados.aplicar)
+CLAVE_GASTO = (
+    func.coalesce(GastoProyecto.proyecto_id, literal_column("0")),
+    func.coalesce(GastoProyecto.periodo_id, literal_column("0")),
+    GastoProyecto.categoria,
+)
+Index("ux_gasto_x_proyecto_clave", *CLAVE_GASTO, unique=True)
+
+# Foto de gasto_x_proyecto de los periodos consolidados (app/cierres.py); reabrir la borra
+class GastoConsolidado(Base):
+    __tablename__ = "gasto_consolidado"
+    __table_args__ = (Index("ix_gasto_consolidado_periodo_proyecto_categoria", "periodo_id", "proyecto_id", "categoria"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    periodo_id = Column(Integer, ForeignKey("periodos.id"), nullable=False)
+    proyecto_id = Column(Integer, ForeignKey("proyectos.id"))
+    categoria = Column(Text, nullable=False)
+    total_gastos = Column(Numeric, nullable=False)
+    cantidad = Column(Integer, nullable=False)
+    fecha = Column(Date)  # fecha del cierre
+
+# Costo de sueldos repartido por dedicación (app/asignacion.py); se reemplaza en cada corrida
+class CostoSueldo(Base):
+    __tablename__ = "costo_sueldos"
+    __table_args__ = (Index("ux_costo_sueldos_proyecto_periodo", "proyecto_id", "periodo_id", unique=True),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    proyecto_id = Column(Integer, ForeignKey("proyectos.id"), nullable=False)
+    periodo_id = Column(Integer, ForeignKey("periodos.id"), nullable=False)
+    valor = Column(Numeric, nullable=False)
+    personas = Column(Integer, nullable=False)
+
+# Costos de administración prorrateados (app/prorrateo.py); se reemplaza en cada corrida
+class CostoAdministracion(Base):
+    __tablename__ = "costo_administracion"
+    __table_args__ = (Index("ux_costo_administracion_proyecto_periodo", "proyecto_id", "periodo_id", unique=True),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    proyecto_id = Column(Integer, ForeignKey("proyectos.id"), nullable=False)
+    periodo_id = Column(Integer, ForeignKey("periodos.id"), nullable=False)
+    valor = Column(Numeric, nullable=False)
+    criterio = Column(String, nullable=False)  # presupuesto | sueldos | personas
+
+class Presupuesto(Base):
+    __tablename__ = "presupuesto"
+
+    id = Column(Integer, primary_key=True, index=True)
+    proyecto_id = Column(Integer, ForeignKey("proyectos.id"))
+    anio = Column("año", Integer)
+    total_aprobado = Column(Numeric)
+    total_ejecutado = Column(Numeric)
+    ejecucion_porcentaje = Column(Numeric)
+
+class PresupuestoVsGasto(Base):
+    __tablename__ = "presupuesto_vs_gasto"
+
+    id = Column(Integer, primary_key=True, index=True)
+    proyecto_id = Column(Integer, ForeignKey("proyectos.id"))
+    concepto = Column(Text)
+    presupuesto = Column(Numeric)
+    ejecutado = Column(Numeric)
+    diferencia = Column(Numeric)
+
+class VersionTabla(Base):
+    __tablename__ = "versiones_tabla"
+
+    # Se incrementa en la misma transacción que modifica la tabla (ver app/versiones.py)
+    tabla = Column(String, primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
+
+class Baja(Base):
+    __tablename__ = "bajas"
+    __table_args__ = (Index("ix_bajas_tabla_cambio", "tabla", "cambio"),)
+
+    # Marca de cada fila borrada, para que el feed de cambios informe la eliminación
+    id = Column(Integer, primary_key=True)
+    tabla = Column(String, nullable=False)
+    registro_id = Column(Integer, nullable=False)
+    cambio = Column(BigInteger, nullable=False)
+
 
+# Registra los listeners de sesión que mantienen versiones_tabla y nombre_normalizado
+from . import versiones, nombres  # noqa: E402
@@ -0,0 +1,204 @@
+"""Normalización y búsqueda aproximada de nombres de proyectos y personas.
+
+`normalizar` pliega acentos, mayúsculas y espacios: es la clave que se guarda
+en `nombre_normalizado` y con la que los importadores cruzan nombres, solo por
+igualdad (`resolver_exactos`). La similitud es la de pg_trgm (trigramas por
+palabra, índice de Jaccard), pero calculada sobre un índice invertido en
+memoria, así funciona igual en SQLite y en PostgreSQL sin instalar la
+extensión. Se usa en la búsqueda de la API y para sugerir, en el reporte de
+una importación, el nombre más parecido a cada uno que no se encontró.
+"""
+import math
+import re
+import unicodedata
+from collections import Counter, defaultdict
+from typing import Optional
+
+from sqlalchemy import bindparam, select, update
+from sqlalchemy.orm import Session
+
+from . import models, versiones
+
+# pg_trgm usa 0.3 por defecto para el operador %
+UMBRAL_BUSQUEDA = 0.3
+# Sugerencias para los nombres que una importación no encontró: nunca se aplican solas
+UMBRAL_SUGERENCIA = 0.75
+MARGEN_SUGERENCIA = 0.1
+LIMITE_BUSQUEDA = 10
+
+# Los encabezados del Excel llegan con "_" en lugar de espacios (normalizar_columnas)
+_ESPACIOS = re.compile(r"[\s_]+")
+_PALABRA = re.compile(r"\w+")
+
+
+def normalizar(texto) -> Optional[str]:
+    """'  Proyecto  ÁLAMO ' o 'proyecto_álamo' -> 'proyecto alamo'; None si no queda texto."""
+    if texto is None:
+        return None
+    descompuesto = unicodedata.normalize("NFKD", str(texto))
+    sin_acentos = "".join(c for c in descompuesto if not unicodedata.combining(c))
+    clave = _ESPACIOS.sub(" ", sin_acentos.casefold()).strip()
+    return clave or None
+
+
+def trigramas(clave: str) -> frozenset:
+    # Igual que pg_trgm: cada palabra con dos espacios delante y uno detrás
+    grupos = set()
+    for palabra in _PALABRA.findall(clave):
+        relleno = f"  {palabra} "
+        grupos.update(relleno[i:i + 3] for i in range(len(relleno) - 2))
+    return frozenset(grupos)
+
+
+class IndiceNombres:
+    """Nombres de una dimensión indexados por clave normalizada y por trigrama.
+
+    `filas` son pares (id, nombre) ordenados por id: ante claves repetidas
+    gana el id más bajo, como en el cruce exacto de siempre.
+    """
+
+    def __init__(self, filas):
+        self.ids = {}                      # clave -> id
+        self.nombres = {}                  # clave -> nombre original
+        self._trigramas = {}               # clave -> trigramas
+        self._invertido = defaultdict(set)  # trigrama -> claves
+        for id_, nombre in filas:
+            self.agregar(id_, nombre)
+
+    def agregar(self, id_, nombre):
+        clave = normalizar(nombre)
+        if clave is None or clave in self.ids:
+            return
+        self.ids[clave] = id_
+        self.nombres[clave] = nombre
+        self._trigramas[clave] = grupos = trigramas(clave)
+        for trigrama in grupos:
+            self._invertido[trigrama].add(clave)
+
+    def _puntajes(self, clave: str):
+        """(clave candidata, similitud, cobertura) de cada nombre que comparte algún trigrama."""
+        consulta = trigramas(clave)
+        comunes = Counter()
+        for trigrama in consulta:
+            comunes.update(self._invertido.get(trigrama, ()))
+        for candidata, n in comunes.items():
+            union = len(consulta) + len(self._trigramas[candidata]) - n
+            yield candidata, n / union, n / len(consulta)
+
+    def buscar(self, texto, limite: int = LIMITE_BUSQUEDA, umbral: float = UMBRAL_BUSQUEDA) -> list[dict]:
+        """Ranking para búsqueda: primero lo que contiene más de la consulta, luego lo más parecido."""
+        clave = normalizar(texto)
+        if clave is None:
+            return []
+        puntajes = [
+            (cobertura, similitud, candidata)
+            for candidata, similitud, cobertura in self._puntajes(clave)
+            if max(similitud, cobertura) >= umbral
+        ]
+        puntajes.sort(key=lambda p: (-p[0], -p[1], self.ids[p[2]]))
+        return [
+            {"id": self.ids[candidata], "nombre": self.nombres[candidata], "similitud": round(similitud, 4)}
+            for _, similitud, candidata in puntajes[:limite]
+        ]
+
+    def _candidatas(self, consulta: frozenset, umbral: float) -> set:
+        # Filtro de prefijo: con Jaccard >= umbral, una candidata comparte al menos uno de
+        # los |Q| - ceil(umbral·|Q|) + 1 trigramas más raros de la consulta
+        raros = sorted(consulta, key=lambda trigrama: len(self._invertido.get(trigrama, ())))
+        prefijo = raros[:len(raros) - math.ceil(umbral * len(raros)) + 1]
+        return set().union(*(self._invertido.get(trigrama, ()) for trigrama in prefijo))
+
+    def _mejor(self, clave: str, umbral: float, margen: float):
+        """(clave, similitud) de la coincidencia exacta o de una aproximada sin ambigüedad."""
+        if clave in self.ids:
+            return clave, 1.0
+        consulta = trigramas(clave)
+        if not consulta:
+            return None
+        # Solo importan las que llegan a umbral - margen: por debajo no cambian la decisión
+        puntajes = []
+        for candidata in self._candidatas(consulta, umbral - margen):
+            grupos = self._trigramas[candidata]
+            comunes = len(consulta & grupos)
+            puntajes.append((comunes / (len(consulta) + len(grupos) - comunes), candidata))
+        puntajes.sort(reverse=True)
+        if not puntajes or puntajes[0][0] < umbral:
+            return None
+        if len(puntajes) > 1 and puntajes[0][0] - puntajes[1][0] < margen:
+            return None
+        similitud, candidata = puntajes[0]
+        return candidata, similitud
+
+    def sugerir(self, textos, umbral: float = UMBRAL_SUGERENCIA,
+                margen: float = MARGEN_SUGERENCIA) -> dict:
+        """{texto: (nombre, similitud)} del candidato más parecido y sin ambigüedad.
+
+        Solo informa: "Proyecto Salud 2024" se parece a "Proyecto Salud 2023"
+        y aun así es otro proyecto, así que quien importa decide.
+        """
+        sugerencias = {}
+        for texto in textos:
+            clave = normalizar(texto)
+            encontrado = None if clave is None else self._mejor(clave, umbral, margen)
+            if encontrado is not None:
+                candidata, similitud = encontrado
+                sugerencias[texto] = (self.nombres[candidata], round(similitud, 4))
+        return sugerencias
+
+
+def cargar(db: Session, columna) -> IndiceNombres:
+    """Índice de la columna de nombres de una dimensión, leído en una consulta."""
+    model = columna.class_
+    return IndiceNombres(db.execute(select(model.id, columna).order_by(model.id)))
+
+
+def resolver_exactos(db: Session, columna, textos) -> dict:
+    """{texto: id} de los textos cuya clave normalizada coincide con la de un nombre.
+
+    En las dimensiones con `nombre_normalizado` (proyectos, rrhh) es un
+    IN sobre esa columna indexada; las demás (periodos) son tablas chicas y
+    se normalizan en memoria. Ante claves repetidas gana el id más bajo.
+    """
+    model = columna.class_
+    claves = {texto: clave for texto in textos if (clave := normalizar(texto)) is not None}
+    if columna.key == "nombre" and hasattr(model, "nombre_normalizado"):
+        ids = {}
+        distintas = sorted(set(claves.values()))
+        for i in range(0, len(distintas), 1000):
+            consulta = (
+                select(model.id, model.nombre_normalizado)
+                .where(model.nombre_normalizado.in_(distintas[i:i + 1000]))
+                .order_by(model.id)
+            )
+            for id_, clave in db.execute(consulta):
+                ids.setdefault(clave, id_)
+    else:
+        ids = cargar(db, columna).ids
+    return {texto: ids[clave] for texto, clave in claves.items() if clave in ids}
+
+
+# Índices de la API por tabla, válidos mientras no cambie su versión en versiones_tabla
+_INDICES = {}
+
+
+def indice(db: Session, model) -> IndiceNombres:
+    tabla = model.__tablename__
+    (version,) = versiones.leer(db, [tabla])
+    guardado = _INDICES.get(tabla)
+    if guardado is None or guardado[0] != version:
+        guardado = _INDICES[tabla] = (version, cargar(db, model.nombre))
+    return guardado[1]
+
+
+def _normalizar_escritas(session: Session, tabla):
+    # Corre antes de sellar: las filas escritas en la transacción tienen cambio NULL
+    filas = session.execute(select(tabla.c.id, tabla.c.nombre).where(tabla.c.cambio.is_(None))).all()
+    if filas:
+        session.execute(
+            update(tabla).where(tabla.c.id == bindparam("_id")).values(nombre_normalizado=bindparam("_clave")),
+            [{"_id": id_, "_clave": normalizar(nombre)} for id_, nombre in filas],
+        )
+
+
+for _model in (models.Proyecto, models.Rrhh):
+    versiones.antes_de_sellar(_model.__tablename__, _normalizar_escritas)
@@ -0,0 +1,68 @@
+from dataclasses import dataclass
+from datetime import date
+from typing import Optional
+
+from fastapi import Query, Response
+
+LIMITE_POR_DEFECTO = 500
+LIMITE_MAXIMO = 5000
+
+# Cabecera con el cursor de la siguiente página (vacía si no hay más filas)
+CABECERA_SIGUIENTE = "X-Next-After-Id"
+
+
+@dataclass
+class Filtros:
+    after_id: Optional[int] = None
+    limit: Optional[int] = LIMITE_POR_DEFECTO
+    proyecto_id: Optional[int] = None
+    periodo_id: Optional[int] = None
+    fecha_desde: Optional[date] = None
+    fecha_hasta: Optional[date] = None
+
+
+# Dependencia compartida por todos los GET de listado. Sin `limit` se devuelve
+# una página de LIMITE_POR_DEFECTO filas; el cliente sigue X-Next-After-Id.
+def get_filtros(
+    after_id: Optional[int] = Query(None, description="Devuelve filas con id mayor a este cursor"),
+    limit: int = Query(LIMITE_POR_DEFECTO, ge=1, le=LIMITE_MAXIMO),
+    proyecto_id: Optional[int] = None,
+    periodo_id: Optional[int] = None,
+    fecha_desde: Optional[date] = None,
+    fecha_hasta: Optional[date] = None,
+) -> Filtros:
+    return Filtros(after_id, limit, proyecto_id, periodo_id, fecha_desde, fecha_hasta)
+
+
+def aplicar_filtros(query, model, filtros: Optional[Filtros]):
+    """Aplica filtros y paginación por cursor (keyset sobre id) a una query.
+
+    Los filtros que no existen como columna en el modelo se ignoran, así la
+    misma dependencia sirve para los siete recursos.
+    """
+    if filtros is None:
+        return query.order_by(model.id)
+
+    if filtros.after_id is not None:
+        query = query.filter(model.id > filtros.after_id)
+    if filtros.proyecto_id is not None and hasattr(model, "proyecto_id"):
+        query = query.filter(model.proyecto_id == filtros.proyecto_id)
+    if filtros.periodo_id is not None and hasattr(model, "periodo_id"):
+        query = query.filter(model.periodo_id == filtros.periodo_id)
+    if hasattr(model, "fecha"):
+        if filtros.fecha_desde is not None:
+            query = query.filter(model.fecha >= filtros.fecha_desde)
+        if filtros.fecha_hasta is not None:
+            query = query.filter(model.fecha <= filtros.fecha_hasta)
+
+    query = query.order_by(model.id)
+    if filtros.limit is not None:
+        query = query.limit(filtros.limit)
+    return query
+
+
+def marcar_siguiente(response: Response, filas, filtros: Filtros):
+    # Solo hay página siguiente si la actual vino llena
+    if filtros.limit is not None and len(filas) == filtros.limit:
+        response.headers[CABECERA_SIGUIENTE] = str(filas[-1].id)
+    return filas
@@ -0,0 +1,44 @@
+"""Consultas calientes y el índice compuesto que cada una debe usar.
+
+Lo usan `scripts/verificar_planes.py` (contra la BD configurada) y
+tests/test_planes.py (SQLite), para que un cambio de esquema o de consulta
+que deje un índice sin uso falle antes de llegar a producción.
+"""
+from datetime import date
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from . import models
+from .paginacion import Filtros, aplicar_filtros
+
+
+def consultas(db: Session):
+    """(índice esperado, query) por cada consulta caliente."""
+    filtros = Filtros(proyecto_id=1, periodo_id=1, fecha_desde=date(2024, 1, 1), fecha_hasta=date(2024, 12, 31))
+    for model in (models.Sueldo, models.Movimiento, models.CajaMenor, models.Compra):
+        yield f"ix_{model.__tablename__}_proyecto_periodo_fecha", aplicar_filtros(db.query(model), model, filtros)
+    yield "ux_proyectos_nombre", db.query(models.Proyecto).filter(models.Proyecto.nombre == "x")
+    G = models.GastoProyecto
+    yield "ix_gasto_x_proyecto_proyecto_periodo_categoria", db.query(G).filter(
+        G.proyecto_id == 1, G.periodo_id == 1, G.categoria == "sueldos"
+    )
+    GC = models.GastoConsolidado
+    yield "ix_gasto_consolidado_periodo_proyecto_categoria", db.query(GC).filter(GC.periodo_id == 1)
+    # Feed de cambios (app/cambios.py): bajas de una tabla desde un token
+    B = models.Baja
+    yield "ix_bajas_tabla_cambio", db.query(B.registro_id).filter(
+        B.tabla == "compras", B.cambio > 1, B.cambio <= 10
+    )
+
+
+def plan(db: Session, query) -> str:
+    """Texto del plan (EXPLAIN) de la query en el dialecto de la sesión."""
+    dialecto = db.get_bind().dialect.name
+    sql = str(query.statement.compile(dialect=db.get_bind().dialect, compile_kwargs={"literal_binds": True}))
+    if dialecto == "sqlite":
+        filas = db.execute(text(f"EXPLAIN QUERY PLAN {sql}")).all()
+        return "\n".join(fila[-1] for fila in filas)
+    # Con tablas chicas Postgres prefiere el seq scan; se desactiva para ver si el índice sirve
+    db.execute(text("SET LOCAL enable_seqscan = off"))
+    return "\n".join(fila[0] for fila in db.execute(text(f"EXPLAIN {sql}")).all())
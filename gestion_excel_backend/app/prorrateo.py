@@ -0,0 +1,133 @@
+"""Prorrateo de los costos de administración entre proyectos y periodos.
+
+Cada costo se expande a un monto mensual según su periodicidad (un costo
+anual aporta 1/12 de su valor a cada periodo) en los periodos desde su
+fecha, o en todos si no tiene. El total de cada periodo se reparte entre
+los proyectos activos según un criterio:
+
+- presupuesto: participación en el presupuesto de los proyectos activos.
+- sueldos: participación en `costo_sueldos` de ese periodo (app/asignacion.py).
+- personas: cantidad de personas con dedicación al proyecto.
+
+Todo son operaciones de matrices (costos x periodos y proyectos x
+periodos); el resultado reemplaza por completo `costo_administracion`.
+"""
+from time import perf_counter
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import Float, cast, delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from . import dedicacion, models, nombres
+
+A = models.Administracion
+P = models.Proyecto
+Pe = models.Periodo
+D = models.Dedicacion
+CS = models.CostoSueldo
+CA = models.CostoAdministracion
+
+# Fracción del valor que corresponde a cada periodo mensual
+FACTORES = {"mensual": 1.0, "bimestral": 1 / 2, "trimestral": 1 / 3, "semestral": 1 / 6, "anual": 1 / 12}
+CRITERIOS = ("presupuesto", "sueldos", "personas")
+ESTADOS_INACTIVOS = {"cerrado", "finalizado", "terminado", "inactivo", "cancelado"}
+
+
+def _periodos(db: Session) -> pd.DataFrame:
+    consulta = select(Pe.id, Pe.fecha_fin).order_by(Pe.fecha_inicio, Pe.id)
+    return pd.DataFrame(db.execute(consulta).all(), columns=["periodo_id", "fecha_fin"])
+
+
+def _proyectos_activos(db: Session) -> pd.DataFrame:
+    df = pd.DataFrame(db.execute(select(P.id, P.estado, cast(P.presupuesto, Float))).all(),
+                      columns=["proyecto_id", "estado", "presupuesto"])
+    activos = ~df["estado"].map(nombres.normalizar).isin(ESTADOS_INACTIVOS)
+    return df[activos].set_index("proyecto_id")
+
+
+def _pesos(db: Session, criterio: str, proyectos: pd.DataFrame, periodos: pd.Index) -> np.ndarray:
+    """Matriz proyectos x periodos con el peso de cada proyecto en cada periodo."""
+    if criterio == "presupuesto":
+        por_proyecto = proyectos["presupuesto"].fillna(0.0).clip(lower=0.0)
+    elif criterio == "personas":
+        consulta = select(D.proyecto_id, func.count(func.distinct(D.persona_id))).group_by(D.proyecto_id)
+        por_proyecto = pd.Series(dict(db.execute(consulta).all()), dtype=float)
+    else:
+        consulta = select(CS.proyecto_id, CS.periodo_id, cast(CS.valor, Float))
+        sueldos = pd.DataFrame(db.execute(consulta).all(), columns=["proyecto_id", "periodo_id", "valor"])
+        matriz = sueldos.pivot(index="proyecto_id", columns="periodo_id", values="valor")
+        return matriz.reindex(index=proyectos.index, columns=periodos).fillna(0.0).to_numpy()
+    # Criterios fijos en el tiempo: el mismo peso en todos los periodos
+    pesos = por_proyecto.reindex(proyectos.index).fillna(0.0).to_numpy()
+    return np.repeat(pesos[:, None], len(periodos), axis=1)
+
+
+def calcular(db: Session, criterio: str) -> tuple[pd.DataFrame, dict]:
+    """(costo por proyecto y periodo, resumen) sin escribir nada."""
+    costos = pd.DataFrame(db.execute(select(A.periodicidad, A.fecha, cast(A.valor, Float))).all(),
+                          columns=["periodicidad", "fecha", "valor"])
+    periodos = _periodos(db)
+    proyectos = _proyectos_activos(db)
+
+    factores = costos["periodicidad"].map(nombres.normalizar).map(FACTORES)
+    sin_periodicidad = factores.isna()
+    # dtype float explícito: sin filas en administracion las columnas quedan en object
+    mensual = (costos["valor"].fillna(0.0) * factores.fillna(0.0)).to_numpy(dtype=float)
+
+    # costos x periodos: el costo corre en los periodos que terminan desde su fecha
+    desde = pd.to_datetime(costos["fecha"]).to_numpy()
+    hasta = pd.to_datetime(periodos["fecha_fin"]).to_numpy()
+    vigente = np.isnat(desde)[:, None] | np.isnat(hasta)[None, :] | (hasta[None, :] >= desde[:, None])
+    por_periodo = mensual @ vigente                  # total a repartir en cada periodo
+
+    pesos = _pesos(db, criterio, proyectos, pd.Index(periodos["periodo_id"]))
+    totales = pesos.sum(axis=0)
+    con_peso = totales > 0
+    participacion = np.divide(pesos, totales, out=np.zeros_like(pesos), where=con_peso)
+    costo = participacion * por_periodo               # proyectos x periodos
+
+    filas, columnas = np.nonzero(costo)
+    resultado = pd.DataFrame({
+        "proyecto_id": proyectos.index.to_numpy()[filas],
+        "periodo_id": periodos["periodo_id"].to_numpy()[columnas],
+        "valor": costo[filas, columnas].round(2),
+        "criterio": criterio,
+    })
+    resumen = {
+        "criterio": criterio,
+        "filas": len(resultado),
+        "proyectos": int(np.count_nonzero(costo.any(axis=1))),
+        "periodos": len(periodos),
+        "total_prorrateado": round(float(costo.sum()), 2),
+        # periodos sin ningún proyecto con peso: su costo no se reparte
+        "valor_sin_asignar": round(float(por_periodo[~con_peso].sum()), 2),
+        "costos_sin_periodicidad": int(sin_periodicidad.sum()),
+    }
+    return resultado, resumen
+
+
+def ejecutar(db: Session, criterio: str = "presupuesto", commit: bool = True) -> dict:
+    """Calcula el prorrateo y reemplaza `costo_administracion` con un INSERT en bloque."""
+    if criterio not in CRITERIOS:
+        raise ValueError(f"Criterio desconocido: {criterio}")
+    inicio = perf_counter()
+    if criterio == "personas":
+        dedicacion.reconstruir(db)
+    resultado, resumen = calcular(db, criterio)
+    db.execute(delete(CA))
+    if not resultado.empty:
+        db.execute(insert(CA), resultado.astype(object).to_dict("records"))
+    if commit:
+        db.commit()
+    resumen["segundos"] = round(perf_counter() - inicio, 3)
+    return resumen
+
+
+def listar(db: Session, proyecto_id=None, periodo_id=None):
+    query = db.query(CA)
+    if proyecto_id is not None:
+        query = query.filter(CA.proyecto_id == proyecto_id)
+    if periodo_id is not None:
+        query = query.filter(CA.periodo_id == periodo_id)
+    return query.order_by(CA.proyecto_id, CA.periodo_id).all()
@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, ConfigDict
+from typing import Generic, Literal, Optional, TypeVar
 from datetime import date
 
 class ProyectoBase(BaseModel):
@@ -14,8 +14,7 @@ class ProyectoCreate(ProyectoBase):
 
 class Proyecto(ProyectoBase):
     id: int
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 class RrhhBase(BaseModel):
     nombre: str
@@ -29,8 +28,7 @@ class RrhhCreate(RrhhBase):
 class Rrhh(RrhhBase):
     id: int
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class SueldoBase(BaseModel):
@@ -47,8 +45,7 @@ class SueldoCreate(SueldoBase):
 class Sueldo(SueldoBase):
     id: int
 
-    class Config:
-        from_attributes = True  # Para Pydantic v2+
+    model_config = ConfigDict(from_attributes=True)
 
 
 class MovimientoBase(BaseModel):
@@ -65,8 +62,7 @@ class MovimientoCreate(MovimientoBase):
 class Movimiento(MovimientoBase):
     id: int
 
-    class Config:
-        from_attributes = True  # Usar esto en Pydantic v2
+    model_config = ConfigDict(from_attributes=True)
 
 
 class CajaMenorBase(BaseModel):
@@ -84,8 +80,7 @@ class CajaMenorCreate(CajaMenorBase):
 class CajaMenor(CajaMenorBase):
     id: int
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class CompraBase(BaseModel):
@@ -102,8 +97,7 @@ class CompraCreate(CompraBase):
 class Compra(CompraBase):
     id: int
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class AdministracionBase(BaseModel):
     tipo_costo: Optional[str]
@@ -112,8 +106,7 @@ class AdministracionBase(BaseModel):
     valor: float
     fecha: Optional[date]
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class AdministracionCreate(AdministracionBase):
     pass
@@ -124,3 +117,133 @@ class AdministracionUpdate(AdministracionBase):
 class AdministracionOut(AdministracionBase):
     id: int
 
+
+
+class ResultadoBloque(BaseModel):
+    insertados: int
+    ids: list[int]
+
+
+class Coincidencia(BaseModel):
+    id: int
+    nombre: str
+    similitud: float
+
+
+class GastoProyecto(BaseModel):
+    proyecto_id: Optional[int]
+    periodo_id: Optional[int]
+    categoria: str
+    total_gastos: float
+    cantidad: int
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ProyectoDedicacion(BaseModel):
+    id: int
+    nombre: str
+
+
+class FilaDedicacion(BaseModel):
+    persona_id: int
+    nombre: str
+    equipo: Optional[str]
+    dedicaciones: list[float]  # alineadas con MatrizDedicacion.proyectos
+    total: float
+    valida: bool               # total = 1 (100 %)
+
+
+class MatrizDedicacion(BaseModel):
+    proyectos: list[ProyectoDedicacion]
+    personas: list[FilaDedicacion]
+
+
+class ResultadoDedicacion(BaseModel):
+    personas: int
+    dedicaciones: int
+    segundos: float
+
+
+class CostoSueldo(BaseModel):
+    proyecto_id: int
+    periodo_id: int
+    valor: float
+    personas: int
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ResultadoAsignacion(BaseModel):
+    filas: int
+    personas: int
+    periodos: int
+    total_asignado: float
+    personas_sin_dedicacion: int  # tienen sueldos pero ningún proyecto resuelto
+    valor_sin_asignar: float
+    segundos: float
+
+
+class CostoAdministracion(BaseModel):
+    proyecto_id: int
+    periodo_id: int
+    valor: float
+    criterio: str
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ResultadoProrrateo(BaseModel):
+    criterio: str
+    filas: int
+    proyectos: int
+    periodos: int
+    total_prorrateado: float
+    valor_sin_asignar: float       # periodos sin proyectos con peso para el criterio
+    costos_sin_periodicidad: int   # periodicidad no reconocida: no se prorratean
+    segundos: float
+
+
+class ResultadoCierre(BaseModel):
+    periodo_id: int
+    nombre: Optional[str]
+    es_consolidado: bool
+    filas: int          # renglones de la foto en gasto_consolidado
+    total_gastos: float
+
+
+class Ejecucion(BaseModel):
+    proyecto_id: int
+    proyecto: str
+    concepto: str
+    presupuesto: Optional[float]
+    ejecutado: float
+    diferencia: Optional[float]
+    ejecucion_porcentaje: Optional[float]
+
+
+T = TypeVar("T")
+
+# GET /api/<recurso>/changes: `token` es el since de la próxima llamada
+class Cambios(BaseModel, Generic[T]):
+    token: int
+    cambios: list[T]
+    eliminados: list[int]
+
+
+# POST /api/batch: `datos` se valida con el schema de alta/edición del recurso
+class Operacion(BaseModel):
+    recurso: Literal["proyectos", "rrhh", "sueldos", "movimientos", "caja_menor", "compras", "administracion"]
+    accion: Literal["crear", "actualizar", "eliminar"]
+    id: Optional[int] = None
+    datos: Optional[dict] = None
+
+class ResultadoOperacion(BaseModel):
+    indice: int
+    recurso: str
+    accion: str
+    id: Optional[int]
+    estado: Literal["ok", "no_encontrado"]
+
+class ResultadoLote(BaseModel):
+    resultados: list[ResultadoOperacion]
@@ -0,0 +1,40 @@
+"""Respuesta rápida para los GET de listado.
+
+FastAPI valida y copia cada objeto ORM con el `response_model` antes de
+codificar el JSON. Aquí se seleccionan solo las columnas del schema como
+tuplas y se codifican con orjson; el `response_model` de la ruta sigue
+documentando la respuesta en OpenAPI.
+"""
+from functools import lru_cache
+
+import orjson
+from fastapi import Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .paginacion import Filtros, aplicar_filtros, marcar_siguiente
+
+# Cabeceras que la dependencia de ETag y la paginación dejan en `response`
+CABECERAS_COPIADAS = ("etag", "cache-control", "x-next-after-id")
+
+
+@lru_cache(maxsize=None)
+def _columnas(model, schema) -> tuple:
+    """Columnas del modelo en el orden de los campos del schema (se arma una vez)."""
+    return tuple(getattr(model, campo) for campo in schema.model_fields)
+
+
+def codificar(campos, filas) -> bytes:
+    # Numeric llega como Decimal: orjson lo convierte con float, igual que el schema
+    return orjson.dumps([dict(zip(campos, fila)) for fila in filas], default=float)
+
+
+async def respuesta_lista(db: AsyncSession, response: Response, model, schema, filtros: Filtros) -> Response:
+    columnas = _columnas(model, schema)
+    filas = (await db.execute(aplicar_filtros(select(*columnas), model, filtros))).all()
+    marcar_siguiente(response, filas, filtros)
+    rapida = Response(codificar(schema.model_fields, filas), media_type="application/json")
+    for cabecera in CABECERAS_COPIADAS:
+        if cabecera in response.headers:
+            rapida.headers[cabecera] = response.headers[cabecera]
+    return rapida
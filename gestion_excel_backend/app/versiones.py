@@ -0,0 +1,114 @@
+"""Versión por tabla, para invalidar cachés sin consultar las filas.
+
+Cualquier sesión que escriba una tabla (ORM o statements insert/update/delete)
+incrementa su contador en `versiones_tabla` justo antes del commit, dentro de
+la misma transacción. Leer las versiones es una consulta sobre una tabla de
+pocas filas.
+
+En las tablas con columna `cambio`, ese mismo commit sella con la nueva
+versión las filas que escribió (toda escritura deja `cambio` en NULL) y
+registra en `bajas` los ids borrados. Como el UPDATE de versiones_tabla
+bloquea el renglón hasta el commit, las versiones se hacen visibles en orden
+y sirven de token para el feed de cambios (ver app/cambios.py).
+"""
+from sqlalchemy import event, insert, select, update
+from sqlalchemy.orm import Session
+
+from . import models
+
+_PENDIENTES = "tablas_modificadas"
+_BAJAS = "bajas_pendientes"
+
+# {tabla: [funcion(session, tabla)]} que corren justo antes de sellar: ven con
+# `cambio IS NULL` exactamente las filas que escribió la transacción
+_ANTES_DE_SELLAR = {}
+
+
+def _marcar(session: Session, tablas):
+    propia = models.VersionTabla.__tablename__
+    session.info.setdefault(_PENDIENTES, set()).update(t for t in tablas if t != propia)
+
+
+def registrar_bajas(session: Session, tabla: str, ids):
+    """Ids borrados con un DELETE masivo (los borrados del ORM se detectan solos)."""
+    session.info.setdefault(_BAJAS, {}).setdefault(tabla, []).extend(ids)
+
+
+def antes_de_sellar(tabla: str, funcion):
+    """Registra un ajuste sobre las filas escritas de `tabla` (p. ej. columnas derivadas)."""
+    _ANTES_DE_SELLAR.setdefault(tabla, []).append(funcion)
+
+
+def _con_cambio(tabla: str) -> bool:
+    t = models.Base.metadata.tables.get(tabla)
+    return t is not None and "cambio" in t.c
+
+
+@event.listens_for(Session, "after_flush")
+def _tras_flush(session, contexto):
+    # En after_flush las colecciones todavía muestran el estado previo al flush
+    objetos = (*session.new, *session.dirty, *session.deleted)
+    _marcar(session, {obj.__table__.name for obj in objetos if hasattr(obj, "__table__")})
+    for obj in session.deleted:
+        if hasattr(obj, "__table__") and _con_cambio(obj.__table__.name):
+            registrar_bajas(session, obj.__table__.name, [obj.id])
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _tras_execute(estado):
+    if estado.is_insert or estado.is_update or estado.is_delete:
+        _marcar(estado.session, {estado.statement.table.name})
+
+
+@event.listens_for(Session, "before_commit")
+def _antes_commit(session):
+    # before_commit corre antes del flush final: se fuerza para ver todo lo pendiente
+    session.flush()
+    tablas = session.info.pop(_PENDIENTES, set())
+    bajas = session.info.pop(_BAJAS, {})
+    VT = models.VersionTabla
+    for tabla in sorted(tablas):  # orden fijo entre transacciones concurrentes
+        version = session.execute(
+            update(VT).where(VT.tabla == tabla).values(version=VT.version + 1).returning(VT.version)
+        ).scalar_one_or_none()
+        if version is None:
+            version = 1
+            session.execute(insert(VT).values(tabla=tabla, version=version))
+        if _con_cambio(tabla):
+            _sellar(session, tabla, version, bajas.get(tabla, []))
+    session.info.pop(_PENDIENTES, None)
+
+
+def _sellar(session: Session, tabla: str, version: int, bajas: list):
+    t = models.Base.metadata.tables[tabla]
+    for funcion in _ANTES_DE_SELLAR.get(tabla, ()):
+        funcion(session, t)
+    session.execute(update(t).where(t.c.cambio.is_(None)).values(cambio=version))
+    if bajas:
+        session.execute(
+            insert(models.Baja),
+            [{"tabla": tabla, "registro_id": registro_id, "cambio": version} for registro_id in bajas],
+        )
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _tras_rollback(session, transaccion_previa):
+    session.info.pop(_PENDIENTES, None)
+    session.info.pop(_BAJAS, None)
+
+
+def inicializar(db: Session):
+    """Crea el renglón de cada tabla conocida (evita INSERTs concurrentes después)."""
+    VT = models.VersionTabla
+    existentes = set(db.scalars(select(VT.tabla)))
+    faltantes = [t for t in models.Base.metadata.tables if t not in existentes and t != VT.__tablename__]
+    if faltantes:
+        db.execute(insert(VT), [{"tabla": t, "version": 0} for t in faltantes])
+    db.commit()
+
+
+def leer(db: Session, tablas) -> tuple:
+    """Versiones actuales de `tablas`, en el mismo orden (0 si nunca se escribió)."""
+    VT = models.VersionTabla
+    versiones = dict(db.execute(select(VT.tabla, VT.version).where(VT.tabla.in_(tablas))).all())
+    return tuple(versiones.get(t, 0) for t in tablas)
@@ -0,0 +1,109 @@
+"""esquema base (el que creaba Base.metadata.create_all)
+
+Las BDs creadas antes de las migraciones ya tienen estas tablas: marcarlas
+con `alembic stamp 0001` y luego `alembic upgrade head`.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def _id():
+    return sa.Column("id", sa.Integer, primary_key=True)
+
+
+def upgrade():
+    op.create_table(
+        "proyectos",
+        _id(),
+        sa.Column("nombre", sa.Text, nullable=False),
+        sa.Column("centro_costo", sa.Text),
+        sa.Column("subproyecto", sa.Text),
+        sa.Column("estado", sa.Text),
+        sa.Column("presupuesto", sa.Numeric),
+    )
+    op.create_table(
+        "rrhh",
+        _id(),
+        sa.Column("nombre", sa.String, nullable=False),
+        sa.Column("equipo", sa.String),
+        sa.Column("proyecto", sa.String, nullable=False),
+        sa.Column("dedicacion_total", sa.Numeric),
+    )
+    op.create_table(
+        "periodos",
+        _id(),
+        sa.Column("nombre", sa.String),
+        sa.Column("fecha_inicio", sa.Date),
+        sa.Column("fecha_fin", sa.Date),
+        sa.Column("es_consolidado", sa.Boolean),
+    )
+    op.create_table(
+        "sueldos",
+        _id(),
+        sa.Column("periodo_id", sa.Integer, sa.ForeignKey("periodos.id")),
+        sa.Column("rrhh_id", sa.Integer, sa.ForeignKey("rrhh.id")),
+        sa.Column("proyecto_id", sa.Integer, sa.ForeignKey("proyectos.id")),
+        sa.Column("horas", sa.Integer),
+        sa.Column("valor", sa.Numeric),
+        sa.Column("fecha", sa.Date),
+    )
+    op.create_table(
+        "movimientos",
+        _id(),
+        sa.Column("periodo_id", sa.Integer, sa.ForeignKey("periodos.id")),
+        sa.Column("proyecto_id", sa.Integer, sa.ForeignKey("proyectos.id")),
+        sa.Column("valor", sa.Numeric, nullable=False),
+        sa.Column("tipo", sa.String, nullable=False),
+        sa.Column("fecha", sa.Date),
+        sa.Column("observaciones", sa.Text),
+    )
+    op.create_table(
+        "caja_menor",
+        _id(),
+        sa.Column("proyecto_id", sa.Integer, sa.ForeignKey("proyectos.id")),
+        sa.Column("periodo_id", sa.Integer, sa.ForeignKey("periodos.id")),
+        sa.Column("valor", sa.Numeric),
+        sa.Column("fecha", sa.Date),
+        sa.Column("responsable", sa.String),
+        sa.Column("concepto", sa.String),
+        sa.Column("observaciones", sa.Text),
+    )
+    op.create_table(
+        "compras",
+        _id(),
+        sa.Column("periodo_id", sa.Integer, sa.ForeignKey("periodos.id")),
+        sa.Column("proyecto_id", sa.Integer, sa.ForeignKey("proyectos.id")),
+        sa.Column("proveedor", sa.String),
+        sa.Column("descripcion", sa.String),
+        sa.Column("valor", sa.Numeric),
+        sa.Column("forma_pago", sa.String),
+        sa.Column("estado", sa.String),
+        sa.Column("fecha", sa.Date),
+    )
+    op.create_table(
+        "administracion",
+        _id(),
+        sa.Column("tipo_costo", sa.String),
+        sa.Column("descripcion", sa.String),
+        sa.Column("periodicidad", sa.String),
+        sa.Column("valor", sa.Numeric),
+        sa.Column("fecha", sa.Date),
+    )
+    for tabla in ("proyectos", "rrhh", "periodos", "sueldos", "movimientos",
+                  "caja_menor", "compras", "administracion"):
+        op.create_index(f"ix_{tabla}_id", tabla, ["id"])
+
+
+def downgrade():
+    for tabla in ("administracion", "compras", "caja_menor", "movimientos",
+                  "sueldos", "periodos", "rrhh", "proyectos"):
+        op.drop_table(tabla)
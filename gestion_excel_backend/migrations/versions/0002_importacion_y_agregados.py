@@ -0,0 +1,90 @@
+"""huellas de importación, agregados de gasto y versiones de tabla
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+TABLAS_IMPORTADAS = ("proyectos", "rrhh", "sueldos", "movimientos", "caja_menor", "compras", "administracion")
+
+
+def _columnas(tabla):
+    return {c["name"] for c in sa.inspect(op.get_bind()).get_columns(tabla)}
+
+
+def upgrade():
+    for tabla in TABLAS_IMPORTADAS:
+        with op.batch_alter_table(tabla) as batch:
+            batch.add_column(sa.Column("clave_importacion", sa.BigInteger))
+            batch.add_column(sa.Column("huella", sa.BigInteger))
+            batch.create_unique_constraint(f"uq_{tabla}_clave_importacion", ["clave_importacion"])
+
+    # schema.sql ya creaba gasto_x_proyecto, presupuesto y presupuesto_vs_gasto
+    existentes = set(sa.inspect(op.get_bind()).get_table_names())
+    if "gasto_x_proyecto" not in existentes:
+        op.create_table(
+            "gasto_x_proyecto",
+            sa.Column("id", sa.Integer, primary_key=True),
+            sa.Column("proyecto_id", sa.Integer, sa.ForeignKey("proyectos.id")),
+            sa.Column("periodo_id", sa.Integer, sa.ForeignKey("periodos.id")),
+            sa.Column("categoria", sa.Text, nullable=False),
+            sa.Column("total_gastos", sa.Numeric, nullable=False),
+            sa.Column("cantidad", sa.Integer, nullable=False),
+            sa.Column("fecha", sa.Date),
+        )
+        op.create_index("ix_gasto_x_proyecto_id", "gasto_x_proyecto", ["id"])
+    else:
+        faltantes = _columnas("gasto_x_proyecto")
+        with op.batch_alter_table("gasto_x_proyecto") as batch:
+            if "periodo_id" not in faltantes:
+                batch.add_column(sa.Column("periodo_id", sa.Integer, sa.ForeignKey("periodos.id")))
+            if "cantidad" not in faltantes:
+                batch.add_column(sa.Column("cantidad", sa.Integer, nullable=False, server_default="0"))
+
+    if "presupuesto" not in existentes:
+        op.create_table(
+            "presupuesto",
+            sa.Column("id", sa.Integer, primary_key=True),
+            sa.Column("proyecto_id", sa.Integer, sa.ForeignKey("proyectos.id")),
+            sa.Column("año", sa.Integer),
+            sa.Column("total_aprobado", sa.Numeric),
+            sa.Column("total_ejecutado", sa.Numeric),
+            sa.Column("ejecucion_porcentaje", sa.Numeric),
+        )
+        op.create_index("ix_presupuesto_id", "presupuesto", ["id"])
+    if "presupuesto_vs_gasto" not in existentes:
+        op.create_table(
+            "presupuesto_vs_gasto",
+            sa.Column("id", sa.Integer, primary_key=True),
+            sa.Column("proyecto_id", sa.Integer, sa.ForeignKey("proyectos.id")),
+            sa.Column("concepto", sa.Text),
+            sa.Column("presupuesto", sa.Numeric),
+            sa.Column("ejecutado", sa.Numeric),
+            sa.Column("diferencia", sa.Numeric),
+        )
+        op.create_index("ix_presupuesto_vs_gasto_id", "presupuesto_vs_gasto", ["id"])
+
+    op.create_table(
+        "versiones_tabla",
+        sa.Column("tabla", sa.String, primary_key=True),
+        sa.Column("version", sa.BigInteger, nullable=False),
+    )
+
+
+def downgrade():
+    op.drop_table("versiones_tabla")
+    with op.batch_alter_table("gasto_x_proyecto") as batch:
+        batch.drop_column("cantidad")
+        batch.drop_column("periodo_id")
+    for tabla in TABLAS_IMPORTADAS:
+        with op.batch_alter_table(tabla) as batch:
+            batch.drop_constraint(f"uq_{tabla}_clave_importacion", type_="unique")
+            batch.drop_column("huella")
+            batch.drop_column("clave_importacion")
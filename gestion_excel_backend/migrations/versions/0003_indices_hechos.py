@@ -0,0 +1,41 @@
+"""índices compuestos de las tablas de hechos y nombre de proyecto único
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+TABLAS_HECHOS = ("sueldos", "compras", "caja_menor", "movimientos")
+
+
+def upgrade():
+    for tabla in TABLAS_HECHOS:
+        op.create_index(f"ix_{tabla}_proyecto_periodo_fecha", tabla, ["proyecto_id", "periodo_id", "fecha"])
+    op.create_index(
+        "ix_gasto_x_proyecto_proyecto_periodo_categoria",
+        "gasto_x_proyecto",
+        ["proyecto_id", "periodo_id", "categoria"],
+    )
+
+    # Las importaciones anteriores a las huellas podían duplicar proyectos
+    duplicados = op.get_bind().execute(sa.text(
+        "SELECT nombre, COUNT(*) FROM proyectos GROUP BY nombre HAVING COUNT(*) > 1"
+    )).all()
+    if duplicados:
+        detalle = ", ".join(f"{nombre} ({n})" for nombre, n in duplicados)
+        raise RuntimeError(f"Hay proyectos con nombre repetido, unificarlos antes de migrar: {detalle}")
+    op.create_index("ux_proyectos_nombre", "proyectos", ["nombre"], unique=True)
+
+
+def downgrade():
+    op.drop_index("ux_proyectos_nombre", table_name="proyectos")
+    op.drop_index("ix_gasto_x_proyecto_proyecto_periodo_categoria", table_name="gasto_x_proyecto")
+    for tabla in TABLAS_HECHOS:
+        op.drop_index(f"ix_{tabla}_proyecto_periodo_fecha", table_name=tabla)
@@ -0,0 +1,41 @@
+"""columna cambio y tabla de bajas para el feed de cambios
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+TABLAS = ("proyectos", "rrhh", "sueldos", "movimientos", "caja_menor", "compras", "administracion")
+
+
+def upgrade():
+    for tabla in TABLAS:
+        with op.batch_alter_table(tabla) as batch:
+            batch.add_column(sa.Column("cambio", sa.BigInteger))
+        # Las filas existentes quedan en la versión 0: entran en la primera sincronización
+        op.execute(f"UPDATE {tabla} SET cambio = 0")
+        op.create_index(f"ix_{tabla}_cambio", tabla, ["cambio"])
+
+    op.create_table(
+        "bajas",
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("tabla", sa.String, nullable=False),
+        sa.Column("registro_id", sa.Integer, nullable=False),
+        sa.Column("cambio", sa.BigInteger, nullable=False),
+    )
+    op.create_index("ix_bajas_tabla_cambio", "bajas", ["tabla", "cambio"])
+
+
+def downgrade():
+    op.drop_table("bajas")
+    for tabla in TABLAS:
+        op.drop_index(f"ix_{tabla}_cambio", table_name=tabla)
+        with op.batch_alter_table(tabla) as batch:
+            batch.drop_column("cambio")
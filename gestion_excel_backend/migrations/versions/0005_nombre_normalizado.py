@@ -0,0 +1,53 @@
+"""nombre_normalizado en proyectos y rrhh para el cruce y la búsqueda de nombres
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+"""
+import re
+import unicodedata
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+TABLAS = ("proyectos", "rrhh")
+
+_ESPACIOS = re.compile(r"[\s_]+")
+
+
+def _normalizar(texto):
+    # Copia de app.nombres.normalizar en esta revisión: la migración no depende del código vivo
+    if texto is None:
+        return None
+    descompuesto = unicodedata.normalize("NFKD", str(texto))
+    sin_acentos = "".join(c for c in descompuesto if not unicodedata.combining(c))
+    return _ESPACIOS.sub(" ", sin_acentos.casefold()).strip() or None
+
+
+def upgrade():
+    conexion = op.get_bind()
+    for tabla in TABLAS:
+        with op.batch_alter_table(tabla) as batch:
+            batch.add_column(sa.Column("nombre_normalizado", sa.Text))
+        # La normalización (acentos Unicode) se hace en Python, igual que en la app
+        t = sa.table(tabla, sa.column("id", sa.Integer), sa.column("nombre", sa.Text),
+                     sa.column("nombre_normalizado", sa.Text))
+        filas = conexion.execute(sa.select(t.c.id, t.c.nombre)).all()
+        if filas:
+            conexion.execute(
+                t.update().where(t.c.id == sa.bindparam("_id")).values(nombre_normalizado=sa.bindparam("_clave")),
+                [{"_id": id_, "_clave": _normalizar(nombre)} for id_, nombre in filas],
+            )
+        op.create_index(f"ix_{tabla}_nombre_normalizado", tabla, ["nombre_normalizado"])
+
+
+def downgrade():
+    for tabla in TABLAS:
+        op.drop_index(f"ix_{tabla}_nombre_normalizado", table_name=tabla)
+        with op.batch_alter_table(tabla) as batch:
+            batch.drop_column("nombre_normalizado")
@@ -0,0 +1,103 @@
+"""personas y dedicaciones: rrhh normalizado con proyecto_id real
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18
+"""
+import re
+import unicodedata
+from collections import defaultdict
+from decimal import Decimal
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+_ESPACIOS = re.compile(r"[\s_]+")
+
+
+def _normalizar(texto):
+    # Copia de app.nombres.normalizar en esta revisión: la migración no depende del código vivo
+    if texto is None:
+        return None
+    descompuesto = unicodedata.normalize("NFKD", str(texto))
+    sin_acentos = "".join(c for c in descompuesto if not unicodedata.combining(c))
+    return _ESPACIOS.sub(" ", sin_acentos.casefold()).strip() or None
+
+
+def _carga_inicial(conexion):
+    """personas y dedicaciones desde rrhh; los proyectos se cruzan por nombre normalizado."""
+    rrhh = sa.table("rrhh", sa.column("id", sa.Integer), sa.column("nombre", sa.String),
+                    sa.column("equipo", sa.String), sa.column("proyecto", sa.String),
+                    sa.column("dedicacion_total", sa.Numeric))
+    proyectos = sa.table("proyectos", sa.column("id", sa.Integer), sa.column("nombre_normalizado", sa.Text))
+    personas = sa.table("personas", sa.column("id", sa.Integer), sa.column("nombre", sa.String),
+                        sa.column("nombre_normalizado", sa.Text), sa.column("equipo", sa.String))
+    dedicaciones = sa.table("dedicaciones", sa.column("persona_id", sa.Integer),
+                            sa.column("proyecto_id", sa.Integer), sa.column("dedicacion", sa.Numeric))
+
+    filas = conexion.execute(
+        sa.select(rrhh.c.nombre, rrhh.c.equipo, rrhh.c.proyecto, rrhh.c.dedicacion_total).order_by(rrhh.c.id)
+    ).all()
+    nuevas = {}
+    for nombre, equipo, _, _ in filas:
+        clave = _normalizar(nombre)
+        if clave is not None and clave not in nuevas:
+            nuevas[clave] = {"nombre": nombre, "nombre_normalizado": clave, "equipo": equipo}
+    if not nuevas:
+        return
+    conexion.execute(personas.insert(), list(nuevas.values()))
+    ids = dict(conexion.execute(sa.select(personas.c.nombre_normalizado, personas.c.id)).all())
+
+    # Ante nombres repetidos gana el proyecto de id más bajo
+    por_clave = {}
+    for id_, clave in conexion.execute(
+        sa.select(proyectos.c.id, proyectos.c.nombre_normalizado).order_by(proyectos.c.id)
+    ):
+        por_clave.setdefault(clave, id_)
+    suma = defaultdict(Decimal)
+    for nombre, _, proyecto, valor in filas:
+        clave, proyecto_id = _normalizar(nombre), por_clave.get(_normalizar(proyecto))
+        if clave is None or valor is None or proyecto_id is None:
+            continue
+        suma[(ids[clave], proyecto_id)] += Decimal(str(valor))
+    if suma:
+        conexion.execute(dedicaciones.insert(), [
+            {"persona_id": persona_id, "proyecto_id": proyecto_id, "dedicacion": valor}
+            for (persona_id, proyecto_id), valor in suma.items()
+        ])
+
+
+def upgrade():
+    op.create_table(
+        "personas",
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("nombre", sa.String, nullable=False),
+        sa.Column("nombre_normalizado", sa.Text, nullable=False),
+        sa.Column("equipo", sa.String),
+        sa.UniqueConstraint("nombre_normalizado", name="uq_personas_nombre_normalizado"),
+    )
+    op.create_index("ix_personas_id", "personas", ["id"])
+    op.create_table(
+        "dedicaciones",
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("persona_id", sa.Integer, sa.ForeignKey("personas.id"), nullable=False),
+        sa.Column("proyecto_id", sa.Integer, sa.ForeignKey("proyectos.id"), nullable=False),
+        sa.Column("dedicacion", sa.Numeric, nullable=False),
+    )
+    op.create_index("ix_dedicaciones_id", "dedicaciones", ["id"])
+    op.create_index("ix_dedicaciones_proyecto_id", "dedicaciones", ["proyecto_id"])
+    op.create_index("ux_dedicaciones_persona_proyecto", "dedicaciones", ["persona_id", "proyecto_id"], unique=True)
+
+    # Carga inicial desde rrhh; después se reconstruyen de forma explícita (ver app/dedicacion.py)
+    _carga_inicial(op.get_bind())
+
+
+def downgrade():
+    op.drop_table("dedicaciones")
+    op.drop_table("personas")
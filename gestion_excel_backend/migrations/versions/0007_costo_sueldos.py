@@ -0,0 +1,30 @@
+"""costo_sueldos: reparto de sueldos por proyecto y periodo según dedicación
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "costo_sueldos",
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("proyecto_id", sa.Integer, sa.ForeignKey("proyectos.id"), nullable=False),
+        sa.Column("periodo_id", sa.Integer, sa.ForeignKey("periodos.id"), nullable=False),
+        sa.Column("valor", sa.Numeric, nullable=False),
+        sa.Column("personas", sa.Integer, nullable=False),
+    )
+    op.create_index("ix_costo_sueldos_id", "costo_sueldos", ["id"])
+    op.create_index("ux_costo_sueldos_proyecto_periodo", "costo_sueldos", ["proyecto_id", "periodo_id"], unique=True)
+
+
+def downgrade():
+    op.drop_table("costo_sueldos")
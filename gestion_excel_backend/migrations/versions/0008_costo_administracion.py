@@ -0,0 +1,31 @@
+"""costo_administracion: costos de administración prorrateados por proyecto y periodo
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "costo_administracion",
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("proyecto_id", sa.Integer, sa.ForeignKey("proyectos.id"), nullable=False),
+        sa.Column("periodo_id", sa.Integer, sa.ForeignKey("periodos.id"), nullable=False),
+        sa.Column("valor", sa.Numeric, nullable=False),
+        sa.Column("criterio", sa.String, nullable=False),
+    )
+    op.create_index("ix_costo_administracion_id", "costo_administracion", ["id"])
+    op.create_index("ux_costo_administracion_proyecto_periodo", "costo_administracion",
+                    ["proyecto_id", "periodo_id"], unique=True)
+
+
+def downgrade():
+    op.drop_table("costo_administracion")
@@ -0,0 +1,40 @@
+"""gasto_consolidado: foto de los agregados de los periodos cerrados
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0009"
+down_revision = "0008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "gasto_consolidado",
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("periodo_id", sa.Integer, sa.ForeignKey("periodos.id"), nullable=False),
+        sa.Column("proyecto_id", sa.Integer, sa.ForeignKey("proyectos.id")),
+        sa.Column("categoria", sa.Text, nullable=False),
+        sa.Column("total_gastos", sa.Numeric, nullable=False),
+        sa.Column("cantidad", sa.Integer, nullable=False),
+        sa.Column("fecha", sa.Date),
+    )
+    op.create_index("ix_gasto_consolidado_id", "gasto_consolidado", ["id"])
+    op.create_index("ix_gasto_consolidado_periodo_proyecto_categoria", "gasto_consolidado",
+                    ["periodo_id", "proyecto_id", "categoria"])
+    # Periodos que ya venían marcados como consolidados: la foto sale del agregado vigente
+    op.execute(
+        "INSERT INTO gasto_consolidado (periodo_id, proyecto_id, categoria, total_gastos, cantidad, fecha) "
+        "SELECT g.periodo_id, g.proyecto_id, g.categoria, g.total_gastos, g.cantidad, CURRENT_DATE "
+        "FROM gasto_x_proyecto g JOIN periodos p ON p.id = g.periodo_id "
+        "WHERE p.es_consolidado AND g.cantidad > 0"
+    )
+
+
+def downgrade():
+    op.drop_table("gasto_consolidado")
@@ -0,0 +1,58 @@
+"""gasto_x_proyecto: índice único por (proyecto, periodo, categoría) para el upsert
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0010"
+down_revision = "0009"
+branch_labels = None
+depends_on = None
+
+
+# Categoría de gasto_x_proyecto de cada tabla de hechos, como en esta revisión
+HECHOS = {
+    "sueldos": "sueldos",
+    "compras": "compras",
+    "caja_menor": "caja_menor",
+    "movimientos": "movimientos",
+}
+
+
+def _agrupado(tabla: str, categoria: str) -> str:
+    # Los periodos consolidados no se recorren: salen de su foto en gasto_consolidado
+    return (
+        f"SELECT proyecto_id, periodo_id, '{categoria}', COALESCE(SUM(valor), 0), COUNT(*), CURRENT_DATE "
+        f"FROM {tabla} "
+        "WHERE periodo_id IS NULL OR periodo_id NOT IN (SELECT id FROM periodos WHERE es_consolidado) "
+        "GROUP BY proyecto_id, periodo_id"
+    )
+
+
+def upgrade():
+    # Escrituras concurrentes pudieron dejar claves repetidas y renglones en cero:
+    # se recalcula el agregado antes de crear el índice
+    op.execute("DELETE FROM gasto_x_proyecto")
+    ramas = [_agrupado(tabla, categoria) for tabla, categoria in HECHOS.items()]
+    ramas.append(
+        "SELECT NULL, NULL, 'administracion', COALESCE(SUM(valor), 0), COUNT(*), CURRENT_DATE "
+        "FROM administracion HAVING COUNT(*) > 0"
+    )
+    ramas.append("SELECT proyecto_id, periodo_id, categoria, total_gastos, cantidad, fecha FROM gasto_consolidado")
+    op.execute(
+        "INSERT INTO gasto_x_proyecto (proyecto_id, periodo_id, categoria, total_gastos, cantidad, fecha) "
+        + " UNION ALL ".join(ramas)
+    )
+    op.create_index(
+        "ux_gasto_x_proyecto_clave",
+        "gasto_x_proyecto",
+        [sa.text("coalesce(proyecto_id, 0)"), sa.text("coalesce(periodo_id, 0)"), "categoria"],
+        unique=True,
+    )
+
+
+def downgrade():
+    op.drop_index("ux_gasto_x_proyecto_clave", table_name="gasto_x_proyecto")
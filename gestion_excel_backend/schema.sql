@@ -1,21 +1,31 @@
+-- Referencia del esquema. La BD se crea y actualiza con las migraciones:
+--   alembic upgrade head
 
 -- Esquema de base de datos para proyecto de gestión de Excel
 
 CREATE TABLE rrhh (
     id SERIAL PRIMARY KEY,
     nombre TEXT NOT NULL,
+    nombre_normalizado TEXT,
     rol TEXT,
     equipo TEXT,
-    dedicacion_total NUMERIC
+    dedicacion_total NUMERIC,
+    clave_importacion BIGINT UNIQUE,
+    huella BIGINT,
+    cambio BIGINT
 );
 
 CREATE TABLE proyectos (
     id SERIAL PRIMARY KEY,
     nombre TEXT NOT NULL,
+    nombre_normalizado TEXT,
     centro_costo TEXT,
     subproyecto TEXT,
     estado TEXT,
-    presupuesto NUMERIC
+    presupuesto NUMERIC,
+    clave_importacion BIGINT UNIQUE,
+    huella BIGINT,
+    cambio BIGINT
 );
 
 CREATE TABLE periodos (
@@ -36,7 +46,10 @@ CREATE TABLE movimientos (
     fecha DATE,
     valor NUMERIC,
     descripcion TEXT,
-    observaciones TEXT
+    observaciones TEXT,
+    clave_importacion BIGINT UNIQUE,
+    huella BIGINT,
+    cambio BIGINT
 );
 
 CREATE TABLE sueldos (
@@ -46,7 +59,10 @@ CREATE TABLE sueldos (
     proyecto_id INTEGER REFERENCES proyectos(id),
     horas INT,
     valor NUMERIC,
-    fecha DATE
+    fecha DATE,
+    clave_importacion BIGINT UNIQUE,
+    huella BIGINT,
+    cambio BIGINT
 );
 
 CREATE TABLE compras (
@@ -58,7 +74,10 @@ CREATE TABLE compras (
     valor NUMERIC,
     forma_pago TEXT,
     estado TEXT,
-    fecha DATE
+    fecha DATE,
+    clave_importacion BIGINT UNIQUE,
+    huella BIGINT,
+    cambio BIGINT
 );
 
 CREATE TABLE caja_menor (
@@ -68,7 +87,10 @@ CREATE TABLE caja_menor (
     descripcion TEXT,
     valor NUMERIC,
     responsable TEXT,
-    fecha DATE
+    fecha DATE,
+    clave_importacion BIGINT UNIQUE,
+    huella BIGINT,
+    cambio BIGINT
 );
 
 CREATE TABLE administracion (
@@ -77,7 +99,10 @@ CREATE TABLE administracion (
     descripcion TEXT,
     periodicidad TEXT,
     valor NUMERIC,
-    fecha DATE
+    fecha DATE,
+    clave_importacion BIGINT UNIQUE,
+    huella BIGINT,
+    cambio BIGINT
 );
 
 CREATE TABLE presupuesto (
@@ -101,7 +126,93 @@ CREATE TABLE presupuesto_vs_gasto (
 CREATE TABLE gasto_x_proyecto (
     id SERIAL PRIMARY KEY,
     proyecto_id INTEGER REFERENCES proyectos(id),
-    total_gastos NUMERIC,
-    categoria TEXT,
+    periodo_id INTEGER REFERENCES periodos(id),
+    total_gastos NUMERIC NOT NULL DEFAULT 0,
+    cantidad INTEGER NOT NULL DEFAULT 0,
+    categoria TEXT NOT NULL,
     fecha DATE
 );
+
+CREATE TABLE versiones_tabla (
+    tabla VARCHAR PRIMARY KEY,
+    version BIGINT NOT NULL
+);
+
+-- Feed de cambios: versión del último commit que tocó cada fila y filas borradas
+-- rrhh normalizado: se reconstruye desde rrhh en cada commit que la toca (app/dedicacion.py)
+CREATE TABLE personas (
+    id SERIAL PRIMARY KEY,
+    nombre VARCHAR NOT NULL,
+    nombre_normalizado TEXT NOT NULL UNIQUE,
+    equipo VARCHAR
+);
+
+CREATE TABLE dedicaciones (
+    id SERIAL PRIMARY KEY,
+    persona_id INTEGER NOT NULL REFERENCES personas(id),
+    proyecto_id INTEGER NOT NULL REFERENCES proyectos(id),
+    dedicacion NUMERIC NOT NULL
+);
+CREATE INDEX ix_dedicaciones_proyecto_id ON dedicaciones (proyecto_id);
+CREATE UNIQUE INDEX ux_dedicaciones_persona_proyecto ON dedicaciones (persona_id, proyecto_id);
+
+-- Sueldos repartidos por dedicación; se reemplaza en cada corrida (app/asignacion.py)
+CREATE TABLE costo_sueldos (
+    id SERIAL PRIMARY KEY,
+    proyecto_id INTEGER NOT NULL REFERENCES proyectos(id),
+    periodo_id INTEGER NOT NULL REFERENCES periodos(id),
+    valor NUMERIC NOT NULL,
+    personas INTEGER NOT NULL
+);
+CREATE UNIQUE INDEX ux_costo_sueldos_proyecto_periodo ON costo_sueldos (proyecto_id, periodo_id);
+
+-- Administración prorrateada por proyecto y periodo; se reemplaza en cada corrida (app/prorrateo.py)
+CREATE TABLE costo_administracion (
+    id SERIAL PRIMARY KEY,
+    proyecto_id INTEGER NOT NULL REFERENCES proyectos(id),
+    periodo_id INTEGER NOT NULL REFERENCES periodos(id),
+    valor NUMERIC NOT NULL,
+    criterio VARCHAR NOT NULL
+);
+CREATE UNIQUE INDEX ux_costo_administracion_proyecto_periodo ON costo_administracion (proyecto_id, periodo_id);
+
+CREATE TABLE gasto_consolidado (
+    id SERIAL PRIMARY KEY,
+    periodo_id INTEGER NOT NULL REFERENCES periodos(id),
+    proyecto_id INTEGER REFERENCES proyectos(id),
+    categoria TEXT NOT NULL,
+    total_gastos NUMERIC NOT NULL,
+    cantidad INTEGER NOT NULL,
+    fecha DATE
+);
+
+CREATE INDEX ix_gasto_consolidado_periodo_proyecto_categoria ON gasto_consolidado (periodo_id, proyecto_id, categoria);
+
+CREATE TABLE bajas (
+    id SERIAL PRIMARY KEY,
+    tabla VARCHAR NOT NULL,
+    registro_id INTEGER NOT NULL,
+    cambio BIGINT NOT NULL
+);
+CREATE INDEX ix_bajas_tabla_cambio ON bajas (tabla, cambio);
+CREATE INDEX ix_proyectos_cambio ON proyectos (cambio);
+CREATE INDEX ix_rrhh_cambio ON rrhh (cambio);
+CREATE INDEX ix_sueldos_cambio ON sueldos (cambio);
+CREATE INDEX ix_movimientos_cambio ON movimientos (cambio);
+CREATE INDEX ix_caja_menor_cambio ON caja_menor (cambio);
+CREATE INDEX ix_compras_cambio ON compras (cambio);
+CREATE INDEX ix_administracion_cambio ON administracion (cambio);
+
+-- Los importadores resuelven proyectos por nombre
+CREATE UNIQUE INDEX ux_proyectos_nombre ON proyectos (nombre);
+-- Clave sin acentos, mayúsculas ni espacios repetidos (app/nombres.py)
+CREATE INDEX ix_proyectos_nombre_normalizado ON proyectos (nombre_normalizado);
+CREATE INDEX ix_rrhh_nombre_normalizado ON rrhh (nombre_normalizado);
+
+-- Filtros de listados y reportes: proyecto, periodo y rango de fechas
+CREATE INDEX ix_sueldos_proyecto_periodo_fecha ON sueldos (proyecto_id, periodo_id, fecha);
+CREATE INDEX ix_movimientos_proyecto_periodo_fecha ON movimientos (proyecto_id, periodo_id, fecha);
+CREATE INDEX ix_caja_menor_proyecto_periodo_fecha ON caja_menor (proyecto_id, periodo_id, fecha);
+CREATE INDEX ix_compras_proyecto_periodo_fecha ON compras (proyecto_id, periodo_id, fecha);
+CREATE INDEX ix_gasto_x_proyecto_proyecto_periodo_categoria ON gasto_x_proyecto (proyecto_id, periodo_id, categoria);
+CREATE UNIQUE INDEX ux_gasto_x_proyecto_clave ON gasto_x_proyecto (COALESCE(proyecto_id, 0), COALESCE(periodo_id, 0), categoria);
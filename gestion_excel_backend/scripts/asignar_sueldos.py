@@ -0,0 +1,17 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy.orm import Session
+from app.database import SessionLocal
+from app import asignacion
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Reparte el costo de sueldos por persona y periodo entre sus proyectos (tras importar sueldos o RRHH)
+db: Session = SessionLocal()
+resumen = asignacion.ejecutar(db)
+db.close()
+
+print(f"✅ costo_sueldos recalculado: {resumen}")
@@ -0,0 +1,101 @@
+"""Filas/segundo de los GET de listado: ruta Pydantic anterior vs. ruta orjson.
+
+Por defecto trabaja sobre una BD SQLite temporal que llena con --filas filas
+por tabla. Con --url puede apuntarse a una BD de pruebas (nunca a la real:
+agrega filas si hay menos de --filas).
+"""
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import asyncio
+import json
+import tempfile
+from datetime import date, timedelta
+from time import perf_counter
+
+parser = argparse.ArgumentParser(description=__doc__)
+parser.add_argument("--filas", type=int, default=100_000)
+parser.add_argument("--url", default=None)
+parser.add_argument("--repeticiones", type=int, default=3)
+args = parser.parse_args()
+
+temporal = args.url is None
+os.environ["DATABASE_URL"] = args.url or f"sqlite:///{os.path.join(tempfile.gettempdir(), 'benchmark_listados.db')}"
+os.environ.pop("ASYNC_DATABASE_URL", None)
+
+from pydantic import TypeAdapter
+from sqlalchemy import func, insert, select
+from app.database import AsyncSessionLocal, SessionLocal, async_engine, engine
+from app import crud, models, schemas
+from app.serializacion import codificar
+
+TABLAS = [
+    (models.Movimiento, schemas.Movimiento, crud.listar_movimientos,
+     lambda i, p, q: {"proyecto_id": p, "periodo_id": q, "valor": i * 1.5, "tipo": "egreso", "fecha": date(2024, 1, 1) + timedelta(i % 365),
+                   "observaciones": f"movimiento {i}"}),
+    (models.Compra, schemas.Compra, crud.listar_compras,
+     lambda i, p, q: {"proyecto_id": p, "periodo_id": q, "valor": i * 2.25, "fecha": date(2024, 1, 1) + timedelta(i % 365),
+                   "proveedor": f"proveedor {i % 50}", "descripcion": f"compra {i}"}),
+]
+
+
+def llenar():
+    if temporal:
+        models.Base.metadata.create_all(engine)
+    with SessionLocal() as db:
+        proyecto = db.scalar(select(models.Proyecto.id).where(models.Proyecto.nombre == "benchmark"))
+        if proyecto is None:
+            proyecto = db.scalar(insert(models.Proyecto).values(nombre="benchmark").returning(models.Proyecto.id))
+        periodo = db.scalar(select(models.Periodo.id).where(models.Periodo.nombre == "benchmark"))
+        if periodo is None:
+            periodo = db.scalar(insert(models.Periodo).values(nombre="benchmark").returning(models.Periodo.id))
+        for model, _, _, fila in TABLAS:
+            existentes = db.scalar(select(func.count()).select_from(model))
+            faltantes = [fila(i, proyecto, periodo) for i in range(existentes, args.filas)]
+            for i in range(0, len(faltantes), 10_000):
+                db.execute(insert(model), faltantes[i:i + 10_000])
+        db.commit()
+
+
+async def antes(db, schema, listar):
+    # Lo que hace FastAPI con response_model: validar objetos ORM, serializar y json.dumps
+    filas = await listar(db, None)
+    adaptador = TypeAdapter(list[schema])
+    contenido = adaptador.dump_python(adaptador.validate_python(filas, from_attributes=True), mode="json")
+    return len(json.dumps(contenido, ensure_ascii=False, separators=(",", ":")).encode())
+
+
+async def despues(db, model, schema):
+    filas = (await db.execute(select(*(getattr(model, c) for c in schema.model_fields)))).all()
+    return len(codificar(schema.model_fields, filas))
+
+
+async def medir(funcion, *argumentos):
+    mejor = None
+    for _ in range(args.repeticiones):
+        async with AsyncSessionLocal() as db:
+            inicio = perf_counter()
+            await funcion(db, *argumentos)
+            duracion = perf_counter() - inicio
+        mejor = duracion if mejor is None else min(mejor, duracion)
+    return mejor
+
+
+async def main():
+    for model, schema, listar, _ in TABLAS:
+        async with AsyncSessionLocal() as db:
+            n = await db.scalar(select(func.count()).select_from(model))
+        t_antes = await medir(antes, schema, listar)
+        t_despues = await medir(despues, model, schema)
+        print(f"📊 {model.__tablename__} ({n} filas)")
+        print(f"   antes:   {n / t_antes:>12,.0f} filas/s  ({t_antes:.3f}s)")
+        print(f"   después: {n / t_despues:>12,.0f} filas/s  ({t_despues:.3f}s)  x{t_antes / t_despues:.1f}")
+    # Sin esto el hilo de la conexión aiosqlite mantiene vivo el proceso
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    llenar()
+    asyncio.run(main())
@@ -0,0 +1,24 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+from sqlalchemy.orm import Session
+from app.database import SessionLocal
+from app import cierres
+from dotenv import load_dotenv
+
+load_dotenv()
+
+parser = argparse.ArgumentParser(description="Cierra un periodo: congela sus agregados y bloquea sus hechos")
+parser.add_argument("periodo_id", type=int)
+parser.add_argument("--reabrir", action="store_true", help="Borra la foto del periodo y vuelve a admitir escrituras")
+args = parser.parse_args()
+
+db: Session = SessionLocal()
+resumen = (cierres.reabrir if args.reabrir else cierres.cerrar)(db, args.periodo_id)
+db.close()
+
+if resumen is None:
+    sys.exit(f"❌ Periodo {args.periodo_id} no encontrado")
+print(f"✅ Periodo {'reabierto' if args.reabrir else 'consolidado'}: {resumen}")
@@ -1,41 +1,27 @@
 import sys
 import os
+import logging
 sys.path.append(os.path.dirname(os.path.abspath(__file__)) + "/..")
 
-import pandas as pd
 from sqlalchemy.orm import Session
 from app.database import SessionLocal
-from app import models
+from app import importacion
 
-# Leer archivo y hoja
-archivo = "data/01_Historico_Gastos_2024_v2.xlsx"
-df_original = pd.read_excel(archivo, sheet_name="6. Administración", header=None)
+# Avisos de app/importacion.py: nombres sin resolver, filas de periodos consolidados
+logging.basicConfig(level=logging.INFO, format="%(message)s")
 
-# Buscar encabezado real
-header_index = df_original[df_original.iloc[:, 0] == "Nombre del Costo"].index[0]
-df = df_original.iloc[header_index + 1:, [0, 3, 4]]
-df.columns = ["tipo_costo", "periodicidad", "valor"]
+# Leer hoja desde el encabezado real ("Nombre del Costo")
+df = importacion.leer_hoja(importacion.EXCEL_PATH, "administracion")
+
+# Columnas y nulos en operaciones de columna
+df = importacion.preparar_administracion(df)
 
 print("📄 Columnas formateadas:", df.columns)
 print(df.head(10))
 
-# Conexión a BD
+# Conexión a BD e inserción en bloque
 db: Session = SessionLocal()
-insertados = 0
-
-for _, row in df.iterrows():
-    if pd.isnull(row["valor"]):
-        continue
-
-    gasto = models.Administracion(
-        tipo_costo=row["tipo_costo"] if not pd.isnull(row["tipo_costo"]) else None,
-        descripcion=None,
-        periodicidad=row["periodicidad"] if not pd.isnull(row["periodicidad"]) else None,
-        valor=row["valor"],
-        fecha=None
-    )
-    db.add(gasto)
-    insertados += 1
-
-db.commit()
-print(f"✅ Registros importados: {insertados}")
+# Upsert por huella: reimportar no duplica, solo inserta/actualiza lo que cambió
+resumen = importacion.sincronizar(db, "administracion", df)
+db.close()
+print(f"✅ Registros importados: {resumen}")
@@ -1,55 +1,35 @@
 import sys
 import os
+import logging
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 import pandas as pd
 from sqlalchemy.orm import Session
 from app.database import SessionLocal
-from app import models
+from app import importacion
 from dotenv import load_dotenv
-from datetime import datetime
 
 # Cargar variables de entorno
 load_dotenv()
 
-EXCEL_PATH = "data/01_Historico_Gastos_2024_v2.xlsx"
-SHEET_NAME = "1. GastosXProyecto"
+# Avisos de app/importacion.py: nombres sin resolver, filas de periodos consolidados
+logging.basicConfig(level=logging.INFO, format="%(message)s")
 
 # Leer hoja con encabezados desde la fila 3 (índice 2)
-df = pd.read_excel(EXCEL_PATH, sheet_name=SHEET_NAME, header=2)
+df = pd.read_excel(importacion.EXCEL_PATH, sheet_name=importacion.HOJA_MOVIMIENTOS, header=2)
 
-# Normalizar columnas
-df.columns = df.columns.str.strip().str.lower().str.replace(" ", "_")
-
-# Renombrar columnas relevantes
-df = df.rename(columns={
-    "subproyecto": "nombre_proyecto",
-    "total": "valor",
-    "mes": "mes",
-    "fecha_inicio": "fecha"
-})
+# Normalizar columnas, descartar nulos y completar fechas
+df = importacion.preparar_movimientos(df)
 
 # Conectar a la base de datos
 db: Session = SessionLocal()
 
+# Resolver proyectos con un único cruce contra la tabla
+df, no_resueltos = importacion.resolver_fks(db, df, importacion.REGLAS_FK["movimientos"])
+importacion.reportar_no_resueltos(no_resueltos)
+
 # Insertar movimientos
-for _, row in df.iterrows():
-    if pd.isnull(row["nombre_proyecto"]) or pd.isnull(row["valor"]):
-        continue
-
-    # Buscar proyecto por nombre
-    proyecto = db.query(models.Proyecto).filter_by(nombre=row["nombre_proyecto"]).first()
-    if not proyecto:
-        print(f"⚠️ Proyecto no encontrado: {row['nombre_proyecto']}")
-        continue
-
-    movimiento = models.Movimiento(
-        proyecto_id=proyecto.id,
-        fecha=row["fecha"] if not pd.isnull(row["fecha"]) else datetime.now().date(),
-        valor=row["valor"]
-    )
-    db.add(movimiento)
-
-db.commit()
+# Upsert por huella: reimportar no duplica, solo inserta/actualiza lo que cambió
+resumen = importacion.sincronizar(db, "movimientos", df)
 db.close()
-print("✅ Movimientos importados exitosamente")
+print(f"✅ Movimientos importados exitosamente: {resumen}")
@@ -1,69 +1,37 @@
 import sys
 import os
+import logging
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 import pandas as pd
 from sqlalchemy.orm import Session
 from app.database import SessionLocal
-from app import models
+from app import dedicacion, importacion
 from dotenv import load_dotenv
 
 # Cargar variables de entorno
 load_dotenv()
 
-# Rutas del archivo y hoja
-EXCEL_PATH = "data/01_Historico_Gastos_2024_v2.xlsx"
-SHEET_NAME = "0.1 Datos de Proyectos"
+# Avisos de app/importacion.py: nombres sin resolver, filas de periodos consolidados
+logging.basicConfig(level=logging.INFO, format="%(message)s")
 
 # Leer hoja (segunda fila útil como encabezado)
-df = pd.read_excel(EXCEL_PATH, sheet_name=SHEET_NAME, header=1)
-
-# Limpiar nombres de columnas
-df.columns = df.columns.str.strip().str.lower().str.replace(" ", "_")
+df = pd.read_excel(importacion.EXCEL_PATH, sheet_name=importacion.HOJA_PROYECTOS, header=1)
 
 # Mostrar columnas para debug
 print("🧩 Columnas disponibles:")
-print(df.columns.tolist())
+print(importacion.normalizar_columnas(df).columns.tolist())
 
-# Eliminar filas sin nombre de proyecto
-df = df.dropna(subset=["proyecto"])
+# Eliminar filas sin proyecto y convertir presupuesto / centro de costo por columna
+df = importacion.preparar_proyectos(df)
 
-# Conectar a la base de datos
+# Conectar a la base de datos y guardar en bloque
 db: Session = SessionLocal()
-
-# Recorrer las filas del Excel
-for _, row in df.iterrows():
-    try:
-        # Limpiar y validar campos
-        nombre = row.get("proyecto", None)
-        centro_costo = row.get("centro_de_costo", None)
-        subproyecto = row.get("subproyecto", None)
-        estado = row.get("estado", None)
-        presupuesto = row.get("presupuesto_actual", None)
-
-        # Convertir presupuesto a float si es posible
-        presupuesto = float(presupuesto) if pd.notnull(presupuesto) else None
-
-        # Convertir centro_costo siempre a string (puede venir como número)
-        centro_costo = str(centro_costo) if pd.notnull(centro_costo) else None
-
-        proyecto = models.Proyecto(
-            nombre=nombre,
-            centro_costo=centro_costo,
-            subproyecto=subproyecto,
-            estado=estado,
-            presupuesto=presupuesto
-        )
-
-        db.add(proyecto)
-
-    except Exception as e:
-        print(f"❌ Error en fila: {row.to_dict()}")
-        print(f"➡️ {e}")
-        continue
-
-# Guardar cambios
+# Upsert por huella: reimportar no duplica, solo inserta/actualiza lo que cambió
+resumen = importacion.sincronizar(db, "proyectos", df, commit=False)
+# Las dedicaciones cruzan rrhh.proyecto con los nombres de proyecto
+dedicacion.reconstruir(db)
 db.commit()
 db.close()
 
-print("✅ Proyectos importados correctamente con validaciones")
+print(f"✅ Proyectos importados correctamente con validaciones: {resumen}")
@@ -1,47 +1,37 @@
 import sys
 import os
+import logging
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 import pandas as pd
 from sqlalchemy.orm import Session
 from app.database import SessionLocal
-from app import models
+from app import dedicacion, importacion
 from dotenv import load_dotenv
 
 # Cargar variables de entorno
 load_dotenv()
 
-# Ruta y hoja del archivo Excel
-EXCEL_PATH = "data/01_Historico_Gastos_2024_v2.xlsx"
-SHEET_NAME = "Dedicación RRHH"
+# Avisos de app/importacion.py: nombres sin resolver, filas de periodos consolidados
+logging.basicConfig(level=logging.INFO, format="%(message)s")
 
 # Leer hoja (segunda fila como encabezado)
-df = pd.read_excel(EXCEL_PATH, sheet_name=SHEET_NAME, header=1)
+df = pd.read_excel(importacion.EXCEL_PATH, sheet_name=importacion.HOJA_RRHH, header=1)
 
-# Normalizar nombres de columnas
-df.columns = df.columns.str.strip().str.lower().str.replace(" ", "_")
-
-# Separar columnas clave
-datos_fijos = df[["nombre", "equipo"]]
-proyectos = df.drop(columns=["nombre", "equipo", "dedicación_actual_total"], errors="ignore")
+# Matriz persona x proyecto -> una fila por par con dedicación > 0 (melt)
+df = importacion.preparar_rrhh(df)
 
 # Conectar a la base de datos
 db: Session = SessionLocal()
-
-# Recorrer personas y proyectos
-for idx, row in datos_fijos.iterrows():
-    for proyecto in proyectos.columns:
-        dedicacion = df.at[idx, proyecto]
-        if pd.notnull(dedicacion) and dedicacion > 0:
-            rrhh = models.Rrhh(
-                nombre=row["nombre"],
-                equipo=row["equipo"],
-                proyecto=proyecto,
-                dedicacion_total=float(dedicacion)  # ← CAMBIADO AQUÍ
-            )
-            db.add(rrhh)
-
+# Upsert por huella: reimportar no duplica, solo inserta/actualiza lo que cambió
+resumen = importacion.sincronizar(db, "rrhh", df, commit=False)
+# Personas y dedicaciones se derivan de rrhh en la misma transacción
+dedicacion.reconstruir(db)
 db.commit()
+# Se avisa quién no suma 100 %
+for fila in dedicacion.matriz(db)["personas"]:
+    if not fila["valida"]:
+        print(f"⚠️ {fila['nombre']}: dedicación total {fila['total']:.0%}")
 db.close()
 
-print("✅ Dedicación RRHH importada exitosamente")
+print(f"✅ Dedicación RRHH importada exitosamente: {resumen}")
@@ -0,0 +1,128 @@
+import sys
+import os
+import logging
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from time import perf_counter
+
+from sqlalchemy.orm import Session
+from app.database import SessionLocal
+from app import dedicacion, importacion
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Avisos de app/importacion.py: nombres sin resolver, filas de periodos consolidados
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+# Las dimensiones se cargan antes que los hechos que las referencian
+DIMENSIONES = ["proyectos", "rrhh"]
+HECHOS = ["movimientos", "sueldos", "caja_menor", "compras", "administracion"]
+
+tiempos = {}
+
+
+@contextmanager
+def etapa(nombre):
+    inicio = perf_counter()
+    yield
+    tiempos[nombre] = perf_counter() - inicio
+    print(f"⏱️ {nombre}: {tiempos[nombre]:.2f}s")
+
+
+def main_streaming(archivo: str, tamano: int):
+    # 📄 openpyxl read_only: cada hoja pasa por memoria de a `tamano` filas
+    db: Session = SessionLocal()
+    # Los hechos comparten los índices de dimensiones (se leen tras cargar proyectos y rrhh)
+    indices = {}
+    resumen = {}
+    try:
+        for recurso in DIMENSIONES + HECHOS:
+            with etapa(f"streaming {recurso}"):
+                resumen[recurso] = importacion.importar_en_chunks(db, recurso, archivo, tamano, indices)
+        with etapa("dedicaciones"):
+            dedicacion.reconstruir(db)
+        with etapa("commit"):
+            db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+    for recurso, conteos in resumen.items():
+        print(f"✅ {recurso}: {conteos}")
+    print(f"⏱️ total: {sum(tiempos.values()):.2f}s")
+
+
+def main(archivo: str, workers: int | None, eliminar: bool):
+    # 📄 El libro se lee del disco una sola vez; los procesos reciben los bytes
+    with etapa("lectura"):
+        with open(archivo, "rb") as f:
+            contenido = f.read()
+
+    # 🧠 Las hojas son independientes: se parsean y preparan en paralelo
+    with etapa("parseo"):
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futuros = {
+                recurso: pool.submit(importacion.parsear_hoja, contenido, recurso)
+                for recurso in DIMENSIONES + HECHOS
+            }
+            hojas = {recurso: futuro.result() for recurso, futuro in futuros.items()}
+
+    # 🚀 Carga en una sola transacción: si algo falla no queda nada a medias.
+    # Upsert por huella: solo se escriben filas nuevas o modificadas, y solo
+    # esas mueven gasto_x_proyecto (deltas aplicados por sincronizar).
+    db: Session = SessionLocal()
+    resumen = {}
+    try:
+        for recurso in DIMENSIONES + HECHOS:
+            with etapa(f"carga {recurso}"):
+                df = hojas[recurso]
+                if recurso in importacion.REGLAS_FK:
+                    df, no_resueltos = importacion.resolver_fks(db, df, importacion.REGLAS_FK[recurso])
+                    importacion.reportar_no_resueltos(no_resueltos)
+                hojas[recurso] = importacion.con_huellas(df, recurso)
+                resumen[recurso] = importacion.sincronizar(db, recurso, hojas[recurso], commit=False)
+        if eliminar:
+            # 🧹 Hechos antes que dimensiones para no romper FKs
+            with etapa("eliminación"):
+                for recurso in reversed(DIMENSIONES + HECHOS):
+                    resumen[recurso]["eliminados"] = importacion.eliminar_ausentes(
+                        db, recurso, hojas[recurso]["clave_importacion"]
+                    )
+        with etapa("dedicaciones"):
+            dedicacion.reconstruir(db)
+        with etapa("commit"):
+            db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+    for recurso, conteos in resumen.items():
+        print(f"✅ {recurso}: {conteos}")
+    print(f"⏱️ total: {sum(tiempos.values()):.2f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Importa todas las hojas del libro histórico")
+    parser.add_argument("--archivo", default=importacion.EXCEL_PATH)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--eliminar", action="store_true",
+                        help="Borra las filas importadas antes que ya no están en el Excel")
+    parser.add_argument("--streaming", action="store_true",
+                        help="Lectura por chunks en memoria acotada para libros consolidados muy "
+                             "grandes (upsert por chunk, sin --eliminar)")
+    parser.add_argument("--chunk", type=int, default=importacion.TAMANO_CHUNK)
+    args = parser.parse_args()
+    if args.streaming and args.eliminar:
+        parser.error("--eliminar requiere la importación incremental (sin --streaming)")
+    if args.streaming:
+        main_streaming(args.archivo, args.chunk)
+    else:
+        main(args.archivo, args.workers, args.eliminar)
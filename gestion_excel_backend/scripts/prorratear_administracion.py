@@ -0,0 +1,22 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+from sqlalchemy.orm import Session
+from app.database import SessionLocal
+from app import prorrateo
+from dotenv import load_dotenv
+
+load_dotenv()
+
+parser = argparse.ArgumentParser(description="Prorratea los costos de administración entre proyectos y periodos")
+parser.add_argument("--criterio", choices=prorrateo.CRITERIOS, default="presupuesto",
+                    help="sueldos usa costo_sueldos: correr antes scripts/asignar_sueldos.py")
+args = parser.parse_args()
+
+db: Session = SessionLocal()
+resumen = prorrateo.ejecutar(db, args.criterio)
+db.close()
+
+print(f"✅ costo_administracion recalculado: {resumen}")
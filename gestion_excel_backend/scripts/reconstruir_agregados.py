@@ -0,0 +1,17 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy.orm import Session
+from app.database import SessionLocal
+from app import agregados
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Recalcula gasto_x_proyecto desde las tablas de hechos (tras importaciones o correcciones manuales)
+db: Session = SessionLocal()
+agregados.reconstruir(db)
+db.close()
+
+print("✅ gasto_x_proyecto reconstruido")
@@ -0,0 +1,31 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy.orm import Session
+from app.database import SessionLocal
+from app.planes import consultas, plan
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+def main() -> int:
+    db: Session = SessionLocal()
+    fallas = 0
+    try:
+        for indice, query in consultas(db):
+            resultado = plan(db, query)
+            if indice in resultado:
+                print(f"✅ {indice}")
+            else:
+                fallas += 1
+                print(f"❌ {indice} no aparece en el plan:\n{resultado}")
+    finally:
+        db.rollback()
+        db.close()
+    return 1 if fallas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
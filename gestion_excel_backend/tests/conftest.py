@@ -0,0 +1,46 @@
+import os
+import sys
+import tempfile
+
+# La app lee DATABASE_URL al importarse: las pruebas usan una BD SQLite propia
+_BD = os.path.join(tempfile.mkdtemp(prefix="gestion_excel_"), "pruebas.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{_BD}"
+os.environ.pop("ASYNC_DATABASE_URL", None)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import pytest
+
+from app import models
+from app.database import Base, SessionLocal, engine
+
+
+@pytest.fixture
+def db():
+    """Sesión sobre un esquema recién creado (vacío) para cada prueba."""
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    sesion = SessionLocal()
+    try:
+        yield sesion
+    finally:
+        sesion.close()
+
+
+@pytest.fixture
+def periodos(db):
+    db.add_all(
+        models.Periodo(nombre=nombre, es_consolidado=False)
+        for nombre in ("Enero", "Febrero", "Marzo")
+    )
+    db.commit()
+
+
+@pytest.fixture
+def cliente(db):
+    """TestClient de la API sobre el mismo esquema que `db`."""
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    with TestClient(app) as cliente:
+        yield cliente
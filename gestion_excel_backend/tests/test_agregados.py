@@ -0,0 +1,108 @@
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import func, insert, select
+from sqlalchemy.exc import IntegrityError
+
+from app import agregados, models
+
+G = models.GastoProyecto
+
+
+@pytest.fixture
+def proyecto(db, periodos):
+    db.add(models.Proyecto(nombre="A"))
+    db.commit()
+
+
+def _renglones(db):
+    return db.execute(select(G.proyecto_id, G.periodo_id, G.categoria, G.total_gastos, G.cantidad)
+                      .order_by(G.categoria, G.proyecto_id, G.periodo_id)).all()
+
+
+def test_altas_y_bajas_mantienen_un_renglon_por_clave(db, proyecto):
+    filas = [{"proyecto_id": 1, "periodo_id": 1, "valor": 10}, {"proyecto_id": 1, "periodo_id": 1, "valor": 5}]
+    agregados.registrar_altas(db, models.CajaMenor, filas)
+    agregados.registrar_altas(db, models.CajaMenor, filas[:1])
+    # Proyecto y periodo NULL (administración) también son una sola clave
+    agregados.registrar_altas(db, models.Administracion, [{"valor": 7}, {"valor": 3}])
+    agregados.registrar_altas(db, models.Administracion, [{"valor": 1}])
+    db.commit()
+    assert _renglones(db) == [
+        (None, None, "administracion", Decimal(11), 3),
+        (1, 1, "caja_menor", Decimal(25), 3),
+    ]
+
+
+def test_renglon_sin_filas_se_borra(db, proyecto):
+    fila = {"proyecto_id": 1, "periodo_id": 1, "valor": 10}
+    agregados.registrar_altas(db, models.Compra, [fila])
+    agregados.registrar_altas(db, models.Administracion, [{"valor": 2}])
+    db.commit()
+    agregados.registrar_eliminadas(db, models.Compra, [fila])
+    agregados.registrar_eliminadas(db, models.Administracion, [{"valor": 2}])
+    db.commit()
+    assert _renglones(db) == []
+    # Sin el renglón en cero nada impide borrar el proyecto
+    db.delete(db.get(models.Proyecto, 1))
+    db.commit()
+
+
+def test_mover_una_fila_de_periodo(db, proyecto):
+    antes = {"proyecto_id": 1, "periodo_id": 1, "valor": 10}
+    agregados.registrar_altas(db, models.Sueldo, [antes])
+    agregados.registrar_cambios(db, models.Sueldo, [(antes, {**antes, "periodo_id": 2})])
+    db.commit()
+    assert _renglones(db) == [(1, 2, "sueldos", Decimal(10), 1)]
+
+
+def test_indice_unico_de_la_clave(db, proyecto):
+    renglon = {"proyecto_id": None, "periodo_id": None, "categoria": "administracion", "total_gastos": 1, "cantidad": 1}
+    db.execute(insert(G), [renglon])
+    with pytest.raises(IntegrityError):
+        db.execute(insert(G), [renglon])
+    db.rollback()
+
+
+def test_reconstruir_coincide_con_los_deltas(db, proyecto):
+    db.add_all([
+        models.Compra(proyecto_id=1, periodo_id=1, valor=10),
+        models.Compra(proyecto_id=1, periodo_id=1, valor=20),
+        models.Administracion(valor=4),
+    ])
+    db.commit()
+    agregados.reconstruir(db)
+    reconstruido = _renglones(db)
+    assert [(r.categoria, r.total_gastos, r.cantidad) for r in reconstruido] == [
+        ("administracion", Decimal(4), 1), ("compras", Decimal(30), 2)]
+    assert db.scalar(select(func.count()).select_from(G)) == 2
+
+
+def test_api_mantiene_el_agregado_igual_a_reconstruir(db, proyecto, cliente):
+    compra = {"proyecto_id": 1, "periodo_id": 1, "valor": 10, "fecha": None, "proveedor": None, "descripcion": None}
+    caja = {"proyecto_id": 1, "periodo_id": 2, "valor": 7, "fecha": None, "responsable": None,
+            "concepto": None, "observaciones": None}
+    admin = {"tipo_costo": None, "descripcion": None, "periodicidad": None, "valor": 3, "fecha": None}
+    ids = [cliente.post("/api/compras/", json={**compra, "valor": v}).json()["id"] for v in (10, 20, 30)]
+    cliente.post("/api/caja_menor/bulk", json=[caja, {**caja, "periodo_id": 3}])
+    cliente.post("/api/administracion/", json=admin)
+    cliente.put(f"/api/compras/{ids[0]}", json={**compra, "periodo_id": 2, "valor": 15})
+    cliente.delete(f"/api/compras/{ids[1]}")
+    respuesta = cliente.post("/api/batch", json=[
+        {"recurso": "compras", "accion": "actualizar", "id": ids[2], "datos": {**compra, "valor": 1}},
+        {"recurso": "caja_menor", "accion": "crear", "datos": {**caja, "valor": 4}},
+        {"recurso": "compras", "accion": "eliminar", "id": ids[0]},
+        {"recurso": "administracion", "accion": "crear", "datos": {**admin, "valor": 2}},
+    ])
+    assert respuesta.status_code == 200
+
+    incremental = _renglones(db)
+    agregados.reconstruir(db)
+    db.expire_all()
+    assert incremental == _renglones(db)
+    assert incremental == [
+        (None, None, "administracion", Decimal(5), 2),
+        (1, 2, "caja_menor", Decimal(11), 2),
+        (1, 3, "caja_menor", Decimal(7), 1),
+        (1, 1, "compras", Decimal(1), 1),
+    ]
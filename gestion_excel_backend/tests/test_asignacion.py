@@ -0,0 +1,50 @@
+from datetime import date
+
+import pytest
+
+from app import asignacion, models
+
+
+@pytest.fixture
+def sueldos(db, periodos):
+    """Ana reparte 50/50, Luis 0.6/0.2 (se normaliza a 75/25) y Eva tiene dedicación 0."""
+    db.add_all([models.Proyecto(nombre="A"), models.Proyecto(nombre="B")])
+    db.add_all(models.Persona(nombre=n, nombre_normalizado=n.lower()) for n in ("Ana", "Luis", "Eva"))
+    db.add_all(models.Rrhh(nombre=n, nombre_normalizado=n.lower(), proyecto="A") for n in ("Ana", "Luis", "Eva"))
+    db.flush()
+    db.add_all([
+        models.Dedicacion(persona_id=1, proyecto_id=1, dedicacion=0.5),
+        models.Dedicacion(persona_id=1, proyecto_id=2, dedicacion=0.5),
+        models.Dedicacion(persona_id=2, proyecto_id=1, dedicacion=0.6),
+        models.Dedicacion(persona_id=2, proyecto_id=2, dedicacion=0.2),
+        models.Dedicacion(persona_id=3, proyecto_id=1, dedicacion=0),
+    ])
+    # (rrhh, periodo, valor); el proyecto cargado en el sueldo no cuenta para el reparto
+    for rrhh_id, periodo_id, valor in ((1, 1, 60), (1, 1, 40), (1, 2, 200), (2, 1, 80), (3, 1, 50)):
+        db.add(models.Sueldo(rrhh_id=rrhh_id, periodo_id=periodo_id, proyecto_id=2, horas=160,
+                             valor=valor, fecha=date(2024, periodo_id, 28)))
+    db.commit()
+
+
+def test_reparto_igual_al_calculado_a_mano(db, sueldos):
+    costos, resumen = asignacion.calcular(db)
+    filas = sorted(costos.itertuples(index=False, name=None))
+    # Enero: A = 0.5·100 + 0.75·80, B = 0.5·100 + 0.25·80; Febrero: solo Ana
+    assert filas == [(1, 1, 110.0, 2), (1, 2, 100.0, 1), (2, 1, 70.0, 2), (2, 2, 100.0, 1)]
+    assert resumen == {
+        "filas": 4,
+        "personas": 2,
+        "periodos": 2,
+        "total_asignado": 380.0,
+        "personas_sin_dedicacion": 1,
+        "valor_sin_asignar": 50.0,
+    }
+
+
+def test_ejecutar_reemplaza_costo_sueldos(db, sueldos, monkeypatch):
+    # Sin reconstruir dedicaciones desde rrhh: se usa la matriz del fixture
+    monkeypatch.setattr(asignacion.dedicacion, "reconstruir", lambda db: None)
+    asignacion.ejecutar(db)
+    asignacion.ejecutar(db)
+    assert [(f.proyecto_id, f.periodo_id, float(f.valor), f.personas) for f in asignacion.listar(db)] == [
+        (1, 1, 110.0, 2), (1, 2, 100.0, 1), (2, 1, 70.0, 2), (2, 2, 100.0, 1)]
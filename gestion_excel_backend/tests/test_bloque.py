@@ -0,0 +1,54 @@
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import func, select
+
+from app import models
+
+G = models.GastoProyecto
+
+CAJA = {"proyecto_id": 1, "periodo_id": 1, "valor": 1, "fecha": None, "responsable": None,
+        "concepto": None, "observaciones": None}
+
+
+@pytest.fixture
+def proyectos(db, periodos):
+    db.add_all([models.Proyecto(nombre="A"), models.Proyecto(nombre="B")])
+    db.commit()
+
+
+def _contar(db, model) -> int:
+    return db.scalar(select(func.count()).select_from(model))
+
+
+def test_ids_en_el_orden_de_entrada(db, cliente, proyectos):
+    # Valores distintos por fila: cada id debe corresponder a su posición en la entrada
+    filas = [{**CAJA, "proyecto_id": 1 + i % 2, "periodo_id": 1 + i % 3, "valor": i + 1, "concepto": f"c{i}"}
+             for i in range(25)]
+    respuesta = cliente.post("/api/caja_menor/bulk", json=filas)
+    assert respuesta.status_code == 200
+    cuerpo = respuesta.json()
+    assert cuerpo["insertados"] == 25
+    conceptos = dict(db.execute(select(models.CajaMenor.id, models.CajaMenor.concepto)).all())
+    assert [conceptos[i] for i in cuerpo["ids"]] == [f"c{i}" for i in range(25)]
+
+    renglones = db.execute(select(G.proyecto_id, G.periodo_id, G.total_gastos, G.cantidad)
+                           .order_by(G.proyecto_id, G.periodo_id)).all()
+    esperados = {}
+    for fila in filas:
+        total, cantidad = esperados.get((fila["proyecto_id"], fila["periodo_id"]), (0, 0))
+        esperados[(fila["proyecto_id"], fila["periodo_id"])] = (total + fila["valor"], cantidad + 1)
+    assert renglones == [(p, pe, Decimal(t), c) for (p, pe), (t, c) in sorted(esperados.items())]
+
+
+def test_fila_invalida_rechaza_todo_con_422(db, cliente, proyectos):
+    filas = [CAJA, {**CAJA, "valor": "no es número"}, {**CAJA, "proyecto_id": None}]
+    respuesta = cliente.post("/api/caja_menor/bulk", json=filas)
+    assert respuesta.status_code == 422
+    assert {error["loc"][1] for error in respuesta.json()["detail"]} == {1, 2}
+    assert _contar(db, models.CajaMenor) == 0
+    assert _contar(db, G) == 0
+
+
+def test_bloque_vacio(db, cliente, proyectos):
+    assert cliente.post("/api/compras/bulk", json=[]).json() == {"insertados": 0, "ids": []}
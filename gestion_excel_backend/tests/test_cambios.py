@@ -0,0 +1,76 @@
+import pytest
+
+COMPRA = {"proyecto_id": 1, "periodo_id": 1, "valor": 10, "fecha": None, "proveedor": None, "descripcion": None}
+
+
+@pytest.fixture
+def proyecto(periodos, cliente):
+    cliente.post("/api/proyectos/", json={"nombre": "A", "centro_costo": None, "subproyecto": None,
+                                          "estado": None, "presupuesto": None})
+
+
+def _cambios(cliente, since=None):
+    respuesta = cliente.get("/api/compras/changes", params={} if since is None else {"since": since})
+    assert respuesta.status_code == 200
+    return respuesta.json()
+
+
+def test_sin_since_devuelve_todo_y_el_token_inicial(cliente, proyecto):
+    vacio = _cambios(cliente)
+    assert vacio["cambios"] == [] and vacio["eliminados"] == []
+
+    ids = cliente.post("/api/compras/bulk", json=[COMPRA, {**COMPRA, "valor": 20}]).json()["ids"]
+    inicial = _cambios(cliente)
+    assert [fila["id"] for fila in inicial["cambios"]] == ids
+    assert inicial["eliminados"] == []
+    assert inicial["token"] > vacio["token"]
+
+
+def test_filas_escritas_despues_del_token(cliente, proyecto):
+    cliente.post("/api/compras/", json=COMPRA)
+    token = _cambios(cliente)["token"]
+    nueva = cliente.post("/api/compras/", json={**COMPRA, "valor": 30}).json()["id"]
+
+    cambios = _cambios(cliente, token)
+    assert [(fila["id"], fila["valor"]) for fila in cambios["cambios"]] == [(nueva, 30)]
+    assert cambios["token"] > token
+
+
+def test_ids_borrados_en_eliminados(cliente, proyecto):
+    ids = cliente.post("/api/compras/bulk", json=[COMPRA, COMPRA, COMPRA]).json()["ids"]
+    token = _cambios(cliente)["token"]
+    cliente.delete(f"/api/compras/{ids[0]}")
+    cliente.post("/api/batch", json=[{"recurso": "compras", "accion": "eliminar", "id": ids[2]}])
+
+    cambios = _cambios(cliente, token)
+    assert cambios["cambios"] == []
+    assert cambios["eliminados"] == [ids[0], ids[2]]
+
+
+def test_fila_editada_dos_veces_aparece_una_vez(cliente, proyecto):
+    compra = cliente.post("/api/compras/", json=COMPRA).json()["id"]
+    token = _cambios(cliente)["token"]
+    cliente.put(f"/api/compras/{compra}", json={**COMPRA, "valor": 11})
+    cliente.put(f"/api/compras/{compra}", json={**COMPRA, "valor": 12})
+
+    cambios = _cambios(cliente, token)
+    assert [(fila["id"], fila["valor"]) for fila in cambios["cambios"]] == [(compra, 12)]
+
+
+def test_sondeo_sin_cambios_responde_304(cliente, proyecto):
+    cliente.post("/api/compras/", json=COMPRA)
+    primera = cliente.get("/api/compras/changes", params={"since": 0})
+    etag = primera.headers["ETag"]
+    token = primera.json()["token"]
+
+    repetida = cliente.get("/api/compras/changes", params={"since": 0}, headers={"If-None-Match": etag})
+    assert repetida.status_code == 304
+    # Una escritura en otra tabla no invalida el feed de compras
+    cliente.post("/api/proyectos/", json={"nombre": "B", "centro_costo": None, "subproyecto": None,
+                                          "estado": None, "presupuesto": None})
+    assert cliente.get("/api/compras/changes", params={"since": 0}, headers={"If-None-Match": etag}).status_code == 304
+
+    cliente.post("/api/compras/", json=COMPRA)
+    nueva = cliente.get("/api/compras/changes", params={"since": 0}, headers={"If-None-Match": etag})
+    assert nueva.status_code == 200
+    assert nueva.json()["token"] > token
@@ -0,0 +1,93 @@
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import select, update
+
+from app import models
+
+G, GC = models.GastoProyecto, models.GastoConsolidado
+
+COMPRA = {"proyecto_id": 1, "periodo_id": 1, "valor": 10, "fecha": None, "proveedor": None, "descripcion": None}
+
+
+@pytest.fixture
+def compras(db, periodos, cliente):
+    """Proyecto 1 con compras en Enero (10 + 20) y Febrero (5)."""
+    db.add(models.Proyecto(nombre="A"))
+    db.commit()
+    respuesta = cliente.post("/api/compras/bulk", json=[
+        COMPRA, {**COMPRA, "valor": 20}, {**COMPRA, "periodo_id": 2, "valor": 5},
+    ])
+    return respuesta.json()["ids"]
+
+
+def _foto(db):
+    db.expire_all()
+    return db.execute(select(GC.periodo_id, GC.proyecto_id, GC.categoria, GC.total_gastos, GC.cantidad)
+                      .order_by(GC.periodo_id)).all()
+
+
+def _reporte(cliente, **filtros):
+    filas = cliente.get("/api/reportes/gasto-por-proyecto", params=filtros).json()
+    return [(f["periodo_id"], f["total_gastos"], f["cantidad"]) for f in filas]
+
+
+def test_cerrar_guarda_la_foto(db, cliente, compras):
+    respuesta = cliente.post("/api/periodos/1/cerrar")
+    assert respuesta.status_code == 200
+    assert respuesta.json()["es_consolidado"] is True
+    assert respuesta.json()["filas"] == 1
+    assert respuesta.json()["total_gastos"] == 30
+    assert _foto(db) == [(1, 1, "compras", Decimal(30), 2)]
+    # Cerrar de nuevo no recalcula la foto
+    assert cliente.post("/api/periodos/1/cerrar").json()["total_gastos"] == 30
+    assert cliente.post("/api/periodos/9/cerrar").status_code == 404
+
+
+def test_escrituras_sobre_un_periodo_cerrado_responden_409(db, cliente, compras):
+    cliente.post("/api/periodos/1/cerrar")
+    enero, _, febrero = compras
+
+    alta = cliente.post("/api/compras/", json=COMPRA)
+    assert alta.status_code == 409
+    assert alta.json()["periodo_ids"] == [1]
+    assert cliente.put(f"/api/compras/{enero}", json={**COMPRA, "valor": 99}).status_code == 409
+    # Mover una fila hacia el periodo cerrado o sacarla de él
+    assert cliente.put(f"/api/compras/{febrero}", json={**COMPRA, "valor": 5}).status_code == 409
+    assert cliente.put(f"/api/compras/{enero}", json={**COMPRA, "periodo_id": 2}).status_code == 409
+    assert cliente.delete(f"/api/compras/{enero}").status_code == 409
+    assert cliente.post("/api/compras/bulk", json=[COMPRA]).status_code == 409
+
+    # Nada cambió: ni los hechos ni la foto
+    db.expire_all()
+    assert sorted(db.scalars(select(models.Compra.valor).where(models.Compra.periodo_id == 1))) == [10, 20]
+    assert db.scalar(select(models.Compra.periodo_id).where(models.Compra.id == febrero)) == 2
+    assert _foto(db) == [(1, 1, "compras", Decimal(30), 2)]
+    # Los periodos abiertos siguen admitiendo escrituras
+    assert cliente.post("/api/compras/", json={**COMPRA, "periodo_id": 3}).status_code == 200
+
+
+def test_reportes_leen_la_foto(db, cliente, compras):
+    cliente.post("/api/periodos/1/cerrar")
+    # Se altera el agregado vivo del periodo cerrado: el reporte no lo ve
+    db.execute(update(G).where(G.periodo_id == 1).values(total_gastos=999))
+    db.commit()
+    assert _reporte(cliente) == [(1, 30, 2), (2, 5, 1)]
+    # Y sí ve cualquier cambio en la foto
+    db.execute(update(GC).where(GC.periodo_id == 1).values(total_gastos=31))
+    db.commit()
+    assert _reporte(cliente, periodo_id=1) == [(1, 31, 2)]
+
+
+def test_reabrir_invalida_solo_ese_periodo(db, cliente, compras):
+    cliente.post("/api/periodos/1/cerrar")
+    cliente.post("/api/periodos/2/cerrar")
+    respuesta = cliente.post("/api/periodos/1/reabrir")
+    assert respuesta.status_code == 200
+    assert respuesta.json() == {"periodo_id": 1, "nombre": "Enero", "es_consolidado": False,
+                                "filas": 0, "total_gastos": 0}
+
+    assert _foto(db) == [(2, 1, "compras", Decimal(5), 1)]
+    assert cliente.post("/api/compras/", json=COMPRA).status_code == 200
+    assert cliente.post("/api/compras/", json={**COMPRA, "periodo_id": 2}).status_code == 409
+    assert _reporte(cliente) == [(1, 40, 3), (2, 5, 1)]
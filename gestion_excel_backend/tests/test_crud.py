@@ -0,0 +1,52 @@
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import select
+
+from app import models
+
+G = models.GastoProyecto
+
+RRHH = {"nombre": "Ana", "equipo": None, "proyecto": "A", "dedicacion_total": None}
+SUELDO = {"periodo_id": 1, "rrhh_id": 1, "proyecto_id": 1, "horas": 160, "valor": 100, "fecha": "2024-01-31"}
+COMPRA = {"proyecto_id": 1, "periodo_id": 1, "valor": 10, "fecha": None, "proveedor": None, "descripcion": None}
+
+
+@pytest.fixture
+def base(db, periodos, cliente):
+    """Proyectos 1 y 2 y la persona 1."""
+    db.add_all([models.Proyecto(nombre="A"), models.Proyecto(nombre="B"), models.Rrhh(nombre="Ana", proyecto="A")])
+    db.commit()
+
+
+def _renglones(db):
+    db.expire_all()
+    return db.execute(select(G.proyecto_id, G.periodo_id, G.categoria, G.total_gastos, G.cantidad)
+                      .order_by(G.proyecto_id, G.periodo_id)).all()
+
+
+def test_ids_inexistentes_responden_404(db, cliente, base):
+    cliente.post("/api/sueldos/", json=SUELDO)
+    renglones = _renglones(db)
+
+    assert cliente.put("/api/rrhh/999", json=RRHH).status_code == 404
+    assert cliente.put("/api/sueldos/999", json=SUELDO).status_code == 404
+    assert cliente.delete("/api/compras/999").status_code == 404
+    # Ni el 404 del cambio ni el de la baja tocan el agregado
+    assert _renglones(db) == renglones == [(1, 1, "sueldos", Decimal(100), 1)]
+
+
+def test_cambio_mueve_el_monto_entre_claves(db, cliente, base):
+    sueldo = cliente.post("/api/sueldos/", json=SUELDO).json()["id"]
+    cliente.post("/api/sueldos/", json={**SUELDO, "valor": 50})
+    compra = cliente.post("/api/compras/", json=COMPRA).json()["id"]
+
+    respuesta = cliente.put(f"/api/sueldos/{sueldo}", json={**SUELDO, "proyecto_id": 2, "periodo_id": 2, "valor": 120})
+    assert respuesta.status_code == 200
+    assert respuesta.json()["valor"] == 120
+    assert cliente.put(f"/api/compras/{compra}", json={**COMPRA, "periodo_id": 3}).status_code == 200
+    assert _renglones(db) == [
+        (1, 1, "sueldos", Decimal(50), 1),
+        (1, 3, "compras", Decimal(10), 1),
+        (2, 2, "sueldos", Decimal(120), 1),
+    ]
@@ -0,0 +1,73 @@
+import pytest
+from sqlalchemy import func, select
+
+from app import dedicacion, models
+
+
+@pytest.fixture
+def rrhh(db, monkeypatch):
+    # Cada prueba recrea el esquema y las versiones vuelven a empezar
+    monkeypatch.setattr(dedicacion, "_ultima", {"clave": None})
+    db.add_all([
+        models.Proyecto(nombre="Proyecto Alfa"),
+        models.Proyecto(nombre="Proyecto Beta"),
+        models.Rrhh(nombre="Ana", equipo="Obra", proyecto="Proyecto Alfa", dedicacion_total=0.5),
+        models.Rrhh(nombre="ANA ", equipo="Obra", proyecto="proyecto beta", dedicacion_total=0.5),
+        models.Rrhh(nombre="Luis", equipo="Oficina", proyecto="Proyecto Alfa", dedicacion_total=0.7),
+    ])
+    db.commit()
+
+
+def _contar(db, model) -> int:
+    return db.scalar(select(func.count()).select_from(model))
+
+
+def test_escribir_rrhh_no_reconstruye(db, rrhh):
+    # La reconstrucción recorre todo rrhh: no corre en cada commit
+    assert _contar(db, models.Persona) == 0
+    assert _contar(db, models.Dedicacion) == 0
+
+
+def test_reconstruir(db, rrhh):
+    resumen = dedicacion.ejecutar(db)
+    assert (resumen["personas"], resumen["dedicaciones"]) == (2, 3)
+    matriz = dedicacion.matriz(db)
+    assert [p["nombre"] for p in matriz["proyectos"]] == ["Proyecto Alfa", "Proyecto Beta"]
+    filas = {f["nombre"]: (f["dedicaciones"], f["valida"]) for f in matriz["personas"]}
+    assert filas == {"Ana": ([0.5, 0.5], True), "Luis": ([0.7, 0.0], False)}
+
+
+def test_ids_de_personas_estables(db, rrhh):
+    dedicacion.ejecutar(db)
+    antes = dict(db.execute(select(models.Persona.nombre_normalizado, models.Persona.id)).all())
+    db.add(models.Rrhh(nombre="Eva", proyecto="Proyecto Beta", dedicacion_total=1))
+    db.commit()
+    dedicacion.ejecutar(db)
+    despues = dict(db.execute(select(models.Persona.nombre_normalizado, models.Persona.id)).all())
+    assert {clave: despues[clave] for clave in antes} == antes
+
+
+def test_endpoint_reconstruir(cliente, rrhh):
+    assert cliente.post("/api/rrhh/dedicacion/reconstruir").json()["dedicaciones"] == 3
+    assert len(cliente.get("/api/rrhh/dedicacion").json()["personas"]) == 2
+
+
+def test_matriz_se_reconstruye_si_rrhh_o_proyectos_cambiaron(db, cliente, rrhh):
+    # Primera lectura: nunca se reconstruyó en este proceso
+    assert len(cliente.get("/api/rrhh/dedicacion").json()["personas"]) == 2
+    assert dedicacion.al_dia(db) is False
+
+    etag = cliente.get("/api/rrhh/dedicacion").headers["ETag"]
+    cliente.put("/api/rrhh/3", json={"nombre": "Luis", "equipo": "Oficina", "proyecto": "Proyecto Beta",
+                                      "dedicacion_total": 1})
+    respuesta = cliente.get("/api/rrhh/dedicacion", headers={"If-None-Match": etag})
+    assert respuesta.status_code == 200
+    filas = {f["nombre"]: (f["dedicaciones"], f["valida"]) for f in respuesta.json()["personas"]}
+    assert filas["Luis"] == ([0.0, 1.0], True)
+
+    cliente.put("/api/proyectos/2", json={"nombre": "Proyecto Gama", "centro_costo": None, "subproyecto": None,
+                                          "estado": None, "presupuesto": None})
+    matriz = cliente.get("/api/rrhh/dedicacion").json()
+    # "Proyecto Beta" ya no existe: Ana queda solo con Alfa y Luis sin dedicaciones
+    assert [p["nombre"] for p in matriz["proyectos"]] == ["Proyecto Alfa"]
+    assert [(f["nombre"], f["total"]) for f in matriz["personas"]] == [("Ana", 0.5)]
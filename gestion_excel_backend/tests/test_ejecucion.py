@@ -0,0 +1,66 @@
+from decimal import Decimal
+
+import pytest
+
+from app import agregados, ejecucion, models
+
+
+@pytest.fixture
+def proyectos(db, periodos, monkeypatch):
+    # Cada prueba recrea el esquema y las versiones vuelven a empezar: caché limpia
+    monkeypatch.setattr(ejecucion, "_cache", {"clave": None, "filas": []})
+    db.add_all([
+        models.Proyecto(nombre="A", presupuesto=200),
+        models.Proyecto(nombre="B", presupuesto=0),
+        models.Proyecto(nombre="C"),
+    ])
+    db.commit()
+    agregados.registrar_altas(db, models.Compra, [
+        {"proyecto_id": 1, "periodo_id": 1, "valor": 30},
+        {"proyecto_id": 1, "periodo_id": 2, "valor": 20},
+        {"proyecto_id": 2, "periodo_id": 1, "valor": 5},
+    ])
+    agregados.registrar_altas(db, models.CajaMenor, [{"proyecto_id": 1, "periodo_id": 1, "valor": 100}])
+    db.commit()
+
+
+def _resumen(filas):
+    return [(f["proyecto_id"], f["concepto"], f["presupuesto"], f["ejecutado"], f["diferencia"],
+             f["ejecucion_porcentaje"]) for f in filas]
+
+
+def test_presupuesto_ejecutado_diferencia_y_porcentaje(db, proyectos):
+    assert _resumen(ejecucion.calcular(db)) == [
+        (1, "caja_menor", None, Decimal(100), None, None),
+        (1, "compras", None, Decimal(50), None, None),
+        (1, "total", Decimal(200), Decimal(150), Decimal(50), Decimal(75)),
+        (2, "compras", None, Decimal(5), None, None),
+        # Presupuesto en cero: hay diferencia pero no porcentaje
+        (2, "total", Decimal(0), Decimal(5), Decimal(-5), None),
+        # Sin gastos ni presupuesto: solo la fila total, en cero
+        (3, "total", None, Decimal(0), None, None),
+    ]
+
+
+def test_endpoint_filtra_por_proyecto(cliente, proyectos):
+    filas = cliente.get("/api/reportes/ejecucion", params={"proyecto_id": 1}).json()
+    assert [(f["concepto"], f["ejecutado"]) for f in filas] == [("caja_menor", 100), ("compras", 50), ("total", 150)]
+    assert filas[-1]["proyecto"] == "A" and filas[-1]["ejecucion_porcentaje"] == 75
+
+
+def test_cache_se_invalida_al_escribir_en_las_tablas_de_origen(db, proyectos):
+    filas = ejecucion.calcular(db)
+    assert ejecucion.calcular(db) is filas
+
+    db.get(models.Proyecto, 3).presupuesto = 10
+    db.commit()
+    filas = ejecucion.calcular(db)
+    assert _resumen(filas)[-1] == (3, "total", Decimal(10), Decimal(0), Decimal(10), Decimal(0))
+    assert ejecucion.calcular(db) is filas
+
+    agregados.registrar_altas(db, models.Compra, [{"proyecto_id": 3, "periodo_id": 1, "valor": 4}])
+    db.commit()
+    assert _resumen(ejecucion.calcular(db))[-2:] == [
+        (3, "compras", None, Decimal(4), None, None),
+        (3, "total", Decimal(10), Decimal(4), Decimal(6), Decimal(40)),
+    ]
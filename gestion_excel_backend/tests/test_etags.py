@@ -0,0 +1,38 @@
+import pytest
+
+from app import models
+
+
+@pytest.fixture
+def compras(db, periodos):
+    db.add(models.Proyecto(nombre="A"))
+    db.flush()
+    db.add_all(models.Compra(proyecto_id=1, periodo_id=1, valor=v) for v in (10, 20))
+    db.commit()
+
+
+@pytest.mark.parametrize("formato", ["csv", "ndjson", "arrow", "parquet"])
+def test_listado_en_streaming_lleva_etag(cliente, compras, formato):
+    respuesta = cliente.get("/api/compras/", params={"format": formato})
+    assert respuesta.status_code == 200
+    etag = respuesta.headers["ETag"]
+    assert respuesta.headers["Cache-Control"] == "no-cache"
+
+    revalidada = cliente.get("/api/compras/", params={"format": formato}, headers={"If-None-Match": etag})
+    assert revalidada.status_code == 304
+
+
+def test_etag_del_streaming_cambia_con_los_datos(db, cliente, compras):
+    antes = cliente.get("/api/compras/", params={"format": "csv"}).headers["ETag"]
+    db.add(models.Compra(proyecto_id=1, periodo_id=2, valor=5))
+    db.commit()
+    despues = cliente.get("/api/compras/", params={"format": "csv"})
+    assert despues.headers["ETag"] != antes
+    # Distinta representación que el JSON de la misma lista
+    assert cliente.get("/api/compras/").headers["ETag"] != despues.headers["ETag"]
+
+
+def test_reporte_columnar_lleva_etag(cliente, compras):
+    respuesta = cliente.get("/api/reportes/gasto-por-proyecto", params={"format": "arrow"})
+    assert respuesta.status_code == 200
+    assert "ETag" in respuesta.headers
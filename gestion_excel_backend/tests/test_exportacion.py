@@ -0,0 +1,72 @@
+import io
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+from threading import Event
+
+import openpyxl
+import pytest
+
+from app import exportacion, models
+from app.paginacion import Filtros
+
+
+@pytest.fixture
+def compras(db, periodos):
+    db.add(models.Proyecto(nombre="A & <B>"))
+    db.flush()
+    db.add_all([
+        models.Compra(proyecto_id=1, periodo_id=1, valor=Decimal("10.5"), fecha=date(2024, 1, 5),
+                      proveedor=" Ferretería \x01\x0b\x1f", descripcion="a\x00b"),
+        models.Compra(proyecto_id=1, periodo_id=2, valor=20, fecha=None, proveedor="X", descripcion="y"),
+    ])
+    db.commit()
+
+
+def test_export_xlsx_se_lee_con_openpyxl(cliente, compras):
+    respuesta = cliente.get("/api/export.xlsx", params={"recurso": ["proyectos", "compras"]})
+    assert respuesta.status_code == 200
+    libro = openpyxl.load_workbook(io.BytesIO(respuesta.content))
+    assert libro.sheetnames == ["proyectos", "compras"]
+
+    proyectos = list(libro["proyectos"].values)
+    assert proyectos == [
+        ("nombre", "centro_costo", "subproyecto", "estado", "presupuesto", "id"),
+        ("A & <B>", None, None, None, None, 1),
+    ]
+
+    compras = list(libro["compras"].iter_rows(values_only=True))
+    assert compras[0] == ("proyecto_id", "periodo_id", "valor", "fecha", "proveedor", "descripcion", "id")
+    # Fecha con formato de fecha, caracteres de control quitados, espacios conservados
+    assert compras[1] == (1, 1, 10.5, datetime(2024, 1, 5), " Ferretería ", "ab", 1)
+    assert compras[2] == (1, 2, 20, None, "X", "y", 2)
+
+    # Tipos de celda: números como número, la fecha con formato de fecha, None como celda vacía
+    hoja = libro["compras"]
+    assert [hoja.cell(2, c).data_type for c in (1, 3, 7)] == ["n", "n", "n"]
+    assert hoja["D2"].is_date and hoja["D2"].value == datetime(2024, 1, 5)
+    assert hoja["D3"].value is None and hoja["D3"].data_type == "n"
+    assert hoja["E2"].data_type == "s"
+
+
+def test_export_xlsx_entrega_bytes_antes_de_leer_todas_las_filas(monkeypatch):
+    # La última lectura espera a que el cliente haya recibido el primer bloque:
+    # si el libro se armara completo antes de enviarse, la espera vence
+    primer_bloque = Event()
+    esperas = []
+
+    def leer_en_lotes(model, campos, filtros):
+        for i in range(60):
+            if i == 59:
+                esperas.append(primer_bloque.wait(timeout=10))
+            yield [(j, uuid.uuid4().hex, uuid.uuid4().hex, None, None, None) for j in range(1000)]
+
+    monkeypatch.setattr(exportacion, "leer_en_lotes", leer_en_lotes)
+    bloques = exportacion._xlsx(["proyectos"], Filtros(limit=None))
+    contenido = [next(bloques)]
+    primer_bloque.set()
+    contenido.extend(bloques)
+
+    assert esperas == [True]
+    hoja = openpyxl.load_workbook(io.BytesIO(b"".join(contenido)), read_only=True)["proyectos"]
+    assert sum(1 for _ in hoja.iter_rows()) == 60 * 1000 + 1
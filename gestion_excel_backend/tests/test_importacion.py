@@ -0,0 +1,150 @@
+import io
+from datetime import date
+from decimal import Decimal
+
+import openpyxl
+import pytest
+from sqlalchemy import func, select
+
+from app import agregados, importacion, models
+
+
+def _libro_caja_menor(filas) -> bytes:
+    """Libro con la hoja de caja menor como la trae el Excel (encabezado en la fila 3)."""
+    libro = openpyxl.Workbook()
+    hoja = libro.active
+    hoja.title = importacion.HOJA_CAJA_MENOR
+    hoja.append(["Gastos caja menor"])
+    hoja.append([])
+    hoja.append(["Fecha", "Valor", "SubProyecto"])
+    for fila in filas:
+        hoja.append(fila)
+    salida = io.BytesIO()
+    libro.save(salida)
+    return salida.getvalue()
+
+
+def _importar(db, contenido: bytes) -> dict:
+    df = importacion.parsear_hoja(contenido, "caja_menor")
+    df, _ = importacion.resolver_fks(db, df, importacion.REGLAS_FK["caja_menor"])
+    return importacion.sincronizar(db, "caja_menor", df)
+
+
+def _filas(db) -> int:
+    return db.scalar(select(func.count()).select_from(models.CajaMenor))
+
+
+LIMPIAS = [
+    [date(2024, 1, 5), 100, "Proyecto A"],
+    [date(2024, 2, 7), 250.5, "Proyecto B"],
+]
+SIN_RESOLVER = LIMPIAS + [[date(2024, 2, 9), 30, "Proyecto Inexistente"]]
+
+
+@pytest.fixture
+def proyectos(db, periodos):
+    db.add_all([models.Proyecto(nombre="Proyecto A"), models.Proyecto(nombre="Proyecto B")])
+    db.commit()
+
+
+@pytest.mark.parametrize("filas", [LIMPIAS, SIN_RESOLVER], ids=["limpio", "con_nombre_sin_resolver"])
+def test_reimportar_el_mismo_archivo_no_duplica(db, proyectos, filas):
+    contenido = _libro_caja_menor(filas)
+    primera = _importar(db, contenido)
+    assert primera["insertados"] == 2
+    assert _filas(db) == 2
+
+    segunda = _importar(db, contenido)
+    assert segunda == {**segunda, "insertados": 0, "actualizados": 0, "sin_cambios": 2}
+    assert _filas(db) == 2
+
+
+def test_clave_no_depende_de_los_nombres_sin_resolver(db, proyectos):
+    # Con un nombre sin resolver las FKs salen en float; las claves tienen que ser las de una carga limpia
+    _importar(db, _libro_caja_menor(SIN_RESOLVER))
+    resumen = _importar(db, _libro_caja_menor(LIMPIAS))
+    assert resumen["insertados"] == 0
+    assert _filas(db) == 2
+
+
+def _importar_en_chunks(db, contenido: bytes) -> dict:
+    resumen = importacion.importar_en_chunks(db, "caja_menor", io.BytesIO(contenido), tamano=1)
+    db.commit()
+    return resumen
+
+
+# Misma clave natural (proyecto y periodo) repetida en chunks distintos
+REPETIDAS = LIMPIAS + [[date(2024, 1, 20), 40, "Proyecto A"], [date(2024, 1, 28), 60, "Proyecto A"]]
+
+
+def test_reimportar_por_chunks_no_duplica(db, proyectos):
+    contenido = _libro_caja_menor(REPETIDAS)
+    assert _importar_en_chunks(db, contenido)["insertados"] == 4
+    segunda = _importar_en_chunks(db, contenido)
+    assert segunda == {**segunda, "insertados": 0, "actualizados": 0, "sin_cambios": 4}
+    assert _filas(db) == 4
+
+
+def test_claves_por_chunks_coinciden_con_la_hoja_entera(db, proyectos):
+    contenido = _libro_caja_menor(REPETIDAS)
+    _importar_en_chunks(db, contenido)
+    resumen = _importar(db, contenido)
+    assert resumen["insertados"] == 0 and resumen["sin_cambios"] == 4
+
+
+def test_no_resueltos_se_informan_por_logging(db, proyectos, caplog, capsys):
+    df = importacion.parsear_hoja(_libro_caja_menor(SIN_RESOLVER), "caja_menor")
+    _, no_resueltos = importacion.resolver_fks(db, df, importacion.REGLAS_FK["caja_menor"])
+    with caplog.at_level("WARNING", logger="app.importacion"):
+        importacion.reportar_no_resueltos(no_resueltos)
+    assert [r.levelname for r in caplog.records] == ["WARNING"]
+    assert "Proyecto Inexistente" in caplog.text
+    assert capsys.readouterr().out == ""
+
+
+def _agregado(db):
+    G = models.GastoProyecto
+    return db.execute(
+        select(G.proyecto_id, G.periodo_id, G.categoria, G.total_gastos, G.cantidad).order_by(G.id)
+    ).all()
+
+
+def _reconstruido(db):
+    agregados.reconstruir(db)
+    return _agregado(db)
+
+
+def _sincronizar(db, filas, eliminar=False) -> dict:
+    df = importacion.parsear_hoja(_libro_caja_menor(filas), "caja_menor")
+    df, _ = importacion.resolver_fks(db, df, importacion.REGLAS_FK["caja_menor"])
+    return importacion.sincronizar(db, "caja_menor", df, eliminar=eliminar)
+
+
+def test_importar_aplica_deltas_al_agregado(db, proyectos):
+    _sincronizar(db, REPETIDAS)
+    incremental = sorted(_agregado(db))
+    assert incremental == sorted(_reconstruido(db))
+
+    # Cambia un valor, pasa una fila a otro proyecto (baja + alta) y borra otra
+    editadas = [
+        [date(2024, 1, 5), 150, "Proyecto A"],
+        [date(2024, 2, 7), 250.5, "Proyecto A"],
+        [date(2024, 1, 20), 40, "Proyecto A"],
+    ]
+    resumen = _sincronizar(db, editadas, eliminar=True)
+    assert (resumen["insertados"], resumen["actualizados"], resumen["eliminados"]) == (1, 1, 2)
+    incremental = sorted(_agregado(db))
+    assert incremental == sorted(_reconstruido(db))
+    assert [(r.proyecto_id, r.periodo_id, r.total_gastos, r.cantidad) for r in incremental] == [
+        (1, 1, 190, 2), (1, 2, Decimal("250.5"), 1),
+    ]
+
+
+def test_importacion_sin_cambios_no_toca_el_agregado(db, proyectos, monkeypatch):
+    _sincronizar(db, REPETIDAS)
+    aplicados = []
+    original = agregados.aplicar
+    monkeypatch.setattr(agregados, "aplicar", lambda db, deltas: (aplicados.append(dict(deltas)), original(db, deltas)))
+    resumen = _sincronizar(db, REPETIDAS, eliminar=True)
+    assert resumen == {**resumen, "insertados": 0, "actualizados": 0, "eliminados": 0}
+    assert all(not deltas for deltas in aplicados)
@@ -0,0 +1,112 @@
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import select
+
+from app import models
+
+G = models.GastoProyecto
+
+COMPRA = {"proyecto_id": 1, "periodo_id": 1, "valor": 10, "fecha": None, "proveedor": None, "descripcion": None}
+CAJA = {"proyecto_id": 1, "periodo_id": 1, "valor": 4, "fecha": None, "responsable": None,
+        "concepto": None, "observaciones": None}
+
+
+@pytest.fixture
+def hechos(db, periodos, cliente):
+    """Proyecto 1 con dos compras (10 y 20) y una caja menor (4) en Enero."""
+    db.add(models.Proyecto(nombre="A"))
+    db.commit()
+    compras = cliente.post("/api/compras/bulk", json=[COMPRA, {**COMPRA, "valor": 20}]).json()["ids"]
+    caja = cliente.post("/api/caja_menor/", json=CAJA).json()["id"]
+    return compras, caja
+
+
+def _renglones(db):
+    db.expire_all()
+    return db.execute(select(G.proyecto_id, G.periodo_id, G.categoria, G.total_gastos, G.cantidad)
+                      .order_by(G.categoria, G.periodo_id)).all()
+
+
+def _valores(db, model):
+    db.expire_all()
+    return db.execute(select(model.id, model.periodo_id, model.valor).order_by(model.id)).all()
+
+
+def test_lote_mixto_sobre_dos_recursos(db, cliente, hechos):
+    (compra_a, compra_b), caja = hechos
+    respuesta = cliente.post("/api/batch", json=[
+        {"recurso": "compras", "accion": "eliminar", "id": compra_a},
+        {"recurso": "caja_menor", "accion": "crear", "datos": {**CAJA, "valor": 6}},
+        {"recurso": "compras", "accion": "actualizar", "id": compra_b, "datos": {**COMPRA, "periodo_id": 2, "valor": 25}},
+        {"recurso": "caja_menor", "accion": "actualizar", "id": caja, "datos": {**CAJA, "valor": 1}},
+        {"recurso": "compras", "accion": "crear", "datos": {**COMPRA, "valor": 3}},
+    ])
+    assert respuesta.status_code == 200
+    resultados = respuesta.json()["resultados"]
+    assert [(r["indice"], r["recurso"], r["accion"], r["estado"]) for r in resultados] == [
+        (0, "compras", "eliminar", "ok"),
+        (1, "caja_menor", "crear", "ok"),
+        (2, "compras", "actualizar", "ok"),
+        (3, "caja_menor", "actualizar", "ok"),
+        (4, "compras", "crear", "ok"),
+    ]
+    nueva_caja, nueva_compra = resultados[1]["id"], resultados[4]["id"]
+    assert _valores(db, models.Compra) == [(compra_b, 2, 25), (nueva_compra, 1, 3)]
+    assert _valores(db, models.CajaMenor) == [(caja, 1, 1), (nueva_caja, 1, 6)]
+    assert _renglones(db) == [
+        (1, 1, "caja_menor", Decimal(7), 2),
+        (1, 1, "compras", Decimal(3), 1),
+        (1, 2, "compras", Decimal(25), 1),
+    ]
+
+
+def test_datos_invalidos_responden_422_con_el_indice(db, cliente, hechos):
+    (compra_a, _), _ = hechos
+    respuesta = cliente.post("/api/batch", json=[
+        {"recurso": "compras", "accion": "crear", "datos": COMPRA},
+        {"recurso": "compras", "accion": "actualizar", "id": compra_a, "datos": {**COMPRA, "valor": "mucho"}},
+        {"recurso": "caja_menor", "accion": "eliminar"},
+    ])
+    assert respuesta.status_code == 422
+    detalle = respuesta.json()["detail"]
+    assert [error["indice"] for error in detalle] == [1, 2]
+    assert detalle[0]["errores"][0]["loc"] == ["valor"]
+    assert detalle[1]["errores"] == [{"msg": "'eliminar' requiere id"}]
+    # La validación corre antes de escribir: la primera alta no se aplicó
+    assert len(_valores(db, models.Compra)) == 2
+
+
+def test_id_inexistente_revierte_todo_el_lote(db, cliente, hechos):
+    (compra_a, compra_b), caja = hechos
+    filas = (_valores(db, models.Compra), _valores(db, models.CajaMenor))
+    renglones = _renglones(db)
+
+    respuesta = cliente.post("/api/batch", json=[
+        {"recurso": "compras", "accion": "crear", "datos": {**COMPRA, "valor": 100}},
+        {"recurso": "compras", "accion": "actualizar", "id": compra_a, "datos": {**COMPRA, "valor": 50}},
+        {"recurso": "caja_menor", "accion": "eliminar", "id": caja},
+        {"recurso": "compras", "accion": "eliminar", "id": 999},
+    ])
+    assert respuesta.status_code == 404
+    resultados = respuesta.json()["detail"]["resultados"]
+    assert [(r["indice"], r["estado"]) for r in resultados] == [(0, "ok"), (1, "ok"), (2, "ok"), (3, "no_encontrado")]
+    assert (_valores(db, models.Compra), _valores(db, models.CajaMenor)) == filas
+    assert _renglones(db) == renglones
+
+
+def test_cambios_agrupados_aplican_los_deltas_correctos(db, cliente, hechos):
+    (compra_a, compra_b), _ = hechos
+    respuesta = cliente.post("/api/batch", json=[
+        {"recurso": "compras", "accion": "actualizar", "id": compra_a, "datos": {**COMPRA, "valor": 11}},
+        {"recurso": "compras", "accion": "actualizar", "id": compra_b, "datos": {**COMPRA, "periodo_id": 3, "valor": 20}},
+        # El mismo id dos veces: el segundo cambio parte del primero
+        {"recurso": "compras", "accion": "actualizar", "id": compra_a, "datos": {**COMPRA, "periodo_id": 2, "valor": 12}},
+    ])
+    assert respuesta.status_code == 200
+    assert _valores(db, models.Compra) == [(compra_a, 2, 12), (compra_b, 3, 20)]
+    assert _renglones(db) == [
+        (1, 1, "caja_menor", Decimal(4), 1),
+        (1, 2, "compras", Decimal(12), 1),
+        (1, 3, "compras", Decimal(20), 1),
+    ]
@@ -0,0 +1,62 @@
+import pandas as pd
+import pytest
+
+from app import importacion, models, nombres
+
+
+@pytest.fixture
+def proyectos(db, periodos):
+    db.add_all([
+        models.Proyecto(nombre="Proyecto Salud 2023"),
+        models.Proyecto(nombre="Centro de Costos Fase 1"),
+        models.Proyecto(nombre="Construcción Álamo"),
+    ])
+    db.commit()
+
+
+def _caja_menor(*nombres_proyecto) -> pd.DataFrame:
+    return pd.DataFrame({
+        "nombre_proyecto": list(nombres_proyecto),
+        "mes": ["Enero"] * len(nombres_proyecto),
+        "valor": [10.0] * len(nombres_proyecto),
+    })
+
+
+def test_normalizar():
+    assert nombres.normalizar("  Proyecto  ÁLAMO ") == "proyecto alamo"
+    assert nombres.normalizar("proyecto_álamo") == "proyecto alamo"
+    assert nombres.normalizar("   ") is None
+
+
+def test_cruce_exacto_por_nombre_normalizado(db, proyectos):
+    df, no_resueltos = importacion.resolver_fks(
+        db, _caja_menor("CONSTRUCCION  alamo"), importacion.REGLAS_FK["caja_menor"])
+    assert df["proyecto_id"].tolist() == [3]
+    assert no_resueltos == {}
+
+
+@pytest.mark.parametrize("texto, parecido", [
+    ("Proyecto Salud 2024", "Proyecto Salud 2023"),
+    ("Centro de Costos Fase 2", "Centro de Costos Fase 1"),
+])
+def test_nombres_parecidos_no_se_cruzan_solos(db, proyectos, texto, parecido):
+    df, no_resueltos = importacion.resolver_fks(db, _caja_menor(texto), importacion.REGLAS_FK["caja_menor"])
+    assert df.empty
+    # Queda como sugerencia para revisar, sin aplicarse
+    nombre, similitud = no_resueltos["nombre_proyecto"][texto]
+    assert nombre == parecido
+    assert similitud < 1
+
+
+def test_proyectos_de_la_misma_transaccion(db, periodos):
+    # importar_todo carga proyectos y hechos antes del único commit
+    hoja = pd.DataFrame({"proyecto": ["Obra Norte"], "centro_de_costo": [1], "estado": ["Activo"]})
+    importacion.sincronizar(db, "proyectos", importacion.preparar_proyectos(hoja), commit=False)
+    df, no_resueltos = importacion.resolver_fks(db, _caja_menor("obra norte"), importacion.REGLAS_FK["caja_menor"])
+    assert df["proyecto_id"].notna().all()
+    assert no_resueltos == {}
+
+
+def test_busqueda_aproximada(db, proyectos):
+    resultado = nombres.cargar(db, models.Proyecto.nombre).buscar("salud")
+    assert [r["nombre"] for r in resultado] == ["Proyecto Salud 2023"]
@@ -0,0 +1,36 @@
+from app import models
+from app.paginacion import CABECERA_SIGUIENTE, LIMITE_POR_DEFECTO
+
+FILAS = LIMITE_POR_DEFECTO + 20
+
+
+def _proyectos(db):
+    db.add_all(models.Proyecto(nombre=f"P{i}") for i in range(FILAS))
+    db.commit()
+
+
+def test_sin_limit_devuelve_una_pagina(db, cliente):
+    _proyectos(db)
+    respuesta = cliente.get("/api/proyectos/")
+    assert respuesta.status_code == 200
+    assert len(respuesta.json()) == LIMITE_POR_DEFECTO
+    assert respuesta.headers[CABECERA_SIGUIENTE] == str(respuesta.json()[-1]["id"])
+
+
+def test_seguir_el_cursor_recorre_la_tabla(db, cliente):
+    _proyectos(db)
+    ids, params = [], {"limit": 200}
+    while True:
+        respuesta = cliente.get("/api/proyectos/", params=params)
+        ids += [p["id"] for p in respuesta.json()]
+        if CABECERA_SIGUIENTE not in respuesta.headers:
+            break
+        params = {"limit": 200, "after_id": respuesta.headers[CABECERA_SIGUIENTE]}
+    assert ids == list(range(1, FILAS + 1))
+
+
+def test_after_id_sin_limit_usa_el_limite_por_defecto(db, cliente):
+    _proyectos(db)
+    respuesta = cliente.get("/api/proyectos/", params={"after_id": 10})
+    ids = [p["id"] for p in respuesta.json()]
+    assert ids == list(range(11, 11 + LIMITE_POR_DEFECTO))
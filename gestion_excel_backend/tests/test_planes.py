@@ -0,0 +1,18 @@
+import pytest
+from app import planes
+from app.database import SessionLocal
+
+
+def _consultas():
+    sesion = SessionLocal()
+    try:
+        return [indice for indice, _ in planes.consultas(sesion)]
+    finally:
+        sesion.close()
+
+
+@pytest.mark.parametrize("indice", _consultas())
+def test_consulta_usa_su_indice_compuesto(db, indice):
+    query = dict(planes.consultas(db))[indice]
+    resultado = planes.plan(db, query)
+    assert indice in resultado, resultado
@@ -0,0 +1,75 @@
+"""Los preparadores vectorizados contra el recorrido fila a fila que reemplazaron."""
+from datetime import date, datetime
+
+import pandas as pd
+
+from app import importacion
+
+CAJA_MENOR = pd.DataFrame({
+    "Fecha": [datetime(2024, 1, 5), "2024-02-07", None, "no es fecha", datetime(2024, 3, 1), datetime(2024, 3, 2)],
+    "Valor": [100, "250.5", 30, 40, None, 12],
+    "SubProyecto": [" Proyecto A ", "Proyecto B", "Proyecto A", "Proyecto A", "Proyecto B", "   "],
+})
+
+RRHH = pd.DataFrame({
+    "Nombre": ["Ana", "Luis", "Eva"],
+    "Equipo": ["Datos", None, "Web"],
+    "Proyecto A": [0.5, 0, "0.25"],
+    "Proyecto B": [0.5, 1, None],
+    "Dedicación actual total": [1, 1, 0.25],
+})
+
+
+def _caja_menor_fila_a_fila(df):
+    filas = []
+    for _, fila in df.iterrows():
+        proyecto, valor = fila["SubProyecto"], fila["Valor"]
+        if pd.isnull(proyecto) or not str(proyecto).strip() or pd.isnull(valor):
+            continue
+        try:
+            fecha = pd.to_datetime(fila["Fecha"])
+        except (ValueError, TypeError):
+            continue
+        if pd.isnull(fecha):
+            continue
+        filas.append({
+            "nombre_proyecto": str(proyecto).strip(),
+            "valor": float(valor),
+            "fecha": fecha.date(),
+            "mes": importacion.MESES_ES[fecha.month - 1],
+        })
+    return filas
+
+
+def _rrhh_fila_a_fila(df):
+    filas = []
+    proyectos = [c for c in df.columns if c not in ("Nombre", "Equipo", "Dedicación actual total")]
+    for proyecto in proyectos:
+        for _, fila in df.iterrows():
+            dedicacion = pd.to_numeric(fila[proyecto], errors="coerce")
+            if pd.notnull(dedicacion) and dedicacion > 0:
+                filas.append({
+                    "nombre": fila["Nombre"],
+                    "equipo": None if pd.isnull(fila["Equipo"]) else fila["Equipo"],
+                    "proyecto": proyecto.lower().replace(" ", "_"),
+                    "dedicacion_total": float(dedicacion),
+                })
+    return filas
+
+
+def _registros(df, columnas):
+    return [
+        {c: (float(v) if c in ("valor", "dedicacion_total") else v) for c, v in fila.items()}
+        for fila in importacion.a_registros(df, columnas)
+    ]
+
+
+def test_caja_menor_igual_que_fila_a_fila():
+    preparado = importacion.preparar_caja_menor(CAJA_MENOR)
+    assert _registros(preparado, ["nombre_proyecto", "valor", "fecha", "mes"]) == _caja_menor_fila_a_fila(CAJA_MENOR)
+    assert preparado["fecha"].tolist() == [date(2024, 1, 5), date(2024, 2, 7)]
+
+
+def test_rrhh_igual_que_fila_a_fila():
+    preparado = importacion.preparar_rrhh(RRHH)
+    assert _registros(preparado, ["nombre", "equipo", "proyecto", "dedicacion_total"]) == _rrhh_fila_a_fila(RRHH)
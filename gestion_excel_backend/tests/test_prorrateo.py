@@ -0,0 +1,56 @@
+from datetime import date
+
+import pytest
+from sqlalchemy import func, select
+
+from app import models, prorrateo
+
+
+@pytest.fixture
+def proyectos(db):
+    db.add_all([
+        models.Periodo(nombre="Enero", fecha_inicio=date(2024, 1, 1), fecha_fin=date(2024, 1, 31)),
+        models.Periodo(nombre="Febrero", fecha_inicio=date(2024, 2, 1), fecha_fin=date(2024, 2, 29)),
+        models.Proyecto(nombre="A", estado="Activo", presupuesto=300),
+        models.Proyecto(nombre="B", estado="Activo", presupuesto=100),
+    ])
+    db.commit()
+
+
+def _filas(db) -> int:
+    return db.scalar(select(func.count()).select_from(models.CostoAdministracion))
+
+
+def test_prorrateo_por_presupuesto(db, proyectos):
+    db.add(models.Administracion(tipo_costo="Arriendo", periodicidad="Mensual", valor=100))
+    db.commit()
+    resumen = prorrateo.ejecutar(db, "presupuesto")
+    assert resumen["total_prorrateado"] == 200.0
+    assert resumen["valor_sin_asignar"] == 0.0
+    valores = {(f.proyecto_id, f.periodo_id): float(f.valor) for f in prorrateo.listar(db)}
+    assert valores == {(1, 1): 75.0, (1, 2): 75.0, (2, 1): 25.0, (2, 2): 25.0}
+
+
+@pytest.mark.parametrize("criterio", prorrateo.CRITERIOS)
+def test_sin_costos_de_administracion_limpia_el_prorrateo(db, proyectos, criterio):
+    costo = models.Administracion(tipo_costo="Arriendo", periodicidad="Mensual", valor=100)
+    db.add(costo)
+    db.commit()
+    prorrateo.ejecutar(db, "presupuesto")
+    assert _filas(db) == 4
+
+    db.delete(costo)
+    db.commit()
+    resumen = prorrateo.ejecutar(db, criterio)
+    assert resumen["filas"] == 0
+    assert resumen["total_prorrateado"] == 0.0
+    assert resumen["valor_sin_asignar"] == 0.0
+    assert _filas(db) == 0
+
+
+def test_sin_periodos_ni_proyectos(db):
+    db.add(models.Administracion(tipo_costo="Arriendo", periodicidad="Mensual", valor=100))
+    db.commit()
+    resumen = prorrateo.ejecutar(db, "sueldos")
+    assert resumen["filas"] == 0
+    assert resumen["total_prorrateado"] == 0.0
@@ -0,0 +1,20 @@
+from app import conexiones
+
+CAMPOS_POOL = {"status", "tamano", "en_uso", "libres", "overflow", "max_overflow",
+               "entregas", "espera_promedio_ms", "espera_maxima_ms", "agotamientos"}
+
+
+def test_health_db_informa_los_dos_pools(cliente):
+    respuesta = cliente.get("/health/db")
+    assert respuesta.status_code == 200
+    cuerpo = respuesta.json()
+    assert cuerpo["estado"] == "ok"
+    assert cuerpo["latencia_ms"] >= 0
+    for pool in ("pool_api", "pool_sync"):
+        assert set(cuerpo[pool]) == CAMPOS_POOL
+        assert cuerpo[pool]["tamano"] == conexiones.POOL_SIZE
+        assert cuerpo[pool]["max_overflow"] == conexiones.MAX_OVERFLOW
+        assert cuerpo[pool]["agotamientos"] == 0
+    # La propia consulta de salud pidió una conexión al pool de la API
+    assert cuerpo["pool_api"]["entregas"] >= 1
+    assert cuerpo["pool_api"]["en_uso"] >= 1
@@ -0,0 +1,49 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import select
+
+from app import models, schemas
+
+# Ruta -> (modelo, schema del response_model)
+LISTADOS = {
+    "/api/proyectos/": (models.Proyecto, schemas.Proyecto),
+    "/api/sueldos/": (models.Sueldo, schemas.Sueldo),
+    "/api/movimientos/": (models.Movimiento, schemas.Movimiento),
+    "/api/caja_menor/": (models.CajaMenor, schemas.CajaMenor),
+    "/api/compras/": (models.Compra, schemas.Compra),
+    "/api/administracion/": (models.Administracion, schemas.AdministracionOut),
+}
+
+
+@pytest.fixture
+def datos(db, periodos):
+    db.add_all([
+        models.Proyecto(nombre="A", presupuesto=Decimal("1500.25"), estado="activo"),
+        models.Proyecto(nombre="Ñandú", centro_costo="10", presupuesto=None),
+    ])
+    db.add(models.Rrhh(nombre="Ana", proyecto="A"))
+    db.flush()
+    db.add_all([
+        models.Sueldo(periodo_id=1, rrhh_id=1, proyecto_id=1, horas=160, valor=Decimal("1234.5"), fecha=date(2024, 1, 31)),
+        models.Movimiento(periodo_id=None, proyecto_id=2, valor=Decimal("0.1"), tipo="ingreso",
+                          fecha=date(2024, 2, 1), observaciones="con \"comillas\""),
+        models.CajaMenor(proyecto_id=1, periodo_id=2, valor=Decimal("99999999.99"), fecha=None, responsable="Luis"),
+        models.Compra(proyecto_id=2, periodo_id=3, valor=Decimal("7"), fecha=date(2024, 3, 3), proveedor="X"),
+        models.Administracion(tipo_costo="Arriendo", periodicidad="Mensual", valor=Decimal("3.333"), fecha=None),
+    ])
+    db.commit()
+
+
+@pytest.mark.parametrize("ruta", LISTADOS)
+def test_respuesta_rapida_igual_que_pydantic(db, cliente, datos, ruta):
+    model, schema = LISTADOS[ruta]
+    esperado = [
+        schema.model_validate(fila, from_attributes=True).model_dump(mode="json")
+        for fila in db.scalars(select(model).order_by(model.id))
+    ]
+    respuesta = cliente.get(ruta)
+    assert respuesta.status_code == 200
+    assert esperado
+    assert respuesta.json() == esperado
@@ -30,12 +30,15 @@ export const Administracion: React.FC = () => {
   const [searchTerm, setSearchTerm] = useState('');
   const [page, setPage] = useState(1);
   const itemsPerPage = 5;
+  // Cursor de la próxima página (X-Next-After-Id); null si ya están todas
+  const [siguiente, setSiguiente] = useState<number | null>(null);
 
   const fetchData = async () => {
     setLoading(true);
     try {
-      const res = await getAdministracion();
-      setData(res);
+      const pagina = await getAdministracion();
+      setData(pagina.items);
+      setSiguiente(pagina.siguiente);
     } catch (err) {
       console.error(err);
     } finally {
@@ -43,6 +46,17 @@ export const Administracion: React.FC = () => {
     }
   };
 
+  const cargarMas = async () => {
+    if (siguiente === null) return;
+    try {
+      const pagina = await getAdministracion(siguiente);
+      setData((prev) => [...prev, ...pagina.items]);
+      setSiguiente(pagina.siguiente);
+    } catch (err) {
+      console.error(err);
+    }
+  };
+
   useEffect(() => { fetchData(); }, []);
 
   const validate = (): boolean => {
@@ -154,7 +168,12 @@ export const Administracion: React.FC = () => {
               ))}
             </TableBody>
           </Table>
-          <div className="flex justify-end py-4">
+          <div className="flex justify-end items-center gap-4 py-4">
+            {siguiente !== null && (
+              <Button variant="flat" onPress={cargarMas}>
+                Cargar más
+              </Button>
+            )}
             <Pagination page={page} total={Math.ceil(filtered.length / itemsPerPage)} onChange={setPage} />
           </div>
         </>
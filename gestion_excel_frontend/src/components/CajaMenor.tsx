@@ -27,7 +27,7 @@ import {
   createCajaMenor,
   updateCajaMenor,
   deleteCajaMenor,
-  getProyectos,
+  getTodosProyectos,
 } from "../utils/controllers/axiosController";
 import type { CajaMenor, CajaMenorCreate } from "../utils/types/CajaMenor";
 
@@ -52,17 +52,20 @@ export const CajaMenorComponent: React.FC = () => {
   const [proyectos, setProyectos] = useState<any[]>([]);
   const [periodos, setPeriodos] = useState<any[]>([]);
   const itemsPerPage = 5;
+  // Cursor de la próxima página (X-Next-After-Id); null si ya están todas
+  const [siguiente, setSiguiente] = useState<number | null>(null);
 
   const fetchData = async () => {
     setLoading(true);
     try {
       const [cajas, proy, per] = await Promise.all([
         getCajaMenor(),
-        getProyectos(),
+        getTodosProyectos(),
         // getPeriodos(),
       ]);
-      setData(cajas);
-      setFiltered(cajas);
+      setData(cajas.items);
+      setFiltered(cajas.items);
+      setSiguiente(cajas.siguiente);
       setProyectos(proy);
       // setPeriodos(per);
     } catch (err) {
@@ -72,6 +75,17 @@ export const CajaMenorComponent: React.FC = () => {
     }
   };
 
+  const cargarMas = async () => {
+    if (siguiente === null) return;
+    try {
+      const pagina = await getCajaMenor(siguiente);
+      setData((prev) => [...prev, ...pagina.items]);
+      setSiguiente(pagina.siguiente);
+    } catch (err) {
+      console.error(err);
+    }
+  };
+
   useEffect(() => {
     fetchData();
   }, []);
@@ -242,7 +256,12 @@ export const CajaMenorComponent: React.FC = () => {
               ))}
             </TableBody>
           </Table>
-          <div className="flex justify-end py-4">
+          <div className="flex justify-end items-center gap-4 py-4">
+            {siguiente !== null && (
+              <Button variant="flat" onPress={cargarMas}>
+                Cargar más
+              </Button>
+            )}
             <Pagination
               page={page}
               total={Math.ceil(filtered.length / itemsPerPage)}
@@ -27,7 +27,7 @@ import {
   createCompra,
   updateCompra,
   deleteCompra,
-  getProyectos,
+  getTodosProyectos,
 } from "../utils/controllers/axiosController";
 import type { Compra, CompraCreate } from "../utils/types/Compra";
 
@@ -51,17 +51,20 @@ export const Compras: React.FC = () => {
   const [proyectos, setProyectos] = useState<any[]>([]);
   const [periodos, setPeriodos] = useState<any[]>([]);
   const itemsPerPage = 5;
+  // Cursor de la próxima página (X-Next-After-Id); null si ya están todas
+  const [siguiente, setSiguiente] = useState<number | null>(null);
 
   const fetchData = async () => {
     setLoading(true);
     try {
       const [compras, proy, per] = await Promise.all([
         getCompras(),
-        getProyectos(),
+        getTodosProyectos(),
         // getPeriodos(),
       ]);
-      setData(compras);
-      setFiltered(compras);
+      setData(compras.items);
+      setFiltered(compras.items);
+      setSiguiente(compras.siguiente);
       setProyectos(proy);
       // setPeriodos(per);
     } catch (err) {
@@ -71,6 +74,17 @@ export const Compras: React.FC = () => {
     }
   };
 
+  const cargarMas = async () => {
+    if (siguiente === null) return;
+    try {
+      const pagina = await getCompras(siguiente);
+      setData((prev) => [...prev, ...pagina.items]);
+      setSiguiente(pagina.siguiente);
+    } catch (err) {
+      console.error(err);
+    }
+  };
+
   useEffect(() => {
     fetchData();
   }, []);
@@ -237,7 +251,12 @@ export const Compras: React.FC = () => {
               ))}
             </TableBody>
           </Table>
-          <div className="flex justify-end py-4">
+          <div className="flex justify-end items-center gap-4 py-4">
+            {siguiente !== null && (
+              <Button variant="flat" onPress={cargarMas}>
+                Cargar más
+              </Button>
+            )}
             <Pagination
               page={page}
               total={Math.ceil(filtered.length / itemsPerPage)}
@@ -27,7 +27,7 @@ import {
   createMovimiento,
   deleteMovimiento,
   getMovimientos,
-  getProyectos,
+  getTodosProyectos,
   updateMovimiento,
 } from "../utils/controllers/axiosController";
 export const Movimientos: React.FC = () => {
@@ -50,17 +50,20 @@ export const Movimientos: React.FC = () => {
   const [proyectos, setProyectos] = useState<any[]>([]);
   const [periodos, setPeriodos] = useState<any[]>([]);
   const itemsPerPage = 5;
+  // Cursor de la próxima página (X-Next-After-Id); null si ya están todas
+  const [siguiente, setSiguiente] = useState<number | null>(null);
 
   const fetchData = async () => {
     setLoading(true);
     try {
       const [movs, proy, pers] = await Promise.all([
         getMovimientos(),
-        getProyectos(),
+        getTodosProyectos(),
         // getPeriodos()
       ]);
-      setData(movs);
-      setFiltered(movs);
+      setData(movs.items);
+      setFiltered(movs.items);
+      setSiguiente(movs.siguiente);
       setProyectos(proy);
       // setPeriodos(pers);
     } catch (err) {
@@ -70,6 +73,17 @@ export const Movimientos: React.FC = () => {
     }
   };
 
+  const cargarMas = async () => {
+    if (siguiente === null) return;
+    try {
+      const pagina = await getMovimientos(siguiente);
+      setData((prev) => [...prev, ...pagina.items]);
+      setSiguiente(pagina.siguiente);
+    } catch (err) {
+      console.error(err);
+    }
+  };
+
   useEffect(() => {
     fetchData();
   }, []);
@@ -238,7 +252,12 @@ export const Movimientos: React.FC = () => {
               ))}
             </TableBody>
           </Table>
-          <div className="flex justify-end py-4">
+          <div className="flex justify-end items-center gap-4 py-4">
+            {siguiente !== null && (
+              <Button variant="flat" onPress={cargarMas}>
+                Cargar más
+              </Button>
+            )}
             <Pagination
               page={page}
               total={Math.ceil(filtered.length / itemsPerPage)}
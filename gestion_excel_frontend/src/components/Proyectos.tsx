@@ -19,13 +19,16 @@ export const Proyectos: React.FC = () => {
   const [searchTerm, setSearchTerm] = useState<string>('');
   const [page, setPage] = useState<number>(1);
   const itemsPerPage = 5;
+  // Cursor de la próxima página (X-Next-After-Id); null si ya están todas
+  const [siguiente, setSiguiente] = useState<number | null>(null);
 
   const fetchData = async () => {
     try {
       setLoading(true);
-      const data = await getProyectos();
-      setProyectos(data);
-      setFilteredProyectos(data);
+      const pagina = await getProyectos();
+      setProyectos(pagina.items);
+      setFilteredProyectos(pagina.items);
+      setSiguiente(pagina.siguiente);
     } catch (error) {
       console.error('Error al obtener proyectos:', error);
     } finally {
@@ -33,6 +36,17 @@ export const Proyectos: React.FC = () => {
     }
   };
 
+  const cargarMas = async () => {
+    if (siguiente === null) return;
+    try {
+      const pagina = await getProyectos(siguiente);
+      setProyectos((prev) => [...prev, ...pagina.items]);
+      setSiguiente(pagina.siguiente);
+    } catch (err) {
+      console.error(err);
+    }
+  };
+
   useEffect(() => {
     fetchData();
   }, []);
@@ -163,7 +177,12 @@ export const Proyectos: React.FC = () => {
               ))}
             </TableBody>
           </Table>
-          <div className="flex justify-end py-4">
+          <div className="flex justify-end items-center gap-4 py-4">
+            {siguiente !== null && (
+              <Button variant="flat" onPress={cargarMas}>
+                Cargar más
+              </Button>
+            )}
             <Pagination
               page={page}
               total={Math.ceil(filteredProyectos.length / itemsPerPage)}
@@ -19,13 +19,16 @@ export const RRHH: React.FC = () => {
   const [loading, setLoading] = useState(true);
   const [page, setPage] = useState(1);
   const itemsPerPage = 5;
+  // Cursor de la próxima página (X-Next-After-Id); null si ya están todas
+  const [siguiente, setSiguiente] = useState<number | null>(null);
 
   const fetchData = async () => {
     setLoading(true);
     try {
-      const res = await getRrhh();
-      setData(res);
-      setFiltered(res);
+      const pagina = await getRrhh();
+      setData(pagina.items);
+      setFiltered(pagina.items);
+      setSiguiente(pagina.siguiente);
     } catch (err) {
       console.error(err);
     } finally {
@@ -33,6 +36,17 @@ export const RRHH: React.FC = () => {
     }
   };
 
+  const cargarMas = async () => {
+    if (siguiente === null) return;
+    try {
+      const pagina = await getRrhh(siguiente);
+      setData((prev) => [...prev, ...pagina.items]);
+      setSiguiente(pagina.siguiente);
+    } catch (err) {
+      console.error(err);
+    }
+  };
+
   useEffect(() => { fetchData(); }, []);
   useEffect(() => {
     const filteredData = data.filter((e) =>
@@ -144,7 +158,12 @@ export const RRHH: React.FC = () => {
               ))}
             </TableBody>
           </Table>
-          <div className="flex justify-end py-4">
+          <div className="flex justify-end items-center gap-4 py-4">
+            {siguiente !== null && (
+              <Button variant="flat" onPress={cargarMas}>
+                Cargar más
+              </Button>
+            )}
             <Pagination page={page} total={Math.ceil(filtered.length / itemsPerPage)} onChange={setPage} />
           </div>
         </>
@@ -27,13 +27,16 @@ export const Sueldos: React.FC = () => {
   const [loading, setLoading] = useState(true);
   const [page, setPage] = useState(1);
   const itemsPerPage = 5;
+  // Cursor de la próxima página (X-Next-After-Id); null si ya están todas
+  const [siguiente, setSiguiente] = useState<number | null>(null);
 
   const fetchData = async () => {
     setLoading(true);
     try {
-      const res = await getSueldos();
-      setData(res);
-      setFiltered(res);
+      const pagina = await getSueldos();
+      setData(pagina.items);
+      setFiltered(pagina.items);
+      setSiguiente(pagina.siguiente);
     } catch (err) {
       console.error(err);
     } finally {
@@ -41,6 +44,17 @@ export const Sueldos: React.FC = () => {
     }
   };
 
+  const cargarMas = async () => {
+    if (siguiente === null) return;
+    try {
+      const pagina = await getSueldos(siguiente);
+      setData((prev) => [...prev, ...pagina.items]);
+      setSiguiente(pagina.siguiente);
+    } catch (err) {
+      console.error(err);
+    }
+  };
+
   useEffect(() => { fetchData(); }, []);
 
   useEffect(() => {
@@ -159,7 +173,12 @@ export const Sueldos: React.FC = () => {
               ))}
             </TableBody>
           </Table>
-          <div className="flex justify-end py-4">
+          <div className="flex justify-end items-center gap-4 py-4">
+            {siguiente !== null && (
+              <Button variant="flat" onPress={cargarMas}>
+                Cargar más
+              </Button>
+            )}
             <Pagination page={page} total={Math.ceil(filtered.length / itemsPerPage)} onChange={setPage} />
           </div>
         </>
@@ -15,12 +15,38 @@ const api = axios.create({
   headers: { 'Content-Type': 'application/json' },
 });
 
-// --- Proyectos ---
-export const getProyectos = async (): Promise<Proyecto[]> => {
-  const res = await api.get('/proyectos');
-  return res.data;
+// --- Listados paginados ---
+// El backend devuelve a lo sumo una página (500 filas por defecto) y, si hay
+// más, el cursor de la siguiente en la cabecera X-Next-After-Id.
+export interface Pagina<T> {
+  items: T[];
+  siguiente: number | null; // after_id de la próxima página; null si no hay más
+}
+
+const getPagina = async <T>(ruta: string, afterId?: number | null): Promise<Pagina<T>> => {
+  const res = await api.get(ruta, { params: afterId != null ? { after_id: afterId } : undefined });
+  const cursor = res.headers['x-next-after-id'];
+  return { items: res.data, siguiente: cursor ? Number(cursor) : null };
+};
+
+// Sigue el cursor hasta la última página (solo para tablas chicas, p. ej. los selects de proyectos)
+const getTodos = async <T>(ruta: string): Promise<T[]> => {
+  const items: T[] = [];
+  let siguiente: number | null = null;
+  do {
+    const pagina: Pagina<T> = await getPagina<T>(ruta, siguiente);
+    items.push(...pagina.items);
+    siguiente = pagina.siguiente;
+  } while (siguiente !== null);
+  return items;
 };
 
+// --- Proyectos ---
+export const getProyectos = (afterId?: number | null): Promise<Pagina<Proyecto>> =>
+  getPagina<Proyecto>('/proyectos', afterId);
+
+export const getTodosProyectos = (): Promise<Proyecto[]> => getTodos<Proyecto>('/proyectos');
+
 export const createProyecto = async (data: ProyectoCreate): Promise<Proyecto> => {
   const res = await api.post('/proyectos', data);
   return res.data;
@@ -36,10 +62,8 @@ export const deleteProyecto = async (id: number): Promise<void> => {
 };
 
 // --- RRHH ---
-export const getRrhh = async (): Promise<Rrhh[]> => {
-  const res = await api.get('/rrhh');
-  return res.data;
-};
+export const getRrhh = (afterId?: number | null): Promise<Pagina<Rrhh>> =>
+  getPagina<Rrhh>('/rrhh', afterId);
 
 export const createRrhh = async (data: RrhhCreate): Promise<Rrhh> => {
   const res = await api.post('/rrhh', data);
@@ -56,10 +80,8 @@ export const deleteRrhh = async (id: number): Promise<void> => {
 };
 
 // --- Sueldos ---
-export const getSueldos = async (): Promise<Sueldo[]> => {
-  const res = await api.get('/sueldos');
-  return res.data;
-};
+export const getSueldos = (afterId?: number | null): Promise<Pagina<Sueldo>> =>
+  getPagina<Sueldo>('/sueldos', afterId);
 
 export const createSueldo = async (data: SueldoCreate): Promise<Sueldo> => {
   const res = await api.post('/sueldos', data);
@@ -76,10 +98,8 @@ export const deleteSueldo = async (id: number): Promise<void> => {
 };
 
 // --- Movimientos ---
-export const getMovimientos = async (): Promise<Movimiento[]> => {
-  const res = await api.get('/movimientos');
-  return res.data;
-};
+export const getMovimientos = (afterId?: number | null): Promise<Pagina<Movimiento>> =>
+  getPagina<Movimiento>('/movimientos', afterId);
 
 export const createMovimiento = async (data: MovimientoCreate): Promise<Movimiento> => {
   const res = await api.post('/movimientos', data);
@@ -96,10 +116,8 @@ export const deleteMovimiento = async (id: number): Promise<void> => {
 };
 
 // --- Caja Menor ---
-export const getCajaMenor = async (): Promise<CajaMenor[]> => {
-  const res = await api.get('/caja_menor');
-  return res.data;
-};
+export const getCajaMenor = (afterId?: number | null): Promise<Pagina<CajaMenor>> =>
+  getPagina<CajaMenor>('/caja_menor', afterId);
 
 export const createCajaMenor = async (data: CajaMenorCreate): Promise<CajaMenor> => {
   const res = await api.post('/caja_menor', data);
@@ -116,10 +134,8 @@ export const deleteCajaMenor = async (id: number): Promise<void> => {
 };
 
 // --- Compras ---
-export const getCompras = async (): Promise<Compra[]> => {
-  const res = await api.get('/compras');
-  return res.data;
-};
+export const getCompras = (afterId?: number | null): Promise<Pagina<Compra>> =>
+  getPagina<Compra>('/compras', afterId);
 
 export const createCompra = async (data: CompraCreate): Promise<Compra> => {
   const res = await api.post('/compras', data);
@@ -136,10 +152,8 @@ export const deleteCompra = async (id: number): Promise<void> => {
 };
 
 // --- Administración ---
-export const getAdministracion = async (): Promise<AdministracionOut[]> => {
-  const res = await api.get('/administracion');
-  return res.data;
-};
+export const getAdministracion = (afterId?: number | null): Promise<Pagina<AdministracionOut>> =>
+  getPagina<AdministracionOut>('/administracion', afterId);
 
 export const createAdministracion = async (data: AdministracionCreate): Promise<AdministracionOut> => {
   const res = await api.post('/administracion', data);